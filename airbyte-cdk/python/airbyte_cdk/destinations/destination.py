@@ -11,6 +11,7 @@ from typing import Any, Iterable, List, Mapping
 from airbyte_cdk import AirbyteLogger
 from airbyte_cdk.connector import Connector
 from airbyte_cdk.models import AirbyteMessage, ConfiguredAirbyteCatalog, Type
+from airbyte_cdk.output import BufferedOutput
 from airbyte_cdk.sources.utils.schema_helpers import check_config_against_spec_or_exit
 from pydantic import ValidationError
 
@@ -104,5 +105,7 @@ class Destination(Connector, ABC):
     def run(self, args: List[str]):
         parsed_args = self.parse_args(args)
         output_messages = self.run_cmd(parsed_args)
-        for message in output_messages:
-            print(message.json(exclude_unset=True))
+        with BufferedOutput() as output:
+            for message in output_messages:
+                # STATE messages are emitted once the data is committed, write them right away
+                output.write(message.json(exclude_unset=True), flush=message.type == Type.STATE)
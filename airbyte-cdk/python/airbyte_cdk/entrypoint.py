@@ -9,11 +9,13 @@ import logging
 import os.path
 import sys
 import tempfile
-from typing import Iterable, List
+from typing import Iterable, Iterator, List, Tuple
 
 from airbyte_cdk.logger import init_logger
 from airbyte_cdk.models import AirbyteMessage, Status, Type
+from airbyte_cdk.output import BufferedOutput
 from airbyte_cdk.sources import Source
+from airbyte_cdk.sources.utils.message_serializer import airbyte_message_to_json, use_orjson_from_env
 from airbyte_cdk.sources.utils.schema_helpers import check_config_against_spec_or_exit, split_config
 
 logger = init_logger("airbyte")
@@ -58,6 +60,13 @@ class AirbyteEntrypoint(object):
         return main_parser.parse_args(args)
 
     def run(self, parsed_args: argparse.Namespace) -> Iterable[str]:
+        for _, message in self._run(parsed_args):
+            yield message
+
+    def _run(self, parsed_args: argparse.Namespace) -> Iterator[Tuple[Type, str]]:
+        """
+        Runs the command and yields the output messages serialized, along with their type.
+        """
         cmd = parsed_args.command
         if not cmd:
             raise Exception("No command passed")
@@ -68,7 +77,7 @@ class AirbyteEntrypoint(object):
         with tempfile.TemporaryDirectory() as temp_dir:
             if cmd == "spec":
                 message = AirbyteMessage(type=Type.SPEC, spec=source_spec)
-                yield message.json(exclude_unset=True)
+                yield message.type, message.json(exclude_unset=True)
             else:
                 raw_config = self.source.read_config(parsed_args.config)
                 config = self.source.configure(raw_config, temp_dir)
@@ -88,16 +97,17 @@ class AirbyteEntrypoint(object):
                         self.logger.error("Check failed")
 
                     output_message = AirbyteMessage(type=Type.CONNECTION_STATUS, connectionStatus=check_result).json(exclude_unset=True)
-                    yield output_message
+                    yield Type.CONNECTION_STATUS, output_message
                 elif cmd == "discover":
                     catalog = self.source.discover(self.logger, config)
-                    yield AirbyteMessage(type=Type.CATALOG, catalog=catalog).json(exclude_unset=True)
+                    yield Type.CATALOG, AirbyteMessage(type=Type.CATALOG, catalog=catalog).json(exclude_unset=True)
                 elif cmd == "read":
                     config_catalog = self.source.read_catalog(parsed_args.catalog)
                     state = self.source.read_state(parsed_args.state)
                     generator = self.source.read(self.logger, config, config_catalog, state)
+                    use_orjson = use_orjson_from_env()
                     for message in generator:
-                        yield message.json(exclude_unset=True)
+                        yield message.type, airbyte_message_to_json(message, use_orjson=use_orjson)
                 else:
                     raise Exception("Unexpected command " + cmd)
 
@@ -105,8 +115,10 @@ class AirbyteEntrypoint(object):
 def launch(source: Source, args: List[str]):
     source_entrypoint = AirbyteEntrypoint(source)
     parsed_args = source_entrypoint.parse_args(args)
-    for message in source_entrypoint.run(parsed_args):
-        print(message)
+    with BufferedOutput() as output:
+        for message_type, message in source_entrypoint._run(parsed_args):
+            # write STATE messages right away so the platform can checkpoint them
+            output.write(message, flush=message_type == Type.STATE)
 
 
 def main():
@@ -7,6 +7,7 @@ import logging.config
 import traceback
 
 from airbyte_cdk.models import AirbyteLogMessage, AirbyteMessage
+from airbyte_cdk.output import print_message
 
 TRACE_LEVEL_NUM = 5
 
@@ -18,8 +19,7 @@ LOGGING_CONFIG = {
     },
     "handlers": {
         "console": {
-            "class": "logging.StreamHandler",
-            "stream": "ext://sys.stdout",
+            "class": "airbyte_cdk.logger.AirbyteOutputHandler",
             "formatter": "airbyte",
         },
     },
@@ -49,6 +49,16 @@ class AirbyteLogFormatter(logging.Formatter):
         return log_message.json(exclude_unset=True)
 
 
+class AirbyteOutputHandler(logging.Handler):
+    """Writes log records to the output of the connector, in order with the other messages, see print_message"""
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            print_message(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
 class AirbyteNativeLogger(logging.Logger):
     """Using native logger with implementing all AirbyteLogger features"""
 
@@ -92,7 +102,7 @@ class AirbyteLogger:
     def log(self, level, message):
         log_record = AirbyteLogMessage(level=level, message=message)
         log_message = AirbyteMessage(type="LOG", log=log_record)
-        print(log_message.json(exclude_unset=True))
+        print_message(log_message.json(exclude_unset=True))
 
     def fatal(self, message):
         self.log("FATAL", message)
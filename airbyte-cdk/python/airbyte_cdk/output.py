@@ -0,0 +1,116 @@
+#
+# Copyright (c) 2021 Airbyte, Inc., all rights reserved.
+#
+
+
+import sys
+import threading
+import time
+from typing import List, Optional, TextIO
+
+# Default size of the buffer, in characters, before it is written to the output
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+# Default maximum time in seconds a message can wait in the buffer
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+# output of the running connector, set while a BufferedOutput is in use, see print_message
+_current_output: Optional["BufferedOutput"] = None
+
+
+def print_message(message: str):
+    """
+    Writes a serialized message produced outside of the messages of the connector, e.g: a LOG message, on its own line.
+    While a BufferedOutput is in use, the message goes through its buffer so that it comes after the messages written before it,
+    otherwise it is printed to stdout right away.
+    """
+    output = _current_output
+    if output is not None:
+        output.write(message)
+    else:
+        print(message)
+
+
+class BufferedOutput:
+    """
+    Writes serialized messages to an output stream (stdout by default) in large chunks instead of one write and flush per message.
+
+    The buffer is written when it exceeds buffer_size, when a message is older than flush_interval, when flush is explicitly requested
+    (e.g: after a STATE message so the platform can persist it right away) and on exit. Within the context, LOG messages of the loggers
+    are written through the same buffer (see print_message), so they keep their place among the other messages. Use it as a context
+    manager:
+        ```
+        with BufferedOutput() as output:
+            for message in messages:
+                output.write(message.json(exclude_unset=True), flush=message.type == Type.STATE)
+        ```
+    """
+
+    def __init__(self, stream: TextIO = None, buffer_size: int = DEFAULT_BUFFER_SIZE, flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        """
+        :param stream: text stream to write to, defaults to sys.stdout at the time of the call
+        :param buffer_size: number of buffered characters triggering a write
+        :param flush_interval: maximum time in seconds a message waits in the buffer, a background thread flushes older messages
+        """
+        self._stream = stream or sys.stdout
+        self._buffer_size = buffer_size
+        self._flush_interval = flush_interval
+        self._buffer: List[str] = []
+        self._buffered_size = 0
+        # time of the oldest message in the buffer
+        self._buffered_since = None
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_periodically, name="buffered_output_flusher", daemon=True)
+        self._previous_output: Optional["BufferedOutput"] = None
+
+    def __enter__(self) -> "BufferedOutput":
+        global _current_output
+        self._flusher.start()
+        self._previous_output, _current_output = _current_output, self
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        global _current_output
+        _current_output = self._previous_output
+        self.close()
+
+    def write(self, message: str, flush: bool = False):
+        """
+        Adds a single serialized message to the buffer, the message is written on its own line.
+        :param flush: write the buffer, this message included, to the output right away
+        """
+        with self._lock:
+            if not self._buffer:
+                self._buffered_since = time.monotonic()
+            self._buffer.append(message)
+            self._buffered_size += len(message) + 1
+            if flush or self._buffered_size >= self._buffer_size:
+                self._flush()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        """
+        Writes the remaining messages and stops the background flushes.
+        """
+        self._closed.set()
+        self.flush()
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        # a single write call so lines from other writers (e.g: logs) can't end up in the middle of a message
+        self._buffer.append("")
+        self._stream.write("\n".join(self._buffer))
+        self._stream.flush()
+        self._buffer = []
+        self._buffered_size = 0
+        self._buffered_since = None
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self._flush_interval / 2):
+            with self._lock:
+                if self._buffered_since is not None and time.monotonic() - self._buffered_since >= self._flush_interval:
+                    self._flush()
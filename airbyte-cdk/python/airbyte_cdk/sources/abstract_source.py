@@ -4,17 +4,17 @@
 
 
 import copy
+import sys
 from abc import ABC, abstractmethod
 from datetime import datetime
-from functools import lru_cache
-from typing import Any, Dict, Iterator, List, Mapping, MutableMapping, Optional, Tuple
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, MutableMapping, Optional, Tuple
 
 from airbyte_cdk.logger import AirbyteLogger
 from airbyte_cdk.models import (
     AirbyteCatalog,
     AirbyteConnectionStatus,
     AirbyteMessage,
-    AirbyteRecordMessage,
     AirbyteStateMessage,
     AirbyteStream,
     ConfiguredAirbyteCatalog,
@@ -26,10 +26,22 @@ from airbyte_cdk.models import Type as MessageType
 from airbyte_cdk.sources.source import Source
 from airbyte_cdk.sources.streams import Stream
 from airbyte_cdk.sources.streams.http.http import HttpStream
+from airbyte_cdk.sources.utils.concurrency import interleave, ordered_prefetch, ordered_results
+from airbyte_cdk.sources.utils.message_serializer import as_record_message
 from airbyte_cdk.sources.utils.schema_helpers import InternalConfig, split_config
 from airbyte_cdk.sources.utils.transform import TypeTransformer
 
 
+def _async_http_stream_class() -> Optional[type]:
+    """
+    AsyncHttpStream is imported lazily since it depends on aiohttp, an optional dependency. No stream can be an AsyncHttpStream as long as
+    its module wasn't imported by the connector.
+    :return: the AsyncHttpStream class, or None if it is not in use
+    """
+    async_http = sys.modules.get("airbyte_cdk.sources.streams.http.async_http")
+    return async_http.AsyncHttpStream if async_http else None
+
+
 class AbstractSource(Source, ABC):
     """
     Abstract base class for an Airbyte Source. Consumers should implement any abstract methods
@@ -61,6 +73,17 @@ class AbstractSource(Source, ABC):
         """Source name"""
         return self.__class__.__name__
 
+    @property
+    def max_concurrent_streams(self) -> Optional[int]:
+        """
+        Override to read several streams of the catalog at the same time, e.g: when the source has many independent streams and most of the
+        sync time is spent waiting on the API. Keep this value within the API quota since every stream sends its own requests.
+
+        Records of different streams are interleaved in the output, but each stream's STATE messages are still emitted after the records
+        they cover. Return None to read streams one after another.
+        """
+        return None
+
     def discover(self, logger: AirbyteLogger, config: Mapping[str, Any]) -> AirbyteCatalog:
         """Implements the Discover operation from the Airbyte Specification. See https://docs.airbyte.io/architecture/airbyte-specification."""
         streams = [stream.as_airbyte_stream() for stream in self.streams(config=config)]
@@ -88,6 +111,11 @@ class AbstractSource(Source, ABC):
         # get the streams once in case the connector needs to make any queries to generate them
         stream_instances = {s.name: s for s in self.streams(config)}
         self._stream_to_instance_map = stream_instances
+        if self.max_concurrent_streams and self.max_concurrent_streams > 1 and len(catalog.streams) > 1:
+            yield from self._read_streams_concurrently(logger, catalog, stream_instances, connector_state, internal_config)
+            logger.info(f"Finished syncing {self.name}")
+            return
+
         for configured_stream in catalog.streams:
             stream_instance = stream_instances.get(configured_stream.stream.name)
             if not stream_instance:
@@ -109,6 +137,54 @@ class AbstractSource(Source, ABC):
 
         logger.info(f"Finished syncing {self.name}")
 
+    def _read_streams_concurrently(
+        self,
+        logger: AirbyteLogger,
+        catalog: ConfiguredAirbyteCatalog,
+        stream_instances: Mapping[str, Stream],
+        connector_state: MutableMapping[str, Any],
+        internal_config: InternalConfig,
+    ) -> Iterator[AirbyteMessage]:
+        """
+        Reads up to max_concurrent_streams streams at the same time and merges their messages into a single output.
+        Every stream checkpoints into its own copy of the connector state, the shared state is only updated once a STATE message is emitted,
+        so a STATE message never covers records which are not yet in the output.
+        """
+        for configured_stream in catalog.streams:
+            if configured_stream.stream.name not in stream_instances:
+                raise KeyError(
+                    f"The requested stream {configured_stream.stream.name} was not found in the source. Available streams: {stream_instances.keys()}"
+                )
+
+        def read_stream(configured_stream: ConfiguredAirbyteStream) -> Iterator[AirbyteMessage]:
+            stream_name = configured_stream.stream.name
+            stream_state = copy.deepcopy(connector_state)
+            try:
+                for message in self._read_stream(
+                    logger=logger,
+                    stream_instance=stream_instances[stream_name],
+                    configured_stream=configured_stream,
+                    connector_state=stream_state,
+                    internal_config=internal_config,
+                ):
+                    if message.type == MessageType.STATE:
+                        # snapshot the checkpoint since the stream keeps updating its state while the message waits in the buffer
+                        message = AirbyteMessage(
+                            type=MessageType.STATE, state=AirbyteStateMessage(data={stream_name: copy.deepcopy(stream_state[stream_name])})
+                        )
+                    yield message
+            except Exception as e:
+                logger.exception(f"Encountered an exception while reading stream {stream_name}")
+                raise e
+
+        logger.info(f"Reading {len(catalog.streams)} streams with up to {self.max_concurrent_streams} streams at a time")
+        producers = [partial(read_stream, configured_stream) for configured_stream in catalog.streams]
+        for _, message in interleave(producers, max_workers=self.max_concurrent_streams):
+            if message.type == MessageType.STATE:
+                connector_state.update(message.state.data)
+                message = AirbyteMessage(type=MessageType.STATE, state=AirbyteStateMessage(data=copy.deepcopy(connector_state)))
+            yield message
+
     def _read_stream(
         self,
         logger: AirbyteLogger,
@@ -131,10 +207,16 @@ class AbstractSource(Source, ABC):
         record_counter = 0
         stream_name = configured_stream.stream.name
         logger.info(f"Syncing stream: {stream_name} ")
-        for record in record_iterator:
-            if record.type == MessageType.RECORD:
-                record_counter += 1
-            yield record
+        try:
+            for record in record_iterator:
+                if record.type == MessageType.RECORD:
+                    record_counter += 1
+                yield record
+        finally:
+            async_http_stream = _async_http_stream_class()
+            if async_http_stream and isinstance(stream_instance, async_http_stream):
+                # release the connection pool and the event loop thread of the stream
+                stream_instance.close()
 
         logger.info(f"Read {record_counter} records from {stream_name} stream")
 
@@ -169,13 +251,19 @@ class AbstractSource(Source, ABC):
             cursor_field=configured_stream.cursor_field, sync_mode=SyncMode.incremental, stream_state=stream_state
         )
         total_records_counter = 0
-        for slice in slices:
-            records = stream_instance.read_records(
+        concurrent_slices = self._max_concurrent_slices(stream_instance) > 1
+
+        def read_records_kwargs(stream_slice: Optional[Mapping[str, Any]]) -> Mapping[str, Any]:
+            return dict(
                 sync_mode=SyncMode.incremental,
-                stream_slice=slice,
-                stream_state=stream_state,
+                stream_slice=stream_slice,
+                # slices read concurrently are submitted while the state keeps being updated by the records of the previous slices,
+                # possibly in place by get_updated_state, so each of them gets a snapshot of the state it was submitted with
+                stream_state=copy.deepcopy(stream_state) if concurrent_slices else stream_state,
                 cursor_field=configured_stream.cursor_field or None,
             )
+
+        for records in self._read_slices(stream_instance, slices, read_records_kwargs):
             for record_counter, record_data in enumerate(records, start=1):
                 yield self._as_airbyte_record(stream_name, record_data)
                 stream_state = stream_instance.get_updated_state(stream_state, record_data)
@@ -199,16 +287,60 @@ class AbstractSource(Source, ABC):
     ) -> Iterator[AirbyteMessage]:
         slices = stream_instance.stream_slices(sync_mode=SyncMode.full_refresh, cursor_field=configured_stream.cursor_field)
         total_records_counter = 0
-        for slice in slices:
-            records = stream_instance.read_records(
-                stream_slice=slice, sync_mode=SyncMode.full_refresh, cursor_field=configured_stream.cursor_field
-            )
+
+        def read_records_kwargs(stream_slice: Optional[Mapping[str, Any]]) -> Mapping[str, Any]:
+            return dict(stream_slice=stream_slice, sync_mode=SyncMode.full_refresh, cursor_field=configured_stream.cursor_field)
+
+        for records in self._read_slices(stream_instance, slices, read_records_kwargs):
             for record in records:
                 yield self._as_airbyte_record(configured_stream.stream.name, record)
                 total_records_counter += 1
                 if self._limit_reached(internal_config, total_records_counter):
                     return
 
+    @staticmethod
+    def _max_concurrent_slices(stream_instance: Stream) -> int:
+        """
+        :return: number of slices of the stream read at the same time, 1 when slices are read one after another
+        """
+        max_concurrent_slices = stream_instance.max_concurrent_slices if isinstance(stream_instance, HttpStream) else None
+        return max(max_concurrent_slices or 1, 1)
+
+    @staticmethod
+    def _read_slices(
+        stream_instance: Stream,
+        slices: Iterable[Optional[Mapping[str, Any]]],
+        read_records_kwargs: Callable[[Optional[Mapping[str, Any]]], Mapping[str, Any]],
+    ) -> Iterator[Iterable[Mapping[str, Any]]]:
+        """
+        Reads the records of every stream slice, in the order of slices.
+        When the stream sets max_concurrent_slices, the following slices are read in the background while the current one is emitted:
+        on the stream's event loop for an AsyncHttpStream, on a thread pool otherwise.
+        :param read_records_kwargs: builds the read_records arguments of a slice, always called from the calling thread when the slice
+        is submitted
+        """
+        max_concurrent_slices = AbstractSource._max_concurrent_slices(stream_instance)
+        if max_concurrent_slices == 1:
+            for stream_slice in slices:
+                yield stream_instance.read_records(**read_records_kwargs(stream_slice))
+            return
+
+        slices_kwargs = (read_records_kwargs(stream_slice) for stream_slice in slices)
+        async_http_stream = _async_http_stream_class()
+        if async_http_stream and isinstance(stream_instance, async_http_stream):
+            yield from ordered_results(
+                lambda kwargs: stream_instance.read_records_future(**kwargs),
+                slices_kwargs,
+                window=max_concurrent_slices,
+            )
+        else:
+            # records are read ahead through a bounded buffer per slice rather than holding whole slices in memory
+            yield from ordered_prefetch(
+                lambda kwargs: stream_instance.read_records(**kwargs),
+                slices_kwargs,
+                max_workers=max_concurrent_slices,
+            )
+
     def _checkpoint_state(self, stream_name, stream_state, connector_state, logger):
         logger.info(f"Setting state of {stream_name} stream to {stream_state}")
         connector_state[stream_name] = stream_state
@@ -234,5 +366,4 @@ class AbstractSource(Source, ABC):
         # taken unless configured. See
         # docs/connector-development/cdk-python/schemas.md for details.
         transformer.transform(data, schema)
-        message = AirbyteRecordMessage(stream=stream_name, data=data, emitted_at=now_millis)
-        return AirbyteMessage(type=MessageType.RECORD, record=message)
+        return as_record_message(stream_name, data, emitted_at=now_millis)
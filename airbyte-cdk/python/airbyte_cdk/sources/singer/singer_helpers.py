@@ -5,12 +5,12 @@
 
 import json
 import os
+import re
 import selectors
 import subprocess
 from dataclasses import dataclass
 from datetime import datetime
-from io import TextIOWrapper
-from typing import Any, DefaultDict, Dict, Iterator, List, Mapping, Optional, Tuple
+from typing import IO, Any, DefaultDict, Dict, Iterator, List, Mapping, Optional, Tuple, Union
 
 from airbyte_cdk.models import (
     AirbyteCatalog,
@@ -23,10 +23,22 @@ from airbyte_cdk.models import (
     SyncMode,
     Type,
 )
+from airbyte_cdk.sources.utils.message_serializer import SerializedAirbyteMessage
 
 _INCREMENTAL = "INCREMENTAL"
 _FULL_TABLE = "FULL_TABLE"
 
+# Size in bytes of the chunks read from the output of the tap
+_READ_CHUNK_SIZE = 64 * 1024
+
+# Layout of the RECORD messages written by singer-python
+_RECORD_PREFIX = '{"type": "RECORD", "stream": '
+_RECORD_SEPARATOR = ', "record": '
+_VERSION_SEPARATOR = ', "version": '
+_TIME_EXTRACTED_SEPARATOR = ', "time_extracted": '
+_JSON_STRING = re.compile(r'"(?:[^"\\]|\\.)*"')
+_JSON_INTEGER = re.compile(r"-?[0-9]+")
+
 
 def to_json(string):
     try:
@@ -35,6 +47,36 @@ def to_json(string):
         return False
 
 
+def passthrough_record(line: str, emitted_at: int) -> Optional[str]:
+    """
+    Rewrites a Singer RECORD message into a serialized Airbyte RECORD message without parsing the record, which is copied as is.
+    Only messages with the layout written by singer-python are supported:
+        {"type": "RECORD", "stream": <stream>, "record": <record>[, "version": <version>][, "time_extracted": <time_extracted>]}
+    Nothing can follow the record but these optional fields, so the record ends right before the last of them, even if the record itself
+    has fields with the same names.
+    :return: the serialized Airbyte RECORD message, None if the line has another layout and has to be parsed
+    """
+    if not line.startswith(_RECORD_PREFIX):
+        return None
+    stream = _JSON_STRING.match(line, len(_RECORD_PREFIX))
+    if not stream or not line.startswith(_RECORD_SEPARATOR, stream.end()):
+        return None
+
+    line = line.rstrip()
+    record_start = stream.end() + len(_RECORD_SEPARATOR)
+    record_end = len(line) - 1
+    if not line.endswith("}"):
+        return None
+    for separator, value_pattern in ((_TIME_EXTRACTED_SEPARATOR, _JSON_STRING), (_VERSION_SEPARATOR, _JSON_INTEGER)):
+        position = line.rfind(separator, record_start, record_end)
+        if position != -1 and value_pattern.fullmatch(line, position + len(separator), record_end):
+            record_end = position
+    if line[record_start] != "{" or line[record_end - 1] != "}":
+        return None
+
+    return f'{{"type": "RECORD", "record": {{"stream": {stream.group()}, "data": {line[record_start:record_end]}, "emitted_at": {emitted_at}}}}}'
+
+
 def is_field_metadata(metadata):
     if len(metadata.get("breadcrumb")) != 2:
         return False
@@ -159,45 +201,74 @@ class SingerHelper:
         return Catalogs(singer_catalog=singer_catalog, airbyte_catalog=airbyte_catalog)
 
     @staticmethod
-    def read(logger, shell_command, is_message=(lambda x: True)) -> Iterator[AirbyteMessage]:
-        with subprocess.Popen(shell_command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True) as p:
-            for line, text_wrapper in SingerHelper._read_lines(p):
-                if text_wrapper is p.stdout:
+    def read(
+        logger, shell_command, is_message=(lambda x: True), passthrough: bool = False
+    ) -> Iterator[Union[AirbyteMessage, SerializedAirbyteMessage]]:
+        """
+        Runs the tap and converts its output to Airbyte messages, the lines of its output which aren't messages are logged
+        :param is_message: tells if a JSON object of the output is a message
+        :param passthrough: yield RECORD messages already serialized, without parsing their records, see passthrough_record.
+        Their records aren't passed to is_message.
+        """
+        with subprocess.Popen(shell_command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE) as p:
+            for lines, pipe in SingerHelper._read_lines(p):
+                if pipe is not p.stdout:
+                    for line in lines:
+                        logger.log_by_prefix(line, "ERROR")
+                    continue
+
+                emitted_at = int(datetime.now().timestamp()) * 1000
+                for line in lines:
+                    serialized_record = passthrough_record(line, emitted_at) if passthrough else None
+                    if serialized_record is not None:
+                        yield SerializedAirbyteMessage(type=Type.RECORD, json=serialized_record)
+                        continue
                     out_json = to_json(line)
-                    if out_json is not None and is_message(out_json):
+                    if isinstance(out_json, dict) and is_message(out_json):
                         message_data = SingerHelper._airbyte_message_from_json(out_json)
                         if message_data is not None:
                             yield message_data
                     else:
                         logger.log_by_prefix(line, "INFO")
-                else:
-                    logger.log_by_prefix(line, "ERROR")
 
     @staticmethod
-    def _read_lines(process: subprocess.Popen) -> Iterator[Tuple[str, TextIOWrapper]]:
+    def _read_lines(process: subprocess.Popen, chunk_size: int = _READ_CHUNK_SIZE) -> Iterator[Tuple[List[str], IO]]:
+        """
+        Reads stdout and stderr of the process in large chunks rather than line by line
+        :return: iterator of the complete lines read at once from either stdout or stderr, without line endings, along with their pipe
+        """
         sel = selectors.DefaultSelector()
-        sel.register(process.stdout, selectors.EVENT_READ)
-        sel.register(process.stderr, selectors.EVENT_READ)
-        eof = False
-        while not eof:
-            selects_list = sel.select()
-            empty_line_counter = 0
-            for key, _ in selects_list:
-                line = key.fileobj.readline()
-                if not line:
-                    empty_line_counter += 1
-                    if empty_line_counter >= len(selects_list):
-                        eof = True
-
-                        try:
-                            process.wait(timeout=60)
-                        except subprocess.TimeoutExpired:
-                            raise Exception(f"Underlying command {process.args} is hanging")
-
-                        if process.returncode != 0:
-                            raise Exception(f"Underlying command {process.args} failed with exit code {process.returncode}")
+        pending: Dict[IO, List[bytes]] = {}
+        for pipe in (process.stdout, process.stderr):
+            sel.register(pipe, selectors.EVENT_READ)
+            pending[pipe] = []
+
+        while sel.get_map():
+            for key, _ in sel.select():
+                pipe = key.fileobj
+                chunk = os.read(pipe.fileno(), chunk_size)
+                if not chunk:
+                    sel.unregister(pipe)
+                    lines = [b"".join(pending[pipe])] if pending[pipe] else []
+                elif b"\n" not in chunk:
+                    # a long line, its end is in the next chunks
+                    pending[pipe].append(chunk)
+                    continue
                 else:
-                    yield line, key.fileobj
+                    lines = (b"".join(pending[pipe]) + chunk).split(b"\n")
+                    # the last line is incomplete, or empty when the chunk ends with a line ending
+                    tail = lines.pop()
+                    pending[pipe] = [tail] if tail else []
+                if lines:
+                    yield [line.rstrip(b"\r").decode("utf-8") for line in lines], pipe
+
+        try:
+            process.wait(timeout=60)
+        except subprocess.TimeoutExpired:
+            raise Exception(f"Underlying command {process.args} is hanging")
+
+        if process.returncode != 0:
+            raise Exception(f"Underlying command {process.args} failed with exit code {process.returncode}")
 
     @staticmethod
     def _airbyte_message_from_json(transformed_json: Mapping[str, Any]) -> Optional[AirbyteMessage]:
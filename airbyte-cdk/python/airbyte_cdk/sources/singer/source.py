@@ -24,6 +24,10 @@ class ConfigContainer:
 
 class SingerSource(Source):
 
+    # output RECORD messages of the tap without parsing their records, only for taps writing them with singer-python,
+    # see SingerHelper.read
+    passthrough_records: bool = False
+
     # can be overridden to change an input config
     def configure(self, raw_config: json, temp_dir: str) -> json:
         """
@@ -111,7 +115,7 @@ class SingerSource(Source):
         selected_singer_catalog_path = SingerHelper.create_singer_catalog_with_selection(masked_airbyte_catalog, catalogs.singer_catalog)
 
         read_cmd = self.read_cmd(logger, config_container.config_path, selected_singer_catalog_path, state_path)
-        return SingerHelper.read(logger, read_cmd)
+        return SingerHelper.read(logger, read_cmd, passthrough=self.passthrough_records)
 
     def get_sync_mode_overrides(self) -> Dict[str, SyncModeInfo]:
         """
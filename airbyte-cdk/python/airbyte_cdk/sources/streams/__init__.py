@@ -1,4 +1,5 @@
 # Initialize Streams Package
+from .async_job import AsyncJob, AsyncJobFailedException, AsyncJobStatus, AsyncJobStream
 from .core import Stream
 
-__all__ = ["Stream"]
+__all__ = ["AsyncJob", "AsyncJobFailedException", "AsyncJobStatus", "AsyncJobStream", "Stream"]
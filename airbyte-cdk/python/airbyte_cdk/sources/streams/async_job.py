@@ -0,0 +1,216 @@
+#
+# Copyright (c) 2021 Airbyte, Inc., all rights reserved.
+#
+
+
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from enum import Enum
+from typing import Any, Deque, Iterable, Iterator, List, Mapping, Optional
+
+from airbyte_cdk.models import SyncMode
+
+from .core import Stream
+
+
+class AsyncJobStatus(Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class AsyncJobFailedException(Exception):
+    """
+    Raised when a job keeps failing after all its attempts and its slice can't be split any further
+    """
+
+
+class AsyncJob:
+    """
+    A report job running on the API side for one job slice
+    """
+
+    def __init__(self, job_slice: Mapping[str, Any], attempt: int = 1):
+        """
+        :param job_slice: parameters of the job, as returned by AsyncJobStream.job_slices or AsyncJobStream.split_job_slice
+        :param attempt: number of the attempt for this job slice, starting at 1
+        """
+        self.job_slice = job_slice
+        self.attempt = attempt
+        self.status = AsyncJobStatus.PENDING
+        # whatever AsyncJobStream.create_job returned to identify the job on the API side, set once the job is started
+        self.handle: Any = None
+        self.started_at: Optional[float] = None
+
+    def elapsed_time(self) -> float:
+        """
+        :return: seconds since the job was started
+        """
+        return time.monotonic() - self.started_at if self.started_at is not None else 0.0
+
+    def __repr__(self) -> str:
+        return f"AsyncJob(job_slice={self.job_slice}, attempt={self.attempt}, status={self.status.value})"
+
+
+class _SliceJobs:
+    """
+    The jobs of a slice yielded by AsyncJobStream.stream_slices, more than one once a failed job was split
+    """
+
+    def __init__(self, job_slice: Mapping[str, Any]):
+        self.job_slice = job_slice
+        self.jobs: List[AsyncJob] = [AsyncJob(job_slice)]
+
+    @property
+    def completed(self) -> bool:
+        return all(job.status == AsyncJobStatus.COMPLETED for job in self.jobs)
+
+    def replace(self, job: AsyncJob, new_jobs: List[AsyncJob]):
+        index = self.jobs.index(job)
+        self.jobs[index : index + 1] = new_jobs
+
+
+class AsyncJobStream(Stream, ABC):
+    """
+    Base abstract class for streams reading reports generated by asynchronous jobs: a job is created on the API side, polled until it's
+    done, then its result is read.
+
+    Instead of running one job at a time, up to `max_running_jobs` jobs run concurrently. They are started in the order of their slices,
+    polled together (see check_jobs_status) less and less often while none of them completes, and slices are yielded in order as soon
+    as their jobs are complete, so records of the first slices are read while the next jobs are still running.
+    A job which fails or runs for longer than `job_timeout` is retried up to `max_job_attempts` times, then its slice is split into
+    smaller ones (see split_job_slice) which are run as separate jobs.
+    """
+
+    # maximum number of jobs running on the API side at the same time
+    max_running_jobs: int = 10
+    # seconds between two polls of the running jobs, growing by poll_interval_factor while no job completes, up to max_poll_interval
+    min_poll_interval: float = 5
+    max_poll_interval: float = 60
+    poll_interval_factor: float = 2
+    # number of times a failed job is run before splitting its slice
+    max_job_attempts: int = 3
+    # seconds after which a running job is cancelled and considered as failed, None waits forever
+    job_timeout: Optional[float] = None
+
+    @abstractmethod
+    def job_slices(self, stream_state: Mapping[str, Any] = None) -> Iterable[Mapping[str, Any]]:
+        """
+        :return: parameters of the jobs to run, in the order their records should be read
+        """
+
+    @abstractmethod
+    def create_job(self, job_slice: Mapping[str, Any]) -> Any:
+        """
+        Starts a job on the API side
+        :return: anything identifying the job, available as AsyncJob.handle
+        """
+
+    @abstractmethod
+    def check_job_status(self, job: AsyncJob) -> AsyncJobStatus:
+        """
+        :return: current status of a running job, either RUNNING, COMPLETED or FAILED
+        """
+
+    @abstractmethod
+    def read_job_records(self, job: AsyncJob) -> Iterable[Mapping[str, Any]]:
+        """
+        :return: records of a completed job
+        """
+
+    def check_jobs_status(self, jobs: List[AsyncJob]) -> List[AsyncJobStatus]:
+        """
+        Polls all the running jobs at once. Override this method when the API can return the status of several jobs in a single request.
+        :return: status of each job, in the same order
+        """
+        return [self.check_job_status(job) for job in jobs]
+
+    def split_job_slice(self, job_slice: Mapping[str, Any]) -> Optional[List[Mapping[str, Any]]]:
+        """
+        Override this method to split the slice of a job which keeps failing, e.g: because its report is too large.
+        :return: smaller slices covering the same data, in order, or None if the slice can't be split
+        """
+        return None
+
+    def cancel_job(self, job: AsyncJob):
+        """
+        Override this method to cancel a timed out job on the API side
+        """
+
+    def _start_jobs(self, window: Deque[_SliceJobs], job_slices: Iterator[Mapping[str, Any]]):
+        """
+        Starts pending jobs, earliest slices first, until max_running_jobs jobs are running or there are no slices left
+        """
+        running = sum(job.status == AsyncJobStatus.RUNNING for slice_jobs in window for job in slice_jobs.jobs)
+        position = 0
+        while running < self.max_running_jobs:
+            if position == len(window):
+                job_slice = next(job_slices, None)
+                if job_slice is None:
+                    return
+                window.append(_SliceJobs(job_slice))
+            for job in window[position].jobs:
+                if running < self.max_running_jobs and job.status == AsyncJobStatus.PENDING:
+                    job.handle = self.create_job(job.job_slice)
+                    job.started_at = time.monotonic()
+                    job.status = AsyncJobStatus.RUNNING
+                    running += 1
+            position += 1
+
+    def _on_job_failed(self, slice_jobs: _SliceJobs, job: AsyncJob):
+        if job.attempt < self.max_job_attempts:
+            self.logger.info(f"{job} failed, retrying it")
+            slice_jobs.replace(job, [AsyncJob(job.job_slice, attempt=job.attempt + 1)])
+            return
+        smaller_slices = self.split_job_slice(job.job_slice)
+        if not smaller_slices:
+            raise AsyncJobFailedException(f"{job} failed after {job.attempt} attempts")
+        self.logger.info(f"{job} failed after {job.attempt} attempts, splitting it into {len(smaller_slices)} jobs")
+        slice_jobs.replace(job, [AsyncJob(smaller_slice) for smaller_slice in smaller_slices])
+
+    def stream_slices(
+        self, sync_mode: SyncMode, cursor_field: List[str] = None, stream_state: Mapping[str, Any] = None
+    ) -> Iterable[Optional[Mapping[str, Any]]]:
+        """
+        Runs the jobs of all the job slices
+        :return: for every job slice, in order, {"job_slice": <job slice>, "jobs": <completed jobs of the job slice>}
+        """
+        job_slices = iter(self.job_slices(stream_state=stream_state))
+        window: Deque[_SliceJobs] = deque()
+        poll_interval = self.min_poll_interval
+        while True:
+            self._start_jobs(window, job_slices)
+            if window and window[0].completed:
+                slice_jobs = window.popleft()
+                yield {"job_slice": slice_jobs.job_slice, "jobs": slice_jobs.jobs}
+                continue
+            if not window:
+                return
+
+            running = [(slice_jobs, job) for slice_jobs in window for job in slice_jobs.jobs if job.status == AsyncJobStatus.RUNNING]
+            time.sleep(poll_interval)
+            statuses = self.check_jobs_status([job for _, job in running])
+            completed = False
+            for (slice_jobs, job), status in zip(running, statuses):
+                if status == AsyncJobStatus.RUNNING and self.job_timeout is not None and job.elapsed_time() > self.job_timeout:
+                    self.logger.info(f"{job} is still running after {self.job_timeout} seconds, cancelling it")
+                    self.cancel_job(job)
+                    status = AsyncJobStatus.FAILED
+                job.status = status
+                if status == AsyncJobStatus.COMPLETED:
+                    completed = True
+                elif status == AsyncJobStatus.FAILED:
+                    self._on_job_failed(slice_jobs, job)
+            poll_interval = self.min_poll_interval if completed else min(poll_interval * self.poll_interval_factor, self.max_poll_interval)
+
+    def read_records(
+        self,
+        sync_mode: SyncMode,
+        cursor_field: List[str] = None,
+        stream_slice: Mapping[str, Any] = None,
+        stream_state: Mapping[str, Any] = None,
+    ) -> Iterable[Mapping[str, Any]]:
+        for job in stream_slice["jobs"]:
+            yield from self.read_job_records(job)
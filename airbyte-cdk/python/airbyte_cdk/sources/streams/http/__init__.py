@@ -1,5 +1,16 @@
 # Initialize Streams Package
 from .exceptions import UserDefinedBackoffException
 from .http import HttpStream, HttpSubStream
+from .rate_limiter import RateLimiter
+from .record_cache import RecordCache
 
-__all__ = ["HttpStream", "HttpSubStream", "UserDefinedBackoffException"]
+__all__ = ["AsyncHttpStream", "HttpStream", "HttpSubStream", "RateLimiter", "RecordCache", "UserDefinedBackoffException"]
+
+
+def __getattr__(name: str):
+    # AsyncHttpStream needs aiohttp, an optional dependency installed with airbyte-cdk[async], so it is only imported when it is used
+    if name == "AsyncHttpStream":
+        from .async_http import AsyncHttpStream
+
+        return AsyncHttpStream
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,278 @@
+#
+# Copyright (c) 2021 Airbyte, Inc., all rights reserved.
+#
+
+
+import asyncio
+import random
+import threading
+from abc import ABC
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Iterable, List, Mapping, Optional, Tuple, Union
+
+import aiohttp
+import requests
+from airbyte_cdk.logger import AirbyteLogger
+from airbyte_cdk.models import SyncMode
+from requests import codes
+from requests.auth import AuthBase
+from requests.structures import CaseInsensitiveDict
+
+from .auth.core import HttpAuthenticator
+from .exceptions import DefaultBackoffException, UserDefinedBackoffException
+from .http import HttpStream
+from .rate_limiting import decorrelated_jitter, rate_limit_wait_time, session_cooldown
+
+TRANSIENT_ASYNC_EXCEPTIONS = (DefaultBackoffException, aiohttp.ClientConnectionError, asyncio.TimeoutError)
+
+logger = AirbyteLogger()
+
+
+class AsyncHttpStream(HttpStream, ABC):
+    """
+    Base abstract class for an Airbyte Stream sending its HTTP requests from an asyncio event loop.
+
+    AsyncHttpStream exposes the same hooks as HttpStream (path, request_params, next_page_token, parse_response, should_retry, backoff_time, ...)
+    and passes the same requests.Response objects to them, so an HttpStream can be switched to this class without changing its code.
+    Requests are sent with a connection-pooled aiohttp session running on an event loop owned by the stream, which lets the stream keep
+    max_concurrent_slices slices in flight without using a thread per request. Use it for fan-out endpoints producing many slices.
+
+    Pages of a single slice are still requested one after another since every page token depends on the previous response.
+    The stream hooks building requests and parsing responses, as well as the authenticator, which may refresh its token with a blocking
+    request, run on a thread pool of max_concurrent_slices threads so that they never block the requests in flight on the event loop.
+    Records of every slice in flight are held in memory until the slice is emitted.
+    Response caching (use_cache) and streaming response bodies (stream_response) are not supported.
+
+    The event loop and the connection pool are released by close(), which AbstractSource calls once the stream is read.
+    Requires aiohttp, installed with airbyte-cdk[async].
+    """
+
+    def __init__(self, authenticator: Union[AuthBase, HttpAuthenticator] = None):
+        super().__init__(authenticator=authenticator)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+        self._client_session: Optional[aiohttp.ClientSession] = None
+        self._hooks_executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def max_concurrent_slices(self) -> Optional[int]:
+        """
+        Override if needed. Specifies how many stream slices are read at the same time on the event loop.
+        """
+        return 10
+
+    @property
+    def max_connections(self) -> int:
+        """
+        Override if needed. Specifies the size of the connection pool shared by all requests of this stream.
+        """
+        return self.max_concurrent_slices or 1
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Event loop sending the requests of this stream. It runs in a daemon thread started on first use.
+        """
+        with self._loop_lock:
+            if not self._loop:
+                self._loop = asyncio.new_event_loop()
+                self._hooks_executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrent_slices or 1, thread_name_prefix=f"{self.name}_hooks"
+                )
+                self._loop.set_default_executor(self._hooks_executor)
+                self._loop_thread = threading.Thread(target=self._loop.run_forever, name=f"{self.name}_event_loop", daemon=True)
+                self._loop_thread.start()
+        return self._loop
+
+    def close(self):
+        """
+        Closes the connection pool and stops the event loop of this stream.
+        """
+        with self._loop_lock:
+            if not self._loop:
+                return
+            if self._client_session:
+                asyncio.run_coroutine_threadsafe(self._client_session.close(), self._loop).result()
+                self._client_session = None
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            # the loop can only be closed once it stopped running, closing it releases its selector
+            self._loop_thread.join()
+            self._loop.close()
+            self._loop = None
+            self._loop_thread = None
+            self._hooks_executor.shutdown(wait=False)
+            self._hooks_executor = None
+
+    def _run(self, coroutine) -> Future:
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    async def _get_client_session(self) -> aiohttp.ClientSession:
+        # the session has to be created from within the event loop it is bound to
+        if not self._client_session:
+            self._client_session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.max_connections))
+        return self._client_session
+
+    async def _send_async(self, request: requests.PreparedRequest, request_kwargs: Mapping[str, Any]) -> requests.Response:
+        """
+        Sends the prepared request with aiohttp and converts the answer to a requests.Response so it can be passed to the stream hooks.
+        Only the "timeout" option of request_kwargs is supported.
+        """
+        session = await self._get_client_session()
+        timeout = request_kwargs.get("timeout")
+        await asyncio.sleep(session_cooldown(self._session).remaining())
+        rate_limiter = self.rate_limiter
+        if rate_limiter:
+            await asyncio.sleep(rate_limiter.reserve())
+        async with session.request(
+            request.method,
+            request.url,
+            headers=dict(request.headers),
+            data=request.body,
+            timeout=aiohttp.ClientTimeout(total=timeout) if isinstance(timeout, (int, float)) else None,
+        ) as client_response:
+            response = requests.Response()
+            response._content = await client_response.read()
+            response.status_code = client_response.status
+            response.reason = client_response.reason
+            response.headers = CaseInsensitiveDict(client_response.headers)
+            response.encoding = client_response.charset
+            response.url = str(client_response.url)
+            response.request = request
+            if rate_limiter:
+                rate_limiter.update(response)
+            return response
+
+    def _raise_for_response(self, request: requests.PreparedRequest, response: requests.Response):
+        """
+        Same error handling as HttpStream._send: raises a backoff exception for retryable responses and an HTTPError for other failures
+        unless raise_on_http_errors is False.
+        """
+        if self.should_retry(response):
+            custom_backoff_time = self.backoff_time(response)
+            if custom_backoff_time:
+                raise UserDefinedBackoffException(backoff=custom_backoff_time, request=request, response=response)
+            else:
+                raise DefaultBackoffException(request=request, response=response)
+        elif self.raise_on_http_errors:
+            response.raise_for_status()
+
+    async def _send_request_async(self, request: requests.PreparedRequest, request_kwargs: Mapping[str, Any]) -> requests.Response:
+        """
+        Async counterpart of HttpStream._send_request, sleeping on the event loop between the retries instead of blocking a thread.
+        Waits are computed the same way as by the backoff handlers of HttpStream, sharing the same session cooldown.
+        """
+        max_tries = None if self.max_retries is None else max(0, self.max_retries) + 1
+        cooldown = session_cooldown(self._session)
+        tries = 0
+        previous_wait = None
+        while True:
+            tries += 1
+            try:
+                response = await self._send_async(request, request_kwargs)
+                self._raise_for_response(request, response)
+                return response
+            except UserDefinedBackoffException as e:
+                if max_tries is not None and tries >= max_tries:
+                    logger.error(f"Max retry limit reached. Request: {e.request}, Response: {e.response}")
+                    raise
+                # extra second to cover any fractions of second, jittered so that throttled streams don't retry at the same time
+                wait = e.backoff + random.uniform(1, 2)
+                cooldown.extend(wait)
+                wait = max(wait, cooldown.remaining())
+                self.backoff_stats.record(wait)
+                logger.info(f"Retrying. Sleeping for {wait:.1f} seconds. Backoff so far: {self.backoff_stats}")
+                await asyncio.sleep(wait)
+            except TRANSIENT_ASYNC_EXCEPTIONS as e:
+                response = getattr(e, "response", None)
+                if response is not None and response.status_code != codes.too_many_requests and 400 <= response.status_code < 500:
+                    # same as default_backoff_handler, an unexpected 4XX error is probably consistent so we don't back off
+                    logger.info(f"Giving up for returned HTTP status: {response.status_code}")
+                    raise
+                if max_tries is not None and tries >= max_tries:
+                    raise
+                wait = rate_limit_wait_time(response)
+                if wait is None:
+                    wait = previous_wait = decorrelated_jitter(self.retry_factor, previous_wait, cap=self.max_backoff_time)
+                if response is not None and response.status_code == codes.too_many_requests:
+                    cooldown.extend(wait)
+                    wait = max(wait, cooldown.remaining())
+                self.backoff_stats.record(wait)
+                logger.info(
+                    f"Caught retryable error '{str(e) or repr(e)}' after {tries} tries. Waiting {wait:.1f} seconds then retrying... "
+                    f"Backoff so far: {self.backoff_stats}"
+                )
+                await asyncio.sleep(wait)
+
+    def _prepare_request(
+        self, stream_state: Mapping[str, Any], stream_slice: Mapping[str, Any] = None, next_page_token: Mapping[str, Any] = None
+    ) -> requests.PreparedRequest:
+        request_headers = self.request_headers(stream_state=stream_state, stream_slice=stream_slice, next_page_token=next_page_token)
+        return self._create_prepared_request(
+            path=self.path(stream_state=stream_state, stream_slice=stream_slice, next_page_token=next_page_token),
+            headers=dict(request_headers, **self.authenticator.get_auth_header()),
+            params=self.request_params(stream_state=stream_state, stream_slice=stream_slice, next_page_token=next_page_token),
+            json=self.request_body_json(stream_state=stream_state, stream_slice=stream_slice, next_page_token=next_page_token),
+            data=self.request_body_data(stream_state=stream_state, stream_slice=stream_slice, next_page_token=next_page_token),
+        )
+
+    def _prepare_page_request(
+        self, stream_state: Mapping[str, Any], stream_slice: Mapping[str, Any] = None, next_page_token: Mapping[str, Any] = None
+    ) -> Tuple[requests.PreparedRequest, Mapping[str, Any]]:
+        request = self._prepare_request(stream_state=stream_state, stream_slice=stream_slice, next_page_token=next_page_token)
+        request_kwargs = self.request_kwargs(stream_state=stream_state, stream_slice=stream_slice, next_page_token=next_page_token)
+        return request, request_kwargs
+
+    def _parse_page(
+        self, response: requests.Response, stream_state: Mapping[str, Any], stream_slice: Mapping[str, Any] = None
+    ) -> Tuple[List[Mapping[str, Any]], Optional[Mapping[str, Any]]]:
+        records = list(self.parse_response(response, stream_state=stream_state, stream_slice=stream_slice))
+        return records, self.next_page_token(response)
+
+    async def _read_slice_async(
+        self, stream_slice: Mapping[str, Any] = None, stream_state: Mapping[str, Any] = None
+    ) -> List[Mapping[str, Any]]:
+        stream_state = stream_state or {}
+        loop = asyncio.get_running_loop()
+        records = []
+        next_page_token = None
+        while True:
+            # the hooks may block, e.g: on a token refresh, they run on the default executor of the loop, see the loop property
+            request, request_kwargs = await loop.run_in_executor(
+                None, self._prepare_page_request, stream_state, stream_slice, next_page_token
+            )
+            response = await self._send_request_async(request, request_kwargs)
+            page_records, next_page_token = await loop.run_in_executor(None, self._parse_page, response, stream_state, stream_slice)
+            records.extend(page_records)
+            if not next_page_token:
+                return records
+
+    def read_records_future(
+        self,
+        sync_mode: SyncMode,
+        cursor_field: List[str] = None,
+        stream_slice: Mapping[str, Any] = None,
+        stream_state: Mapping[str, Any] = None,
+    ) -> Future:
+        """
+        Schedules reading all pages of a stream slice on the event loop without blocking the caller.
+        :return: a future resolved with the list of records of the slice
+        """
+        return self._run(self._read_slice_async(stream_slice=stream_slice, stream_state=stream_state))
+
+    def read_records(
+        self,
+        sync_mode: SyncMode,
+        cursor_field: List[str] = None,
+        stream_slice: Mapping[str, Any] = None,
+        stream_state: Mapping[str, Any] = None,
+    ) -> Iterable[Mapping[str, Any]]:
+        stream_state = stream_state or {}
+        next_page_token = None
+        while True:
+            request, request_kwargs = self._prepare_page_request(stream_state, stream_slice, next_page_token)
+            response = self._run(self._send_request_async(request, request_kwargs)).result()
+            yield from self.parse_response(response, stream_state=stream_state, stream_slice=stream_slice)
+            next_page_token = self.next_page_token(response)
+            if not next_page_token:
+                return
@@ -3,6 +3,7 @@
 #
 
 
+import json
 import os
 from abc import ABC, abstractmethod
 from typing import Any, Iterable, List, Mapping, MutableMapping, Optional, Union
@@ -16,7 +17,9 @@ from requests.auth import AuthBase
 
 from .auth.core import HttpAuthenticator, NoAuth
 from .exceptions import DefaultBackoffException, RequestBodyException, UserDefinedBackoffException
-from .rate_limiting import default_backoff_handler, user_defined_backoff_handler
+from .rate_limiter import RateLimiter
+from .rate_limiting import MAX_BACKOFF_TIME, BackoffStats, default_backoff_handler, session_cooldown, user_defined_backoff_handler
+from .record_cache import RecordCache
 
 # list of all possible HTTP methods which can be used for sending of request bodies
 BODY_REQUEST_METHODS = ("POST", "PUT", "PATCH")
@@ -33,6 +36,8 @@ class HttpStream(Stream, ABC):
     # TODO: remove legacy HttpAuthenticator authenticator references
     def __init__(self, authenticator: Union[AuthBase, HttpAuthenticator] = None):
         self._session = requests.Session()
+        # retries of this stream and time spent waiting before them
+        self.backoff_stats = BackoffStats()
 
         self._authenticator = NoAuth()
         if isinstance(authenticator, AuthBase):
@@ -102,12 +107,55 @@ class HttpStream(Stream, ABC):
         return 5
 
     @property
-    def retry_factor(self) -> int:
+    def retry_factor(self) -> float:
         """
-        Override if needed. Specifies factor for backoff policy.
+        Override if needed. Specifies factor for backoff policy: the shortest wait in seconds before retrying a transient error, later
+        waits are randomly drawn up to three times the previous one.
         """
         return 5
 
+    @property
+    def max_backoff_time(self) -> float:
+        """
+        Override if needed. Specifies the longest wait in seconds between two retries of a transient error. Waits requested by the API
+        with the Retry-After or rate limit headers, or returned by backoff_time, are not capped.
+        """
+        return MAX_BACKOFF_TIME
+
+    @property
+    def max_concurrent_slices(self) -> Optional[int]:
+        """
+        Override if needed. Specifies how many stream slices are read at the same time, e.g: for date-windowed streams producing many
+        independent slices. Records are still emitted slice by slice in the order returned by stream_slices, and the stream state is only
+        advanced once all previous slices are read. Records of the slices in flight are read ahead into a bounded buffer until they are
+        emitted.
+
+        Note that each slice is read with the stream state known when it was scheduled, so the stream has to select its data using the
+        stream slice rather than the latest stream state. Return None to read slices one after another.
+        """
+        return None
+
+    @property
+    def rate_limiter(self) -> Optional[RateLimiter]:
+        """
+        Override if needed. Rate limiter pacing every request of this stream, retries included, to stay within the rate limits of the API.
+        Return the same instance from all the streams hitting the same API so that they share its quota, e.g: by assigning it to a class
+        attribute of their base class. Return None to send requests as fast as possible.
+        """
+        return None
+
+    @property
+    def stream_response(self) -> bool:
+        """
+        Override if needed. If True, the response body is not downloaded before parse_response is called but read from the connection
+        while parse_response consumes it, e.g: with the helpers of airbyte_cdk.sources.streams.http.response_parsers. Use it for endpoints
+        returning large bodies (e.g: exports) so that memory usage doesn't depend on the size of the response.
+
+        The body can only be read once: next_page_token is called after parse_response and must not read it. Bodies of error responses are
+        still downloaded up front so should_retry, backoff_time and error handling can read them as usual.
+        """
+        return False
+
     @property
     def authenticator(self) -> HttpAuthenticator:
         return self._authenticator
@@ -232,7 +280,8 @@ class HttpStream(Stream, ABC):
         This method is called only if should_backoff() returns True for the input request.
 
         :return how long to backoff in seconds. The return value may be a floating point number for subsecond precision. Returning None defers backoff
-        to the default backoff behavior (e.g using an exponential algorithm).
+        to the default backoff behavior: waiting for as long as the Retry-After or X-RateLimit-Reset headers say if the response has them,
+        using exponential backoff with jitter otherwise.
         """
         return None
 
@@ -271,7 +320,18 @@ class HttpStream(Stream, ABC):
         Unexpected transient exceptions use the default backoff parameters.
         Unexpected persistent exceptions are not handled and will cause the sync to fail.
         """
+        # hold back while the API throttles the streams sharing the session
+        session_cooldown(self._session).wait()
+        rate_limiter = self.rate_limiter
+        if rate_limiter:
+            rate_limiter.acquire()
         response: requests.Response = self._session.send(request, **request_kwargs)
+        if rate_limiter:
+            rate_limiter.update(response)
+
+        if request_kwargs.get("stream") and not response.ok:
+            # error bodies are small, reading them releases the connection and lets error handlers use the response as usual
+            response.content
 
         if self.should_retry(response):
             custom_backoff_time = self.backoff_time(response)
@@ -313,8 +373,15 @@ class HttpStream(Stream, ABC):
         if max_tries is not None:
             max_tries = max(0, max_tries) + 1
 
-        user_backoff_handler = user_defined_backoff_handler(max_tries=max_tries)(self._send)
-        backoff_handler = default_backoff_handler(max_tries=max_tries, factor=self.retry_factor)
+        cooldown = session_cooldown(self._session)
+        user_backoff_handler = user_defined_backoff_handler(max_tries=max_tries, cooldown=cooldown, stats=self.backoff_stats)(self._send)
+        backoff_handler = default_backoff_handler(
+            max_tries=max_tries,
+            factor=self.retry_factor,
+            cooldown=cooldown,
+            stats=self.backoff_stats,
+            max_time_between_tries=self.max_backoff_time,
+        )
         return backoff_handler(user_backoff_handler)(request, request_kwargs)
 
     def read_records(
@@ -338,6 +405,8 @@ class HttpStream(Stream, ABC):
                 data=self.request_body_data(stream_state=stream_state, stream_slice=stream_slice, next_page_token=next_page_token),
             )
             request_kwargs = self.request_kwargs(stream_state=stream_state, stream_slice=stream_slice, next_page_token=next_page_token)
+            if self.stream_response:
+                request_kwargs = {**request_kwargs, "stream": True}
 
             if self.use_cache:
                 # use context manager to handle and store cassette metadata
@@ -350,9 +419,13 @@ class HttpStream(Stream, ABC):
             else:
                 response = self._send_request(request, request_kwargs)
 
-            yield from self.parse_response(response, stream_state=stream_state, stream_slice=stream_slice)
-
-            next_page_token = self.next_page_token(response)
+            try:
+                yield from self.parse_response(response, stream_state=stream_state, stream_slice=stream_slice)
+                next_page_token = self.next_page_token(response)
+            finally:
+                if self.stream_response:
+                    # returns the connection to the pool even if the body wasn't fully read
+                    response.close()
             if not next_page_token:
                 pagination_complete = True
 
@@ -368,6 +441,35 @@ class HttpSubStream(HttpStream, ABC):
         super().__init__(**kwargs)
         self.parent = parent
 
+    @property
+    def parent_cache(self) -> Optional[RecordCache]:
+        """
+        Override if needed. Cache of the parent records read to build the stream slices. Return the same instance from the sub-streams
+        sharing a parent so that the parent is read once for all of them: create one instance per source in its streams method and pass
+        it to the constructors of the sub-streams, so the cached records are dropped along with the streams once the sync is over.
+        The parent records of a slice are only shared between reads of the parent stream with the same name, stream slice and state.
+        Return None to read the parent stream for every sub-stream.
+        """
+        return None
+
+    def _read_parent_records(
+        self, stream_slice: Mapping[str, Any], cursor_field: List[str] = None, stream_state: Mapping[str, Any] = None
+    ) -> Iterable[Mapping[str, Any]]:
+        def read() -> Iterable[Mapping[str, Any]]:
+            return self.parent.read_records(
+                sync_mode=SyncMode.full_refresh, cursor_field=cursor_field, stream_slice=stream_slice, stream_state=stream_state
+            )
+
+        parent_cache = self.parent_cache
+        if not parent_cache:
+            return read()
+        key = (
+            self.parent.name,
+            json.dumps(stream_slice, sort_keys=True, default=str),
+            json.dumps(stream_state, sort_keys=True, default=str),
+        )
+        return parent_cache.read_records(key, read)
+
     def stream_slices(
         self, sync_mode: SyncMode, cursor_field: List[str] = None, stream_state: Mapping[str, Any] = None
     ) -> Iterable[Optional[Mapping[str, Any]]]:
@@ -377,9 +479,7 @@ class HttpSubStream(HttpStream, ABC):
 
         # iterate over all parent stream_slices
         for stream_slice in parent_stream_slices:
-            parent_records = self.parent.read_records(
-                sync_mode=SyncMode.full_refresh, cursor_field=cursor_field, stream_slice=stream_slice, stream_state=stream_state
-            )
+            parent_records = self._read_parent_records(stream_slice=stream_slice, cursor_field=cursor_field, stream_state=stream_state)
 
             # iterate over all parent records with current stream_slice
             for record in parent_records:
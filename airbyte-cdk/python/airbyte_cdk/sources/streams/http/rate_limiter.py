@@ -0,0 +1,132 @@
+#
+# Copyright (c) 2021 Airbyte, Inc., all rights reserved.
+#
+
+
+import threading
+import time
+from typing import List, Optional, Sequence, Tuple
+
+import requests
+from airbyte_cdk.logger import AirbyteLogger
+
+# Headers holding the number of requests left in the current window of the API, in order of preference
+DEFAULT_REMAINING_HEADERS = ("X-RateLimit-Remaining", "RateLimit-Remaining", "X-Rate-Limit-Remaining")
+# Headers holding when the current window of the API ends, either in seconds from now or as an epoch timestamp
+DEFAULT_RESET_HEADERS = ("X-RateLimit-Reset", "RateLimit-Reset", "X-Rate-Limit-Reset")
+
+# Reset header values above this are epoch timestamps rather than a number of seconds
+_EPOCH_THRESHOLD = 10 ** 9
+
+logger = AirbyteLogger()
+
+
+class _TokenBucket:
+    def __init__(self, requests: int, seconds: float):
+        self.capacity = requests
+        self.refill_per_second = requests / seconds
+        self.tokens = float(requests)
+
+    def refill(self, elapsed: float):
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+
+    def take(self) -> float:
+        """
+        Takes a token, possibly one which will only be available in the future
+        :return: how long to wait in seconds until the token is actually available
+        """
+        self.tokens -= 1
+        return max(0.0, -self.tokens / self.refill_per_second)
+
+
+class RateLimiter:
+    """
+    Paces requests to stay within the rate limits of an API instead of relying on sleeps after each response or on 429 errors.
+
+    Every limit is a token bucket allowing `requests` requests per `seconds` seconds: up to `requests` requests can be sent at once and the
+    budget then refills continuously. E.g: an API allowing bursts of 3 requests per second but only 400 requests per hour is described as
+        ```
+        RateLimiter(limits=[(3, 1), (400, 3600)])
+        ```
+    When the API tells how many requests are left (e.g: X-RateLimit-Remaining), the limiter never sends more than that and waits for the
+    window to reset (e.g: X-RateLimit-Reset) once there are none left.
+
+    A rate limiter is thread-safe and meant to be shared: return the same instance from all the streams hitting the same API so they
+    share its quota, see HttpStream.rate_limiter.
+    """
+
+    def __init__(
+        self,
+        limits: Sequence[Tuple[int, float]],
+        remaining_headers: Sequence[str] = DEFAULT_REMAINING_HEADERS,
+        reset_headers: Sequence[str] = DEFAULT_RESET_HEADERS,
+    ):
+        """
+        :param limits: list of (requests, seconds) tuples, each one allowing that many requests per period of that many seconds
+        :param remaining_headers: response headers holding the number of requests left, an empty list ignores them
+        :param reset_headers: response headers holding when the API resets its quota, in seconds from now or as an epoch timestamp
+        """
+        if not limits:
+            raise ValueError("At least one (requests, seconds) limit is required")
+        self._buckets: List[_TokenBucket] = [_TokenBucket(requests, seconds) for requests, seconds in limits]
+        self._remaining_headers = remaining_headers
+        self._reset_headers = reset_headers
+        self._lock = threading.Lock()
+        self._updated_at = time.monotonic()
+        # requests are held until then once the API said there are none left
+        self._blocked_until = 0.0
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            for bucket in self._buckets:
+                bucket.refill(elapsed)
+            self._updated_at = now
+
+    def reserve(self) -> float:
+        """
+        Reserves the right to send a request without blocking, for callers which can't sleep on their thread (e.g: asyncio code).
+        :return: how long to wait in seconds before sending the request
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = max([bucket.take() for bucket in self._buckets] + [self._blocked_until - now])
+        if wait > 0:
+            logger.debug(f"Rate limit reached, waiting {wait:.2f} seconds before sending the next request")
+        return wait
+
+    def acquire(self):
+        """
+        Blocks until a request can be sent
+        """
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def _header_value(self, response: requests.Response, names: Sequence[str]) -> Optional[float]:
+        for name in names:
+            value = response.headers.get(name)
+            if value is not None:
+                try:
+                    return float(value)
+                except ValueError:
+                    continue
+        return None
+
+    def update(self, response: requests.Response):
+        """
+        Aligns the limiter with the rate limit headers of the response, if any
+        """
+        remaining = self._header_value(response, self._remaining_headers)
+        if remaining is None:
+            return
+        reset = self._header_value(response, self._reset_headers)
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            for bucket in self._buckets:
+                bucket.tokens = min(bucket.tokens, remaining)
+            if remaining <= 0 and reset is not None:
+                reset_in = reset - time.time() if reset > _EPOCH_THRESHOLD else reset
+                self._blocked_until = max(self._blocked_until, now + max(0.0, reset_in))
@@ -3,27 +3,177 @@
 #
 
 
+import random
 import sys
+import threading
 import time
+import weakref
+from email.utils import parsedate_to_datetime
+from typing import Optional
 
 import backoff
+import requests
 from airbyte_cdk.logger import AirbyteLogger
 from requests import codes, exceptions
 
 from .exceptions import DefaultBackoffException, UserDefinedBackoffException
+from .rate_limiter import DEFAULT_REMAINING_HEADERS, DEFAULT_RESET_HEADERS
 
 TRANSIENT_EXCEPTIONS = (DefaultBackoffException, exceptions.ConnectTimeout, exceptions.ReadTimeout, exceptions.ConnectionError)
 
+# Longest wait between two retries when the API doesn't tell how long to wait
+MAX_BACKOFF_TIME = 600
+
+# Reset header values above this are epoch timestamps rather than a number of seconds
+_EPOCH_THRESHOLD = 10 ** 9
+
 # TODO inject singleton logger?
 logger = AirbyteLogger()
 
 
-def default_backoff_handler(max_tries: int, factor: int, **kwargs):
-    def log_retry_attempt(details):
+class BackoffStats:
+    """
+    Counts the retries of a stream and the time spent waiting before them, i.e: how much of the sync goes to throttling and errors
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.retries = 0
+        self.wait_time = 0.0
+
+    def record(self, wait: float):
+        with self._lock:
+            self.retries += 1
+            self.wait_time += wait
+
+    def __str__(self) -> str:
+        return f"{self.retries} retries, {self.wait_time:.1f} seconds waited"
+
+
+class Cooldown:
+    """
+    Holds back every request sent with a session once one of them was throttled, so that the streams sharing the session don't keep
+    hitting the API and don't all retry at the same time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._until = 0.0
+
+    def extend(self, seconds: float):
+        with self._lock:
+            self._until = max(self._until, time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        return max(0.0, self._until - time.monotonic())
+
+    def wait(self):
+        remaining = self.remaining()
+        if remaining > 0:
+            time.sleep(remaining)
+
+
+_session_cooldowns = weakref.WeakKeyDictionary()
+_session_cooldowns_lock = threading.Lock()
+
+
+def session_cooldown(session: requests.Session) -> Cooldown:
+    """
+    :return: the cooldown shared by all the streams sending requests with this session
+    """
+    with _session_cooldowns_lock:
+        cooldown = _session_cooldowns.get(session)
+        if cooldown is None:
+            cooldown = _session_cooldowns[session] = Cooldown()
+        return cooldown
+
+
+def _reset_delay(response: requests.Response) -> Optional[float]:
+    for remaining_header in DEFAULT_REMAINING_HEADERS:
+        remaining = response.headers.get(remaining_header)
+        if remaining is not None:
+            break
+    else:
+        return None
+    for reset_header in DEFAULT_RESET_HEADERS:
+        reset = response.headers.get(reset_header)
+        if reset is not None:
+            break
+    else:
+        return None
+    try:
+        remaining, reset = float(remaining), float(reset)
+    except ValueError:
+        return None
+    if remaining > 0:
+        return None
+    return max(0.0, reset - time.time() if reset > _EPOCH_THRESHOLD else reset)
+
+
+def rate_limit_wait_time(response: Optional[requests.Response]) -> Optional[float]:
+    """
+    Reads how long the API asks to wait before the next request: the Retry-After header, in seconds or as an HTTP date, or the reset time
+    of the X-RateLimit-* / RateLimit-* headers once no request is left.
+    :return: the time to wait in seconds, None if the response doesn't tell
+    """
+    if response is None:
+        return None
+    retry_after = response.headers.get("Retry-After")
+    if retry_after is not None:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+        except (TypeError, ValueError, IndexError):
+            pass
+    return _reset_delay(response)
+
+
+def decorrelated_jitter(base: float, previous: Optional[float], cap: float = MAX_BACKOFF_TIME) -> float:
+    """
+    Decorrelated jitter backoff (https://aws.amazon.com/blogs/architecture/exponential-backoff-and-jitter/): every wait is drawn between
+    the base and three times the previous one, so clients failing together don't retry in lockstep.
+    """
+    return min(cap, random.uniform(base, max(base, previous or base) * 3))
+
+
+def _is_throttled(exc: Exception) -> bool:
+    response = getattr(exc, "response", None)
+    return response is not None and response.status_code == codes.too_many_requests
+
+
+def default_backoff_handler(
+    max_tries: int, factor: float, cooldown: Cooldown = None, stats: BackoffStats = None, max_time_between_tries: float = None, **kwargs
+):
+    """
+    Retries transient errors, waiting for as long as the Retry-After or rate limit headers of the response say, with decorrelated jitter
+    starting at `factor` seconds otherwise.
+    :param cooldown: shared with the other streams using the same session, held back for as long as the API throttles requests
+    :param stats: counts the retries and the time spent waiting
+    :param max_time_between_tries: longest wait between two retries when the API doesn't tell how long to wait
+    """
+    previous_waits = threading.local()
+    max_time_between_tries = max_time_between_tries or MAX_BACKOFF_TIME
+
+    def wait_before_retry(details):
         _, exc, _ = sys.exc_info()
+        wait = rate_limit_wait_time(getattr(exc, "response", None))
+        if wait is None:
+            # retries of one call are sequential on the same thread, a first try starts a new call
+            previous = getattr(previous_waits, "wait", None) if details["tries"] > 1 else None
+            wait = previous_waits.wait = decorrelated_jitter(factor, previous, cap=max_time_between_tries)
+        if cooldown and _is_throttled(exc):
+            cooldown.extend(wait)
+            wait = max(wait, cooldown.remaining())
+        if stats:
+            stats.record(wait)
         logger.info(
-            f"Caught retryable error '{str(exc)}' after {details['tries']} tries. Waiting {details['wait']} seconds then retrying..."
+            f"Caught retryable error '{str(exc)}' after {details['tries']} tries. Waiting {wait:.1f} seconds then retrying..."
+            + (f" Backoff so far: {stats}" if stats else "")
         )
+        time.sleep(wait)
 
     def should_give_up(exc):
         # If a non-rate-limiting related 4XX error makes it this far, it means it was unexpected and probably consistent, so we shouldn't back off
@@ -33,24 +183,36 @@ def default_backoff_handler(max_tries: int, factor: int, **kwargs):
         return give_up
 
     return backoff.on_exception(
-        backoff.expo,
+        backoff.constant,
         TRANSIENT_EXCEPTIONS,
+        interval=0,  # skip waiting, we'll wait in on_backoff handler
         jitter=None,
-        on_backoff=log_retry_attempt,
+        on_backoff=wait_before_retry,
         giveup=should_give_up,
         max_tries=max_tries,
-        factor=factor,
         **kwargs,
     )
 
 
-def user_defined_backoff_handler(max_tries: int, **kwargs):
+def user_defined_backoff_handler(max_tries: int, cooldown: Cooldown = None, stats: BackoffStats = None, **kwargs):
+    """
+    Retries responses for which the stream returned a backoff time, waiting for that long.
+    :param cooldown: shared with the other streams using the same session, held back for the backoff time
+    :param stats: counts the retries and the time spent waiting
+    """
+
     def sleep_on_ratelimit(details):
         _, exc, _ = sys.exc_info()
         if isinstance(exc, UserDefinedBackoffException):
-            retry_after = exc.backoff
-            logger.info(f"Retrying. Sleeping for {retry_after} seconds")
-            time.sleep(retry_after + 1)  # extra second to cover any fractions of second
+            # extra second to cover any fractions of second, jittered so that throttled streams don't retry at the same time
+            retry_after = exc.backoff + random.uniform(1, 2)
+            if cooldown:
+                cooldown.extend(retry_after)
+                retry_after = max(retry_after, cooldown.remaining())
+            if stats:
+                stats.record(retry_after)
+            logger.info(f"Retrying. Sleeping for {retry_after:.1f} seconds" + (f". Backoff so far: {stats}" if stats else ""))
+            time.sleep(retry_after)
 
     def log_give_up(details):
         _, exc, _ = sys.exc_info()
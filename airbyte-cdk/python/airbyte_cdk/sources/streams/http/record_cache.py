@@ -0,0 +1,135 @@
+#
+# Copyright (c) 2021 Airbyte, Inc., all rights reserved.
+#
+
+
+import json
+import tempfile
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, Mapping, Optional, Tuple
+
+from airbyte_cdk.logger import AirbyteLogger
+
+logger = AirbyteLogger()
+
+
+class RecordCache:
+    """
+    Keeps the records of parent streams read by sub-streams, so that sibling sub-streams sharing a parent read it only once per sync.
+
+    Records are stored serialized, every reader gets its own copy of them. Entries are kept in memory up to `max_memory_size` bytes, then
+    spilled to a temporary file up to `max_disk_size` bytes. Beyond that, records are not cached and are read from the API again.
+    When a reader asks for records being read by another thread, it waits for that read to complete and replays them instead of sending
+    the same requests again.
+
+    A cache is thread-safe and meant to be shared, see HttpSubStream.parent_cache.
+    """
+
+    def __init__(self, max_memory_size: int = 64 * 1024 * 1024, max_disk_size: int = 1024 * 1024 * 1024, spill_dir: str = None):
+        """
+        :param max_memory_size: size in bytes of the serialized records kept in memory
+        :param max_disk_size: size in bytes of the serialized records spilled to disk once the memory is full, 0 disables spilling
+        :param spill_dir: directory of the spill file, defaults to the temporary directory of the system
+        """
+        self.max_memory_size = max_memory_size
+        self.max_disk_size = max_disk_size
+        self.spill_dir = spill_dir
+        self._lock = threading.Lock()
+        # key -> serialized records held in memory, or (offset, length) of the serialized records in the spill file
+        self._entries: Dict[Hashable, Any] = {}
+        # key -> (thread reading the records, event set once the read is over)
+        self._loading: Dict[Hashable, Tuple[int, threading.Event]] = {}
+        self._memory_size = 0
+        self._disk_size = 0
+        self._spill_file = None
+
+    def read_records(self, key: Hashable, read: Callable[[], Iterable[Mapping[str, Any]]]) -> Iterator[Mapping[str, Any]]:
+        """
+        :param key: identifies the records, reads with the same key must return the same records
+        :param read: reads the records when they are not cached
+        :return: iterator of the records, replayed from the cache if they were already read
+        """
+        while True:
+            with self._lock:
+                data = self._load(key)
+                if data is not None:
+                    break
+                loading = self._loading.get(key)
+                if loading is None or loading[0] == threading.get_ident():
+                    if loading is None:
+                        self._loading[key] = (threading.get_ident(), threading.Event())
+                    break
+            # another thread is reading these records, wait for it to be done and use its result
+            loading[1].wait()
+
+        if data is not None:
+            yield from self._replay(data)
+        elif loading is not None:
+            # the same thread asked again for records it hasn't finished reading, e.g: a nested read, so don't cache them twice
+            yield from read()
+        else:
+            yield from self._read_and_store(key, read)
+
+    def _read_and_store(self, key: Hashable, read: Callable[[], Iterable[Mapping[str, Any]]]) -> Iterator[Mapping[str, Any]]:
+        buffer = bytearray()
+        size_limit = max(self.max_memory_size, self.max_disk_size)
+        complete = False
+        try:
+            for record in read():
+                if buffer is not None:
+                    try:
+                        buffer += json.dumps(record).encode("utf-8") + b"\n"
+                    except (TypeError, ValueError) as e:
+                        # e.g: datetime or Decimal values, they would not be replayed as they were read
+                        logger.debug(f"Records of {key} can't be serialized, they are not cached: {repr(e)}")
+                        buffer = None
+                    else:
+                        if len(buffer) > size_limit:
+                            logger.debug(f"Records of {key} are too large to be cached")
+                            buffer = None
+                yield record
+            complete = True
+        finally:
+            with self._lock:
+                if complete and buffer is not None:
+                    self._store(key, bytes(buffer))
+                _, done = self._loading.pop(key)
+            done.set()
+
+    def _store(self, key: Hashable, data: bytes):
+        if self._memory_size + len(data) <= self.max_memory_size:
+            self._entries[key] = data
+            self._memory_size += len(data)
+        elif self._disk_size + len(data) <= self.max_disk_size:
+            if self._spill_file is None:
+                self._spill_file = tempfile.TemporaryFile(dir=self.spill_dir)
+            self._spill_file.seek(0, 2)
+            self._entries[key] = (self._spill_file.tell(), len(data))
+            self._spill_file.write(data)
+            self._disk_size += len(data)
+        else:
+            logger.debug(f"Record cache is full, records of {key} are not cached")
+
+    def _load(self, key: Hashable) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if isinstance(entry, tuple):
+            offset, length = entry
+            self._spill_file.seek(offset)
+            return self._spill_file.read(length)
+        return entry
+
+    @staticmethod
+    def _replay(data: bytes) -> Iterator[Mapping[str, Any]]:
+        for line in data.splitlines():
+            yield json.loads(line)
+
+    def clear(self):
+        """
+        Drops all the cached records and the spill file
+        """
+        with self._lock:
+            self._entries.clear()
+            self._memory_size = self._disk_size = 0
+            if self._spill_file is not None:
+                self._spill_file.close()
+                self._spill_file = None
@@ -0,0 +1,137 @@
+#
+# Copyright (c) 2021 Airbyte, Inc., all rights reserved.
+#
+
+"""
+Helpers parsing a response body while it is downloaded, for streams with HttpStream.stream_response enabled.
+Records are yielded as soon as their bytes arrive so memory usage doesn't depend on the size of the response.
+"""
+
+import codecs
+import csv
+import json
+from typing import Any, Iterable, Iterator, Mapping
+
+import requests
+
+# Size in bytes of the chunks read from the connection
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_JSON_WHITESPACE = " \t\n\r"
+_JSON_NUMBER_CHARS = "0123456789+-.eE"
+
+
+def _iter_text(response: requests.Response, chunk_size: int, encoding: str = None) -> Iterator[str]:
+    """
+    Decodes the body chunk by chunk, a character split between two chunks is decoded once the second chunk arrives
+    """
+    return codecs.iterdecode(response.iter_content(chunk_size=chunk_size), encoding or response.encoding or "utf-8")
+
+
+def iter_lines(response: requests.Response, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Splits the body on "\\n" only, unlike response.iter_lines() and str.splitlines() which also split on characters which may legitimately
+    appear within a line, e.g: "\\r" or "\\u2028" inside a JSON string.
+    :return: iterator of the lines of the body, without their line ending
+    """
+    pending = b""
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line.rstrip(b"\r")
+    if pending:
+        yield pending.rstrip(b"\r")
+
+
+def iter_json_lines(response: requests.Response, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Parses a JSON Lines body (http://jsonlines.org/), i.e: one JSON value per line. Blank lines are skipped.
+    :return: iterator of the JSON values of the body
+    """
+    for line in iter_lines(response, chunk_size=chunk_size):
+        if line.strip():
+            yield json.loads(line)
+
+
+def _iter_text_lines(chunks: Iterable[str]) -> Iterator[str]:
+    pending = ""
+    for chunk in chunks:
+        lines = (pending + chunk).split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line + "\n"
+    if pending:
+        yield pending
+
+
+def iter_csv_records(
+    response: requests.Response, encoding: str = None, chunk_size: int = DEFAULT_CHUNK_SIZE, **reader_kwargs
+) -> Iterator[Mapping[str, Any]]:
+    """
+    Parses a CSV body with a header row, values spanning several lines in quoted fields are supported.
+    :param encoding: encoding of the body, defaults to the response encoding or UTF-8
+    :param reader_kwargs: passed as is to csv.DictReader, e.g: delimiter or fieldnames
+    :return: iterator of records mapping the header fields to the values of each row
+    """
+    yield from csv.DictReader(_iter_text_lines(_iter_text(response, chunk_size, encoding)), **reader_kwargs)
+
+
+def iter_json_array(response: requests.Response, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Parses a body made of a top level JSON array, e.g: [{"id": 1}, {"id": 2}], yielding every element as soon as it is complete.
+    Only the element being parsed is kept in memory.
+    :return: iterator of the elements of the array
+    """
+    decoder = json.JSONDecoder()
+    chunks = _iter_text(response, chunk_size)
+    buffer, position = "", 0
+
+    def read_more() -> bool:
+        nonlocal buffer, position
+        chunk = next(chunks, None)
+        if chunk is None:
+            return False
+        # drop what was already parsed so the buffer only holds the current element
+        buffer, position = buffer[position:] + chunk, 0
+        return True
+
+    def next_char() -> str:
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in _JSON_WHITESPACE:
+                position += 1
+            if position < len(buffer):
+                return buffer[position]
+            if not read_more():
+                raise ValueError("Unexpected end of the response body while reading a JSON array")
+
+    if next_char() != "[":
+        raise ValueError(f"Expected the response to be a JSON array, found: {buffer[position:position + 20]!r}")
+    position += 1
+    if next_char() == "]":
+        return
+
+    while True:
+        next_char()
+        while True:
+            try:
+                element, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if not read_more():
+                    # the body ends with a truncated or invalid element
+                    raise
+                continue
+            if isinstance(element, (int, float)) and (end == len(buffer) or buffer[end] in _JSON_NUMBER_CHARS) and read_more():
+                # this number may continue in the next chunk, e.g: "-1" followed by ".5e-7"
+                continue
+            break
+        yield element
+        position = end
+
+        separator = next_char()
+        position += 1
+        if separator == "]":
+            return
+        if separator != ",":
+            raise ValueError(f"Expected ',' or ']' after an element of the JSON array, found: {buffer[position - 1:position + 19]!r}")
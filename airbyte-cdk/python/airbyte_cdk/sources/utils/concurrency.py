@@ -0,0 +1,179 @@
+#
+# Copyright (c) 2021 Airbyte, Inc., all rights reserved.
+#
+
+
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Iterable, Iterator, List, Tuple
+
+# How long a blocked worker waits before re-checking whether the consumer went away
+_POLL_INTERVAL_SECONDS = 0.1
+
+
+class _Done:
+    """Marks the end of a single producer's output"""
+
+    def __init__(self, index: int, error: BaseException = None):
+        self.index = index
+        self.error = error
+
+
+def _put(buffer: queue.Queue, item: Any, stopped: threading.Event) -> bool:
+    """
+    Puts an item in a bounded buffer, waiting for room unless the consumer went away
+    :return: False if the item was dropped because the consumer went away
+    """
+    while not stopped.is_set():
+        try:
+            buffer.put(item, timeout=_POLL_INTERVAL_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def interleave(producers: List[Callable[[], Iterable[Any]]], max_workers: int, buffer_size: int = 1000) -> Iterator[Tuple[int, Any]]:
+    """
+    Runs every producer on a bounded thread pool and yields their items as soon as they are available.
+
+    Items of a single producer are always yielded in the order that producer generated them, items of different producers may be interleaved
+    in any order. The first exception raised by any producer stops the remaining producers and is re-raised to the caller.
+    :param producers: callables returning the iterables to consume, each one is exhausted inside a worker thread
+    :param max_workers: maximum number of producers consumed at the same time
+    :param buffer_size: maximum number of items waiting to be consumed, workers block once the buffer is full
+    :return: iterator of (producer index, item) tuples
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=buffer_size)
+    stopped = threading.Event()
+
+    def put(item: Any):
+        _put(buffer, item, stopped)
+
+    def consume(index: int):
+        if stopped.is_set():
+            return
+        try:
+            for item in producers[index]():
+                if stopped.is_set():
+                    return
+                put((index, item))
+        except BaseException as e:
+            put(_Done(index, error=e))
+        else:
+            put(_Done(index))
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="airbyte_worker") as executor:
+        for index in range(len(producers)):
+            executor.submit(consume, index)
+        try:
+            remaining = len(producers)
+            while remaining:
+                item = buffer.get()
+                if isinstance(item, _Done):
+                    if item.error:
+                        raise item.error
+                    remaining -= 1
+                else:
+                    yield item
+        finally:
+            # unblock workers waiting on a full buffer and skip the producers which were not started yet
+            stopped.set()
+
+
+def ordered_results(submit: Callable[[Any], Future], items: Iterable[Any], window: int) -> Iterator[Any]:
+    """
+    Schedules items with submit while keeping at most window items in flight and yields the results in the order of the input items.
+
+    Items are pulled from the input iterable in the calling thread, only when there is room in the window, so generators with side effects
+    (e.g: stream_slices reading a parent stream) are consumed progressively. Exceptions raised while processing an item are re-raised when
+    the result of the failed item is reached.
+    :param submit: schedules the processing of an item and returns its future, e.g: ThreadPoolExecutor.submit
+    :param items: input items
+    :param window: maximum number of items processed at the same time
+    :return: iterator of results in the order of the input items
+    """
+    pending: Deque[Future] = deque()
+    try:
+        for item in items:
+            pending.append(submit(item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def ordered_map(func: Callable[[Any], Any], items: Iterable[Any], max_workers: int) -> Iterator[Any]:
+    """
+    Lazy, bounded alternative to ThreadPoolExecutor.map: applies func to items on a thread pool while keeping at most max_workers items
+    in flight and yields the results in the order of the input items. See ordered_results for details.
+    :param func: function applied to every item inside a worker thread
+    :param items: input items
+    :param max_workers: maximum number of items processed at the same time
+    :return: iterator of func results in the order of the input items
+    """
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="airbyte_worker") as executor:
+        yield from ordered_results(lambda item: executor.submit(func, item), items, window=max_workers)
+
+
+def ordered_prefetch(
+    func: Callable[[Any], Iterable[Any]], items: Iterable[Any], max_workers: int, buffer_size: int = 1000
+) -> Iterator[Iterator[Any]]:
+    """
+    Consumes the iterables returned by func for up to max_workers items at the same time on a thread pool, and yields them as iterators
+    in the order of the input items. Unlike ordered_map, an iterable isn't materialized: it is read ahead into a buffer of buffer_size
+    values, and the worker waits for the buffer to be consumed before reading further.
+
+    An item is only pulled from the input iterable, in the calling thread, once the iterator of the item max_workers positions before it
+    was yielded and the caller asked for the next one, i.e: once the caller is done with it. Exceptions raised while consuming an iterable
+    are re-raised by its iterator, after the values read before the failure.
+    :param func: returns the iterable of an item, it is called and consumed inside a worker thread
+    :param items: input items
+    :param max_workers: maximum number of iterables consumed at the same time
+    :param buffer_size: maximum number of values read ahead for every iterable
+    :return: iterator of iterators over the values of every item, in the order of the input items
+    """
+    stopped = threading.Event()
+
+    def consume(item: Any, buffer: queue.Queue):
+        try:
+            for value in func(item):
+                if not _put(buffer, value, stopped):
+                    return
+        except BaseException as e:
+            _put(buffer, _Done(0, error=e), stopped)
+        else:
+            _put(buffer, _Done(0), stopped)
+
+    def drain(buffer: queue.Queue) -> Iterator[Any]:
+        while True:
+            value = buffer.get()
+            if isinstance(value, _Done):
+                if value.error:
+                    raise value.error
+                return
+            yield value
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="airbyte_worker") as executor:
+        pending: Deque[queue.Queue] = deque()
+
+        def start(item: Any) -> queue.Queue:
+            buffer: queue.Queue = queue.Queue(maxsize=buffer_size)
+            executor.submit(consume, item, buffer)
+            return buffer
+
+        try:
+            for item in items:
+                pending.append(start(item))
+                if len(pending) >= max_workers:
+                    yield drain(pending.popleft())
+            while pending:
+                yield drain(pending.popleft())
+        finally:
+            # unblock workers waiting on a full buffer, their values won't be read
+            stopped.set()
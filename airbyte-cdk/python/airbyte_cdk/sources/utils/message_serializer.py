@@ -0,0 +1,86 @@
+#
+# Copyright (c) 2021 Airbyte, Inc., all rights reserved.
+#
+
+
+import json
+import os
+from datetime import datetime
+from typing import Any, Mapping, NamedTuple, Union
+
+from airbyte_cdk.models import AirbyteMessage, AirbyteRecordMessage, Type
+from pydantic.json import pydantic_encoder
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional dependency, install airbyte-cdk[orjson] to use it
+    orjson = None
+
+# Set to "orjson" to serialize RECORD messages with orjson. The output is equivalent JSON but not byte-identical to message.json():
+# it has no whitespace between tokens and non-ASCII characters are not escaped.
+SERIALIZER_ENV_VARIABLE = "AIRBYTE_RECORD_SERIALIZER"
+
+_RECORD_MESSAGE_FIELDS = {"type", "record"}
+
+
+class SerializedAirbyteMessage(NamedTuple):
+    """
+    A message which is already serialized, e.g: a record passed through from a Singer tap, and is output as is.
+    Sources only yield them when asked to, see SingerSource.passthrough_records.
+    """
+
+    type: Type
+    json: str
+
+
+def as_record_message(stream_name: str, data: Mapping[str, Any], emitted_at: int = None) -> AirbyteMessage:
+    """
+    Builds a RECORD message without running pydantic validation, all the inputs are already known to be valid.
+    :param stream_name: name of the record's stream
+    :param data: record data, used as is
+    :param emitted_at: epoch in milliseconds, defaults to now
+    """
+    if emitted_at is None:
+        emitted_at = int(datetime.now().timestamp()) * 1000
+    record = AirbyteRecordMessage.construct(stream=stream_name, data=data if isinstance(data, dict) else dict(data), emitted_at=emitted_at)
+    return AirbyteMessage.construct(type=Type.RECORD, record=record)
+
+
+def _dumps_json(obj: Any) -> str:
+    return json.dumps(obj, default=pydantic_encoder)
+
+
+def _dumps_orjson(obj: Any) -> str:
+    try:
+        return orjson.dumps(obj, default=pydantic_encoder, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    except orjson.JSONEncodeError:
+        # e.g: integers above 64 bits which are only supported by the standard library
+        return _dumps_json(obj)
+
+
+def use_orjson_from_env() -> bool:
+    """
+    :return: True if RECORD messages should be serialized with orjson according to the AIRBYTE_RECORD_SERIALIZER environment variable
+    """
+    if os.environ.get(SERIALIZER_ENV_VARIABLE) != "orjson":
+        return False
+    if orjson is None:
+        raise ImportError(f"{SERIALIZER_ENV_VARIABLE} is set to orjson but orjson is not installed")
+    return True
+
+
+def airbyte_message_to_json(message: Union[AirbyteMessage, SerializedAirbyteMessage], use_orjson: bool = False) -> str:
+    """
+    Serializes the message to the same string as message.json(exclude_unset=True).
+    RECORD messages are the bulk of the output, so their envelope is written directly from the record data instead of going through
+    pydantic's dict() and json() machinery. Other messages are rare and use pydantic.
+    :param use_orjson: serialize RECORD messages with orjson, see SERIALIZER_ENV_VARIABLE
+    """
+    if isinstance(message, SerializedAirbyteMessage):
+        return message.json
+    if message.type == Type.RECORD and message.record is not None and message.__fields_set__ == _RECORD_MESSAGE_FIELDS:
+        record = message.record
+        fields_set = record.__fields_set__
+        envelope = {"type": Type.RECORD.value, "record": {k: v for k, v in record.__dict__.items() if k in fields_set}}
+        return _dumps_orjson(envelope) if use_orjson else _dumps_json(envelope)
+    return message.json(exclude_unset=True)
@@ -7,6 +7,7 @@ import importlib
 import json
 import os
 import pkgutil
+import tempfile
 from typing import Any, ClassVar, Dict, Mapping, Tuple
 
 import jsonref
@@ -16,6 +17,9 @@ from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 from pydantic import BaseModel, Field
 
+# environment variable of the directory where connectors cache the schemas they discover, see get_schema_cache_dir
+SCHEMA_CACHE_DIR_ENV_VARIABLE = "AIRBYTE_SCHEMA_CACHE_DIR"
+
 
 class ResourceSchemaLoader:
     """JSONSchema loader from package resources"""
@@ -106,6 +110,16 @@ class ResourceSchemaLoader:
         return resolved
 
 
+def get_schema_cache_dir() -> str:
+    """
+    Directory where a connector can cache the schemas it discovers, so that they are only discovered again once they change.
+    Every discover and read runs in a new container, so the default temporary directory only keeps the cache for the current run:
+    set SCHEMA_CACHE_DIR_ENV_VARIABLE to a directory persisted between runs (e.g. a mounted volume) to reuse the cache across runs.
+    The environment variable is read on every call.
+    """
+    return os.environ.get(SCHEMA_CACHE_DIR_ENV_VARIABLE) or tempfile.gettempdir()
+
+
 def check_config_against_spec_or_exit(config: Mapping[str, Any], spec: ConnectorSpecification, logger: AirbyteLogger):
     """
     Check config object against spec. In case of spec is invalid, throws
@@ -4,10 +4,10 @@
 
 from distutils.util import strtobool
 from enum import Flag, auto
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from airbyte_cdk.logger import AirbyteLogger
-from jsonschema import Draft7Validator, validators
+from jsonschema import Draft7Validator, RefResolver, validators
 
 logger = AirbyteLogger()
 
@@ -29,6 +29,10 @@ class TransformConfig(Flag):
     # with DefaultSchemaNormalization. In this case default type casting would
     # be applied before custom one.
     CustomSchemaNormalization = auto()
+    # Skip validating records against the schema after normalization, by default
+    # validation errors are logged as warnings. Combine with other normalization
+    # options for maximum performance on high-volume streams.
+    SkipValidation = auto()
 
 
 class TypeTransformer:
@@ -47,12 +51,14 @@ class TypeTransformer:
             raise Exception("NoTransform option cannot be combined with other flags.")
         self._config = config
         all_validators = {
-            key: self.__get_normalizer(key, orig_validator)
+            key: orig_validator
             for key, orig_validator in Draft7Validator.VALIDATORS.items()
             # Do not validate field we do not transform for maximum performance.
             if key in ["type", "array", "$ref", "properties", "items"]
         }
-        self._normalizer = validators.create(meta_schema=Draft7Validator.META_SCHEMA, validators=all_validators)
+        self._validator = validators.create(meta_schema=Draft7Validator.META_SCHEMA, validators=all_validators)
+        # Normalization plans and validators compiled once per stream schema, see _get_compiled
+        self._compiled_schemas: Dict[int, _CompiledSchema] = {}
 
     def registerCustomTransform(self, normalization_callback: Callable[[Any, Dict[str, Any]], Any]) -> Callable:
         """
@@ -118,47 +124,101 @@ class TypeTransformer:
             return original_item
         return original_item
 
-    def __get_normalizer(self, schema_key: str, original_validator: Callable):
-        """
-        Traverse through object fields using native jsonschema validator and apply normalization function.
-        :param schema_key related json schema key that currently being validated/normalized.
-        :original_validator: native jsonschema validator callback.
-        """
-
-        def normalizator(validator_instance: Callable, val: Any, instance: Any, schema: Dict[str, Any]):
-            """
-            Jsonschema validator callable it uses for validating instance. We
-            override default Draft7Validator to perform value transformation
-            before validation take place. We do not take any action except
-            logging warn if object does not conform to json schema, just using
-            jsonschema algorithm to traverse through object fields.
-            Look
-            https://python-jsonschema.readthedocs.io/en/stable/creating/?highlight=validators.create#jsonschema.validators.create
-            validators parameter for detailed description.
-            :
-            """
-
-            def resolve(subschema):
-                if "$ref" in subschema:
-                    _, resolved = validator_instance.resolver.resolve(subschema["$ref"])
-                    return resolved
-                return subschema
-
-            if schema_key == "type" and instance is not None:
-                if "object" in val and isinstance(instance, dict):
-                    for k, subschema in schema.get("properties", {}).items():
-                        if k in instance:
-                            subschema = resolve(subschema)
-                            instance[k] = self.__normalize(instance[k], subschema)
-                elif "array" in val and isinstance(instance, list):
-                    subschema = schema.get("items", {})
-                    subschema = resolve(subschema)
-                    for index, item in enumerate(instance):
-                        instance[index] = self.__normalize(item, subschema)
-            # Running native jsonschema traverse algorithm after field normalization is done.
-            yield from original_validator(validator_instance, val, instance, schema)
-
-        return normalizator
+    def _compile(self, schema: Any, resolver: RefResolver, plans: Dict[int, "_NormalizationPlan"]) -> "_NormalizationPlan":
+        """
+        Compile a resolved (sub)schema into a normalization plan, following the same traversal as the jsonschema validator used to: the
+        "type" keyword normalizes the direct children of objects and arrays, "properties" and "items" descend into them. Other keywords
+        (anyOf, oneOf, etc.) are not traversed. "$ref"s and nested plans are resolved on first use, then cached, so unresolvable
+        references only fail for records actually using them.
+        :param schema: resolved (sub)schema to compile
+        :param resolver: resolver of the root schema, in the resolution scope of the subschema
+        :param plans: plans already compiled for this root schema by id of the subschema, supports recursive schemas
+        """
+        if id(schema) in plans:
+            return plans[id(schema)]
+        plan = plans[id(schema)] = _NormalizationPlan()
+        if not isinstance(schema, dict):
+            return plan
+
+        scope = resolver.resolution_scope
+        for key, value in schema.items():
+            if key == "type":
+                if "object" in value and schema.get("properties"):
+                    plan.object_fields = [
+                        (name, _Lazy(self._resolver(subschema, resolver, scope))) for name, subschema in schema["properties"].items()
+                    ]
+                if "array" in value:
+                    plan.array_items = _Lazy(self._resolver(schema.get("items", {}), resolver, scope))
+            elif key == "properties" and isinstance(value, dict):
+                plan.properties = [
+                    (name, _Lazy(self._plan_compiler(subschema, resolver, scope, plans))) for name, subschema in value.items()
+                ]
+            elif key == "items" and isinstance(value, dict):
+                plan.items = _Lazy(self._plan_compiler(value, resolver, scope, plans))
+        return plan
+
+    @staticmethod
+    def _resolver(subschema: Any, resolver: RefResolver, scope: str) -> Callable[[], Any]:
+        def resolve() -> Any:
+            if isinstance(subschema, dict) and "$ref" in subschema:
+                with resolver.in_scope(scope):
+                    _, resolved = resolver.resolve(subschema["$ref"])
+                return resolved
+            return subschema
+
+        return resolve
+
+    def _plan_compiler(
+        self, subschema: Any, resolver: RefResolver, scope: str, plans: Dict[int, "_NormalizationPlan"]
+    ) -> Callable[[], "_NormalizationPlan"]:
+        def compile_plan() -> "_NormalizationPlan":
+            with resolver.in_scope(scope):
+                if isinstance(subschema, dict) and "$ref" in subschema:
+                    # like in jsonschema validation, keywords next to a "$ref" are ignored
+                    url, resolved = resolver.resolve(subschema["$ref"])
+                    with resolver.in_scope(url):
+                        return self._compile(resolved, resolver, plans)
+                return self._compile(subschema, resolver, plans)
+
+        return compile_plan
+
+    def _get_compiled(self, schema: Dict[str, Any]) -> "_CompiledSchema":
+        """
+        Return the normalization plan and validator of a stream schema, compiling them on first use.
+        Streams keep returning the same schema object, so compiled schemas are cached by identity of the schema.
+        """
+        compiled = self._compiled_schemas.get(id(schema))
+        if compiled is None or compiled.schema is not schema:
+            resolver = RefResolver.from_schema(schema)
+            validator = None if TransformConfig.SkipValidation in self._config else self._validator(schema, resolver=resolver)
+            compiled = _CompiledSchema(
+                schema=schema, plan=self._plan_compiler(schema, resolver, resolver.resolution_scope, {})(), validator=validator
+            )
+            self._compiled_schemas[id(schema)] = compiled
+        return compiled
+
+    def _apply(self, plan: "_NormalizationPlan", instance: Any):
+        """
+        Apply a normalization plan to an instance, modifying it in place.
+        """
+        if isinstance(instance, dict):
+            if plan.object_fields:
+                for name, subschema in plan.object_fields:
+                    if name in instance:
+                        instance[name] = self.__normalize(instance[name], subschema.get())
+            if plan.properties:
+                for name, subplan in plan.properties:
+                    if name in instance:
+                        self._apply(subplan.get(), instance[name])
+        elif isinstance(instance, list):
+            if plan.array_items:
+                items_schema = plan.array_items.get()
+                for index, item in enumerate(instance):
+                    instance[index] = self.__normalize(item, items_schema)
+            if plan.items:
+                items_plan = plan.items.get()
+                for item in instance:
+                    self._apply(items_plan, item)
 
     def transform(self, record: Dict[str, Any], schema: Dict[str, Any]):
         """
@@ -168,10 +228,58 @@ class TypeTransformer:
         """
         if TransformConfig.NoTransform in self._config:
             return
-        normalizer = self._normalizer(schema)
-        for e in normalizer.iter_errors(record):
-            """
-            just calling normalizer.validate() would throw an exception on
-            first validation occurences and stop processing rest of schema.
-            """
-            logger.warn(e.message)
+        compiled = self._get_compiled(schema)
+        self._apply(compiled.plan, record)
+        if compiled.validator:
+            for e in compiled.validator.iter_errors(record):
+                """
+                just calling validator.validate() would throw an exception on
+                first validation occurences and stop processing rest of schema.
+                """
+                logger.warn(e.message)
+
+
+class _Lazy:
+    """
+    Value computed on first use, then cached.
+    """
+
+    __slots__ = ("_factory", "_value", "_computed")
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._value = None
+        self._computed = False
+
+    def get(self) -> Any:
+        if not self._computed:
+            self._value = self._factory()
+            self._computed = True
+        return self._value
+
+
+class _NormalizationPlan:
+    """
+    Flat normalization steps of a (sub)schema.
+    """
+
+    __slots__ = ("object_fields", "array_items", "properties", "items")
+
+    def __init__(self):
+        # (field name, field schema) pairs normalized when the instance is an object
+        self.object_fields: Optional[List[Tuple[str, _Lazy]]] = None
+        # schema of the items normalized when the instance is an array
+        self.array_items: Optional[_Lazy] = None
+        # (field name, field plan) pairs applied to the fields of an object
+        self.properties: Optional[List[Tuple[str, _Lazy]]] = None
+        # plan applied to the items of an array
+        self.items: Optional[_Lazy] = None
+
+
+class _CompiledSchema:
+    __slots__ = ("schema", "plan", "validator")
+
+    def __init__(self, schema: Dict[str, Any], plan: _NormalizationPlan, validator: Optional[Any]):
+        self.schema = schema
+        self.plan = plan
+        self.validator = validator
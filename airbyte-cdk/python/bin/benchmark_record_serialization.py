@@ -0,0 +1,70 @@
+#
+# Copyright (c) 2021 Airbyte, Inc., all rights reserved.
+#
+
+"""
+Compares the pydantic RECORD serialization path with the fast path used by the entrypoint.
+
+Checks that the fast path produces byte-identical output (and equivalent JSON with orjson, if installed), then prints the time spent
+building and serializing RECORD messages by each path.
+
+Usage: python bin/benchmark_record_serialization.py [number of records]
+"""
+
+import json
+import sys
+import timeit
+from datetime import datetime
+
+from airbyte_cdk.models import AirbyteMessage, AirbyteRecordMessage, Type
+from airbyte_cdk.sources.utils.message_serializer import airbyte_message_to_json, as_record_message, orjson
+
+
+def generate_records(count: int):
+    for i in range(count):
+        yield {
+            "id": i,
+            "email": f"user{i}@example.com",
+            "name": "Ōctavia Squidington ✓",
+            "score": i / 7,
+            "active": i % 2 == 0,
+            "deleted_at": None,
+            "created_at": datetime(2021, 1, 1, i % 24),
+            "tags": ["a", "b", str(i)],
+            "address": {"city": "San Francisco", "zip": "94107", "lines": ["1 Main St", None]},
+        }
+
+
+def pydantic_path(records):
+    return [
+        AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream="users", data=data, emitted_at=1000)).json(exclude_unset=True)
+        for data in records
+    ]
+
+
+def fast_path(records, use_orjson: bool = False):
+    return [airbyte_message_to_json(as_record_message("users", data, emitted_at=1000), use_orjson=use_orjson) for data in records]
+
+
+def main(count: int):
+    records = list(generate_records(count))
+
+    expected = pydantic_path(records)
+    assert fast_path(records) == expected, "fast path output differs from the pydantic output"
+    print(f"fast path output is byte-identical to the pydantic output for {count} records")
+    if orjson:
+        assert [json.loads(line) for line in fast_path(records, use_orjson=True)] == [json.loads(line) for line in expected]
+        print(f"orjson output is equivalent to the pydantic output for {count} records")
+
+    timings = {"pydantic": lambda: pydantic_path(records), "fast path": lambda: fast_path(records)}
+    if orjson:
+        timings["fast path with orjson"] = lambda: fast_path(records, use_orjson=True)
+    baseline = None
+    for name, func in timings.items():
+        elapsed = min(timeit.repeat(func, number=1, repeat=3))
+        baseline = baseline or elapsed
+        print(f"{name:>22}: {elapsed:.3f}s, {count / elapsed:,.0f} records/s, x{baseline / elapsed:.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -4,8 +4,15 @@
 
 
 import copy
+import json
+import sys
+from unittest.mock import MagicMock, call
 
+import pytest
+from airbyte_cdk.models import Type
 from airbyte_cdk.sources.singer import SingerHelper
+from airbyte_cdk.sources.singer.singer_helpers import passthrough_record
+from airbyte_cdk.sources.utils.message_serializer import SerializedAirbyteMessage
 
 basic_singer_catalog = {
     "streams": [
@@ -54,3 +61,66 @@ def test_singer_catalog_to_airbyte_catalog_pk_override():
 
     user_stream = airbyte_catalog.streams[0]
     assert user_stream.source_defined_primary_key == [["name"]]
+
+
+@pytest.mark.parametrize(
+    "singer_message",
+    [
+        {"type": "RECORD", "stream": "users", "record": {"id": 1, "name": "octavia"}},
+        {"type": "RECORD", "stream": "users", "record": {"id": 1}, "version": 1634567890},
+        {"type": "RECORD", "stream": "users", "record": {"id": 1}, "time_extracted": "2021-10-18T00:00:00.000000Z"},
+        {"type": "RECORD", "stream": "users", "record": {"id": 1}, "version": 1, "time_extracted": "2021-10-18T00:00:00.000000Z"},
+        {"type": "RECORD", "stream": 'us"ers', "record": {"version": 2, "nested": {"time_extracted": "2021", "record": "}"}}},
+        {"type": "RECORD", "stream": "users", "record": {"id": 1, "version": 2}, "version": 3},
+        {"type": "RECORD", "stream": "users", "record": {"unicode": "héllo ✓", "escape": 'quote " and \\ and \n'}},
+    ],
+)
+def test_passthrough_record(singer_message):
+    airbyte_message = passthrough_record(json.dumps(singer_message), emitted_at=1000)
+
+    assert json.loads(airbyte_message) == {
+        "type": "RECORD",
+        "record": {"stream": singer_message["stream"], "data": singer_message["record"], "emitted_at": 1000},
+    }
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        json.dumps({"type": "STATE", "value": {"users": 1}}),
+        json.dumps({"type": "SCHEMA", "stream": "users", "schema": {}}),
+        json.dumps({"stream": "users", "type": "RECORD", "record": {"id": 1}}),
+        json.dumps({"type": "RECORD", "stream": "users", "record": {"id": 1}, "unknown": 1}),
+        json.dumps({"type": "RECORD", "stream": "users", "record": [1]}),
+        "not a message",
+    ],
+)
+def test_passthrough_record_falls_back_to_parsing(line):
+    assert passthrough_record(line, emitted_at=1000) is None
+
+
+def test_read_passthrough(tmp_path):
+    messages = [
+        {"type": "SCHEMA", "stream": "users", "schema": {}, "key_properties": ["id"]},
+        *[{"type": "RECORD", "stream": "users", "record": {"id": i, "padding": "x" * 1000}} for i in range(100)],
+        {"type": "STATE", "value": {"users": 99}},
+    ]
+    output_path = tmp_path / "output.txt"
+    output_path.write_text("".join(json.dumps(message) + "\n" for message in messages) + "a log line")
+    tap = tmp_path / "tap.py"
+    tap.write_text(f"import sys; sys.stdout.write(open({str(output_path)!r}).read()); sys.stderr.write('an error\\n')")
+    logger = MagicMock()
+
+    output = list(SingerHelper.read(logger, f"{sys.executable} {tap}", passthrough=True))
+
+    assert [message.type for message in output] == [Type.RECORD] * 100 + [Type.STATE]
+    assert all(isinstance(message, SerializedAirbyteMessage) for message in output[:100])
+    assert [json.loads(message.json)["record"]["data"] for message in output[:100]] == [message["record"] for message in messages[1:101]]
+    assert output[-1].state.data == {"users": 99}
+    # stdout and stderr are read concurrently, so the order of their lines relative to each other isn't known
+    assert sorted(logger.log_by_prefix.call_args_list) == [call("a log line", "INFO"), call("an error", "ERROR")]
+
+
+def test_read_fails_with_tap():
+    with pytest.raises(Exception, match="failed with exit code 1"):
+        list(SingerHelper.read(MagicMock(), f'{sys.executable} -c "import sys; sys.exit(1)"'))
@@ -0,0 +1,224 @@
+#
+# Copyright (c) 2021 Airbyte, Inc., all rights reserved.
+#
+
+
+import asyncio
+import json
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Iterable, Mapping, Optional
+
+import pytest
+import requests
+from airbyte_cdk.logger import AirbyteLogger
+from airbyte_cdk.models import ConfiguredAirbyteCatalog, ConfiguredAirbyteStream, DestinationSyncMode, SyncMode, Type
+from airbyte_cdk.sources.abstract_source import AbstractSource
+from airbyte_cdk.sources.streams.http import AsyncHttpStream
+from airbyte_cdk.sources.streams.http.exceptions import DefaultBackoffException, UserDefinedBackoffException
+
+
+class StubAsyncHttpStream(AsyncHttpStream):
+    url_base = "https://test_base_url.com/"
+    primary_key = ""
+    retry_factor = 0
+
+    def __init__(self, pages: int = 1, **kwargs):
+        super().__init__(**kwargs)
+        self._pages = pages
+
+    def stream_slices(self, **kwargs):
+        return [{"slice": i} for i in range(50)]
+
+    def next_page_token(self, response: requests.Response) -> Optional[Mapping[str, Any]]:
+        page = response.json()["page"]
+        return {"page": page + 1} if page + 1 < self._pages else None
+
+    def path(self, stream_slice: Mapping[str, Any] = None, **kwargs) -> str:
+        return f"slices/{stream_slice['slice'] if stream_slice else 0}"
+
+    def request_params(self, next_page_token: Mapping[str, Any] = None, **kwargs) -> Mapping[str, Any]:
+        return next_page_token or {"page": 0}
+
+    def parse_response(self, response: requests.Response, stream_slice: Mapping[str, Any] = None, **kwargs) -> Iterable[Mapping]:
+        yield response.json()
+
+
+def _response(request: requests.PreparedRequest, status_code: int = 200, headers: Mapping[str, str] = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers = requests.structures.CaseInsensitiveDict(headers or {})
+    response.request = request
+    response.url = request.url
+    page = int(request.url.rsplit("page=", 1)[1])
+    response._content = json.dumps({"url": request.url.split("?")[0], "page": page}).encode()
+    return response
+
+
+@pytest.fixture
+def stream(mocker):
+    async def send(request, request_kwargs):
+        await asyncio.sleep(0.1)
+        return _response(request)
+
+    stream = StubAsyncHttpStream(pages=2)
+    mocker.patch.object(stream, "_send_async", side_effect=send)
+    yield stream
+    stream.close()
+
+
+def test_read_records_uses_stream_hooks(stream):
+    records = list(stream.read_records(SyncMode.full_refresh, stream_slice={"slice": 3}))
+
+    assert records == [{"url": "https://test_base_url.com/slices/3", "page": 0}, {"url": "https://test_base_url.com/slices/3", "page": 1}]
+
+
+def test_slices_are_read_concurrently_in_order(stream):
+    start = time.time()
+    records = [
+        record
+        for records in AbstractSource._read_slices(
+            stream, stream.stream_slices(), lambda stream_slice: dict(sync_mode=SyncMode.full_refresh, stream_slice=stream_slice)
+        )
+        for record in records
+    ]
+
+    # 50 slices of 2 pages each, reading them one by one would take 10 seconds
+    assert time.time() - start < 2
+    assert [record["url"] for record in records] == [f"https://test_base_url.com/slices/{i}" for i in range(50) for _ in range(2)]
+
+
+def test_retries_on_retryable_response(mocker):
+    responses = iter([429, 500, 200])
+
+    async def send(request, request_kwargs):
+        return _response(request, status_code=next(responses))
+
+    stream = StubAsyncHttpStream()
+    mocker.patch.object(stream, "_send_async", side_effect=send)
+
+    assert list(stream.read_records(SyncMode.full_refresh)) == [{"url": "https://test_base_url.com/slices/0", "page": 0}]
+    stream.close()
+
+
+def test_max_retries_reached(mocker):
+    async def send(request, request_kwargs):
+        return _response(request, status_code=502)
+
+    stream = StubAsyncHttpStream()
+    mocker.patch.object(stream, "_send_async", side_effect=send)
+    mocker.patch.object(StubAsyncHttpStream, "max_retries", new_callable=mocker.PropertyMock, return_value=2)
+
+    with pytest.raises(DefaultBackoffException):
+        list(stream.read_records(SyncMode.full_refresh))
+    assert stream._send_async.call_count == 3
+    stream.close()
+
+
+def test_user_defined_backoff(mocker):
+    async def send(request, request_kwargs):
+        return _response(request, status_code=429)
+
+    sleep = mocker.patch("airbyte_cdk.sources.streams.http.async_http.asyncio.sleep")
+    stream = StubAsyncHttpStream()
+    mocker.patch.object(stream, "_send_async", side_effect=send)
+    mocker.patch.object(StubAsyncHttpStream, "backoff_time", return_value=3)
+    mocker.patch.object(StubAsyncHttpStream, "max_retries", new_callable=mocker.PropertyMock, return_value=1)
+
+    with pytest.raises(UserDefinedBackoffException):
+        list(stream.read_records(SyncMode.full_refresh))
+    # the backoff time, plus a jittered extra second
+    sleep.assert_called_once()
+    assert 4 <= sleep.call_args.args[0] <= 5
+    assert stream.backoff_stats.retries == 1
+    stream.close()
+
+
+def test_non_retryable_error_is_raised(mocker):
+    async def send(request, request_kwargs):
+        return _response(request, status_code=403)
+
+    stream = StubAsyncHttpStream()
+    mocker.patch.object(stream, "_send_async", side_effect=send)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        list(stream.read_records(SyncMode.full_refresh))
+    assert stream._send_async.call_count == 1
+    stream.close()
+
+
+def test_hooks_run_off_the_event_loop(stream, mocker):
+    hook_threads = set()
+    parse_response = stream.parse_response
+
+    def blocking_parse_response(response, **kwargs):
+        hook_threads.add(threading.current_thread().name)
+        # a blocking hook, e.g: a token refresh, must not hold the requests of the other slices
+        time.sleep(0.1)
+        return parse_response(response, **kwargs)
+
+    mocker.patch.object(stream, "parse_response", side_effect=blocking_parse_response)
+    start = time.time()
+    records = [
+        record
+        for records in AbstractSource._read_slices(
+            stream, stream.stream_slices()[:10], lambda stream_slice: dict(sync_mode=SyncMode.full_refresh, stream_slice=stream_slice)
+        )
+        for record in records
+    ]
+
+    assert len(records) == 20
+    # 10 slices of 2 pages each, blocking the event loop in the hooks would take 4 seconds
+    assert time.time() - start < 2
+    assert hook_threads and all(name.startswith(f"{stream.name}_hooks") for name in hook_threads)
+
+
+def test_stream_is_closed_once_read(stream, mocker):
+    class Source(AbstractSource):
+        def check_connection(self, logger, config):
+            return True, None
+
+        def streams(self, config):
+            return [stream]
+
+    mocker.patch.object(StubAsyncHttpStream, "get_json_schema", return_value={})
+    close = mocker.spy(stream, "close")
+    catalog = ConfiguredAirbyteCatalog(
+        streams=[
+            ConfiguredAirbyteStream(
+                stream={"name": stream.name, "json_schema": {}},
+                sync_mode=SyncMode.full_refresh,
+                destination_sync_mode=DestinationSyncMode.overwrite,
+            )
+        ]
+    )
+
+    messages = list(Source().read(AirbyteLogger(), {}, catalog))
+
+    assert len([message for message in messages if message.type == Type.RECORD]) == 100
+    close.assert_called_once()
+    assert stream._loop is None and stream._client_session is None
+
+
+def test_close_stops_and_closes_the_loop(stream):
+    list(stream.read_records(SyncMode.full_refresh, stream_slice={"slice": 1}))
+    loop, loop_thread = stream._loop, stream._loop_thread
+
+    stream.close()
+
+    assert not loop_thread.is_alive()
+    assert loop.is_closed()
+    # the stream can still be read, with a new loop
+    assert len(list(stream.read_records(SyncMode.full_refresh, stream_slice={"slice": 1}))) == 2
+
+
+def test_sources_do_not_need_aiohttp():
+    # aiohttp is an optional dependency, hide it to make sure the rest of the CDK doesn't need it
+    code = (
+        "import sys; sys.modules['aiohttp'] = None; "
+        "from airbyte_cdk.sources import AbstractSource; from airbyte_cdk.sources.streams.http import HttpStream; "
+        "assert 'airbyte_cdk.sources.streams.http.async_http' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
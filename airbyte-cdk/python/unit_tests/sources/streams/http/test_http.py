@@ -3,6 +3,7 @@
 #
 
 
+import io
 import json
 from http import HTTPStatus
 from typing import Any, Iterable, Mapping, Optional
@@ -11,11 +12,12 @@ from unittest.mock import ANY
 import pytest
 import requests
 from airbyte_cdk.models import SyncMode
-from airbyte_cdk.sources.streams.http import HttpStream, HttpSubStream
+from airbyte_cdk.sources.streams.http import HttpStream, HttpSubStream, RecordCache
 from airbyte_cdk.sources.streams.http.auth import NoAuth
 from airbyte_cdk.sources.streams.http.auth import TokenAuthenticator as HttpTokenAuthenticator
 from airbyte_cdk.sources.streams.http.exceptions import DefaultBackoffException, RequestBodyException, UserDefinedBackoffException
 from airbyte_cdk.sources.streams.http.requests_native_auth import TokenAuthenticator
+from airbyte_cdk.sources.streams.http.response_parsers import iter_json_lines
 
 
 class StubBasicReadHttpStream(HttpStream):
@@ -393,6 +395,22 @@ def test_parent_attribute_exist():
     assert child_stream.parent == parent_stream
 
 
+class SharedParentCacheSubStream(CacheHttpSubStream):
+    parent_cache = RecordCache()
+
+
+def test_sibling_substreams_share_parent_records(requests_mock):
+    requests_mock.get("https://test_base_url.com", json={})
+    child_1 = SharedParentCacheSubStream(parent=StubBasicReadHttpStream())
+    child_2 = SharedParentCacheSubStream(parent=StubBasicReadHttpStream())
+
+    slices_1 = list(child_1.stream_slices(sync_mode=SyncMode.full_refresh))
+    slices_2 = list(child_2.stream_slices(sync_mode=SyncMode.full_refresh))
+
+    assert slices_1 == slices_2 == [{"parent": {"data": 1}}]
+    assert requests_mock.call_count == 1
+
+
 def test_cache_response(mocker):
     stream = CacheHttpStream()
     mocker.patch.object(stream, "url_base", "https://google.com/")
@@ -429,3 +447,45 @@ def test_using_cache(mocker):
         pass
 
     assert parent_stream.cassete.play_count != 0
+
+
+class StreamingHttpStream(StubBasicReadHttpStream):
+    stream_response = True
+
+    def parse_response(self, response: requests.Response, **kwargs) -> Iterable[Mapping]:
+        yield from iter_json_lines(response)
+
+
+def test_stream_response(mocker, requests_mock):
+    stream = StreamingHttpStream()
+    send_mock = mocker.patch.object(stream._session, "send", wraps=stream._session.send)
+    requests_mock.register_uri("GET", stream.url_base, content=b'{"id": 1}\n{"id": 2}\n')
+
+    records = list(stream.read_records(sync_mode=SyncMode.full_refresh))
+
+    assert records == [{"id": 1}, {"id": 2}]
+    send_mock.assert_called_once_with(ANY, stream=True)
+
+
+def test_stream_response_closed_when_not_fully_read(mocker):
+    stream = StreamingHttpStream()
+    response = requests.Response()
+    response.raw = io.BytesIO(b'{"id": 1}\n{"id": 2}\n')
+    response.status_code = 200
+    mocker.patch.object(stream, "_send_request", return_value=response)
+
+    records = stream.read_records(sync_mode=SyncMode.full_refresh)
+    assert next(records) == {"id": 1}
+    records.close()
+
+    assert response.raw.closed
+
+
+def test_stream_response_error_body_is_read(requests_mock):
+    stream = StreamingHttpStream()
+    requests_mock.register_uri("GET", stream.url_base, status_code=400, json={"error": "invalid parameter"})
+
+    with pytest.raises(requests.exceptions.HTTPError) as e:
+        list(stream.read_records(sync_mode=SyncMode.full_refresh))
+
+    assert e.value.response.json() == {"error": "invalid parameter"}
@@ -0,0 +1,131 @@
+#
+# Copyright (c) 2021 Airbyte, Inc., all rights reserved.
+#
+
+from typing import Any, Iterable, Mapping, Optional
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+from airbyte_cdk.sources.streams.http import HttpStream, RateLimiter
+from airbyte_cdk.sources.streams.http import rate_limiter as rate_limiter_module
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return 1_600_000_000 + self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def fake_time(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(rate_limiter_module, "time", fake)
+    return fake
+
+
+def make_response(headers: Mapping[str, str]) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.headers.update(headers)
+    return response
+
+
+def test_burst_then_refill(fake_time):
+    limiter = RateLimiter(limits=[(3, 1)])
+
+    waits = [limiter.reserve() for _ in range(5)]
+
+    assert waits == pytest.approx([0, 0, 0, 1 / 3, 2 / 3])
+
+
+def test_most_restrictive_limit_applies(fake_time):
+    limiter = RateLimiter(limits=[(3, 1), (4, 3600)])
+
+    for _ in range(5):
+        limiter.acquire()
+
+    # 3 requests at once, the 4th once the burst limit refilled, then the hourly limit is reached and refills every 900 seconds
+    assert fake_time.sleeps == pytest.approx([1 / 3, 900], rel=1e-3)
+
+
+def test_requests_are_spread_over_concurrent_callers(fake_time):
+    limiter = RateLimiter(limits=[(1, 10)])
+
+    limiter.acquire()
+    # reserved in a row without waiting for each other, e.g: by concurrent coroutines
+    assert [limiter.reserve() for _ in range(3)] == pytest.approx([10, 20, 30])
+
+
+def test_remaining_header_limits_burst(fake_time):
+    limiter = RateLimiter(limits=[(10, 10)])
+    limiter.update(make_response({"X-RateLimit-Remaining": "2"}))
+
+    assert [limiter.reserve() for _ in range(3)] == pytest.approx([0, 0, 1])
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "30"},
+        {"RateLimit-Remaining": "0", "RateLimit-Reset": "30"},
+        {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(1_600_000_000 + 1030)},
+    ],
+)
+def test_waits_for_reset_when_no_request_left(fake_time, headers):
+    limiter = RateLimiter(limits=[(100, 1)])
+    limiter.update(make_response(headers))
+
+    limiter.acquire()
+    limiter.acquire()
+
+    assert fake_time.sleeps == pytest.approx([30])
+
+
+def test_unknown_headers_are_ignored(fake_time):
+    limiter = RateLimiter(limits=[(2, 1)])
+    limiter.update(make_response({"X-RateLimit-Remaining": "not a number", "Content-Type": "application/json"}))
+
+    assert [limiter.reserve() for _ in range(2)] == [0, 0]
+
+
+def test_limits_are_required():
+    with pytest.raises(ValueError):
+        RateLimiter(limits=[])
+
+
+class StubRateLimitedStream(HttpStream):
+    url_base = "https://test_base_url.com"
+    primary_key = ""
+    rate_limiter = MagicMock(spec=RateLimiter)
+
+    def path(self, **kwargs) -> str:
+        return ""
+
+    def next_page_token(self, response: requests.Response) -> Optional[Mapping[str, Any]]:
+        return None
+
+    def parse_response(self, response: requests.Response, **kwargs) -> Iterable[Mapping]:
+        yield from response.json()
+
+
+def test_http_stream_uses_rate_limiter(requests_mock):
+    requests_mock.get("https://test_base_url.com", json=[{"id": 1}], headers={"X-RateLimit-Remaining": "5"})
+    stream = StubRateLimitedStream()
+
+    records = list(stream.read_records(sync_mode=None))
+
+    assert records == [{"id": 1}]
+    stream.rate_limiter.acquire.assert_called_once_with()
+    stream.rate_limiter.update.assert_called_once()
+    assert stream.rate_limiter.update.call_args.args[0].headers["X-RateLimit-Remaining"] == "5"
@@ -0,0 +1,123 @@
+#
+# Copyright (c) 2021 Airbyte, Inc., all rights reserved.
+#
+
+from email.utils import formatdate
+from typing import Mapping
+
+import pytest
+import requests
+from airbyte_cdk.sources.streams.http import rate_limiting
+from airbyte_cdk.sources.streams.http.exceptions import DefaultBackoffException
+from airbyte_cdk.sources.streams.http.rate_limiting import (
+    BackoffStats,
+    Cooldown,
+    decorrelated_jitter,
+    default_backoff_handler,
+    rate_limit_wait_time,
+    session_cooldown,
+)
+
+
+def make_response(status_code: int = 200, headers: Mapping[str, str] = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return response
+
+
+@pytest.mark.parametrize(
+    "headers, expected",
+    [
+        ({}, None),
+        ({"Retry-After": "12"}, 12),
+        ({"Retry-After": "1.5"}, 1.5),
+        ({"Retry-After": "-3"}, 0),
+        ({"Retry-After": "not a date"}, None),
+        ({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "30"}, 30),
+        ({"RateLimit-Remaining": "0", "RateLimit-Reset": "7"}, 7),
+        ({"X-RateLimit-Remaining": "5", "X-RateLimit-Reset": "30"}, None),
+        ({"X-RateLimit-Remaining": "0"}, None),
+        ({"Retry-After": "3", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "30"}, 3),
+    ],
+)
+def test_rate_limit_wait_time(headers, expected):
+    assert rate_limit_wait_time(make_response(429, headers)) == expected
+
+
+def test_rate_limit_wait_time_from_dates(mocker):
+    mocker.patch.object(rate_limiting.time, "time", return_value=1_600_000_000)
+
+    assert rate_limit_wait_time(make_response(429, {"Retry-After": formatdate(1_600_000_060, usegmt=True)})) == 60
+    assert rate_limit_wait_time(make_response(429, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1600000045"})) == 45
+
+
+def test_decorrelated_jitter():
+    previous = None
+    for _ in range(100):
+        wait = decorrelated_jitter(2, previous, cap=60)
+        assert 2 <= wait <= min(60, (previous or 2) * 3)
+        previous = wait
+
+
+def test_session_cooldown_is_shared_per_session():
+    session = requests.Session()
+
+    assert session_cooldown(session) is session_cooldown(session)
+    assert session_cooldown(session) is not session_cooldown(requests.Session())
+
+
+def waits(sleep):
+    # the backoff library also sleeps for 0 seconds before each retry, the actual wait happens in the handler
+    return [c.args[0] for c in sleep.call_args_list if c.args[0]]
+
+
+def failing_call(responses):
+    responses = iter(responses)
+
+    def call():
+        response = next(responses)
+        if response.status_code >= 400:
+            raise DefaultBackoffException(request=None, response=response)
+        return response
+
+    return call
+
+
+def test_default_backoff_handler_waits_for_retry_after(mocker):
+    sleep = mocker.patch.object(rate_limiting.time, "sleep")
+    cooldown, stats = Cooldown(), BackoffStats()
+    call = failing_call([make_response(429, {"Retry-After": "20"}), make_response(500), make_response(200)])
+
+    response = default_backoff_handler(max_tries=3, factor=1, cooldown=cooldown, stats=stats)(call)()
+
+    assert response.status_code == 200
+    first_wait, second_wait = waits(sleep)
+    assert first_wait == pytest.approx(20, abs=0.1)
+    assert 1 <= second_wait <= 3
+    assert stats.retries == 2
+    assert stats.wait_time == pytest.approx(first_wait + second_wait)
+    # the throttled response holds back the other streams of the session, the server error does not extend it
+    assert cooldown.remaining() == pytest.approx(20, abs=0.1)
+
+
+def test_default_backoff_handler_waits_for_shared_cooldown(mocker):
+    sleep = mocker.patch.object(rate_limiting.time, "sleep")
+    cooldown = Cooldown()
+    # another stream of the session was asked to wait longer
+    cooldown.extend(60)
+    call = failing_call([make_response(429, {"Retry-After": "5"}), make_response(200)])
+
+    default_backoff_handler(max_tries=2, factor=1, cooldown=cooldown)(call)()
+
+    assert waits(sleep) == [pytest.approx(60, abs=0.1)]
+
+
+def test_default_backoff_handler_jitter_is_capped(mocker):
+    sleep = mocker.patch.object(rate_limiting.time, "sleep")
+    call = failing_call([make_response(503)] * 5 + [make_response(200)])
+
+    default_backoff_handler(max_tries=6, factor=5, max_time_between_tries=8)(call)()
+
+    assert len(waits(sleep)) == 5
+    assert all(5 <= wait <= 8 for wait in waits(sleep))
@@ -0,0 +1,127 @@
+#
+# Copyright (c) 2021 Airbyte, Inc., all rights reserved.
+#
+
+import threading
+from datetime import datetime
+from typing import Any, Iterable, List, Mapping
+
+from airbyte_cdk.sources.streams.http import RecordCache
+
+
+class CountingReader:
+    def __init__(self, records: List[Mapping[str, Any]]):
+        self.records = records
+        self.reads = 0
+
+    def __call__(self) -> Iterable[Mapping[str, Any]]:
+        self.reads += 1
+        yield from self.records
+
+
+def test_records_are_read_once():
+    cache = RecordCache()
+    reader = CountingReader([{"id": 1, "nested": {"name": "a"}}, {"id": 2}])
+
+    first = list(cache.read_records("key", reader))
+    second = list(cache.read_records("key", reader))
+
+    assert first == second == reader.records
+    assert reader.reads == 1
+
+
+def test_cached_records_are_copies():
+    cache = RecordCache()
+    list(cache.read_records("key", CountingReader([{"id": 1}])))
+
+    record = next(iter(cache.read_records("key", CountingReader([]))))
+    record["id"] = 2
+
+    assert list(cache.read_records("key", CountingReader([]))) == [{"id": 1}]
+
+
+def test_records_which_are_not_json_are_not_cached():
+    cache = RecordCache()
+    reader = CountingReader([{"id": 1}, {"id": 2, "updated_at": datetime(2021, 1, 1)}, {"id": 3}])
+
+    first = list(cache.read_records("key", reader))
+    second = list(cache.read_records("key", reader))
+
+    # the records are still read as they are, just from the API every time
+    assert first == second == reader.records
+    assert reader.reads == 2
+
+
+def test_keys_are_cached_separately():
+    cache = RecordCache()
+    reader_1, reader_2 = CountingReader([{"id": 1}]), CountingReader([{"id": 2}])
+
+    assert list(cache.read_records(("parent", 1), reader_1)) == [{"id": 1}]
+    assert list(cache.read_records(("parent", 2), reader_2)) == [{"id": 2}]
+    assert list(cache.read_records(("parent", 1), reader_2)) == [{"id": 1}]
+
+
+def test_records_spill_to_disk(tmp_path):
+    cache = RecordCache(max_memory_size=30, spill_dir=str(tmp_path))
+    readers = {key: CountingReader([{"key": key, "value": "x" * 10}]) for key in range(5)}
+
+    for key, reader in readers.items():
+        assert list(cache.read_records(key, reader)) == reader.records
+    for key, reader in readers.items():
+        assert list(cache.read_records(key, reader)) == reader.records
+        assert reader.reads == 1
+    cache.clear()
+
+
+def test_records_beyond_limits_are_not_cached():
+    cache = RecordCache(max_memory_size=40, max_disk_size=0)
+    small, large = CountingReader([{"id": 1}]), CountingReader([{"id": i} for i in range(100)])
+
+    for _ in range(2):
+        assert list(cache.read_records("small", small)) == small.records
+        assert list(cache.read_records("large", large)) == large.records
+
+    assert small.reads == 1
+    assert large.reads == 2
+
+
+def test_incomplete_reads_are_not_cached():
+    cache = RecordCache()
+    reader = CountingReader([{"id": 1}, {"id": 2}])
+
+    records = cache.read_records("key", reader)
+    next(records)
+    records.close()
+
+    assert list(cache.read_records("key", reader)) == reader.records
+    assert reader.reads == 2
+
+
+def test_concurrent_reader_waits_for_ongoing_read():
+    cache = RecordCache()
+    reader = CountingReader([{"id": 1}, {"id": 2}])
+    results = []
+
+    ongoing = cache.read_records("key", reader)
+    first_record = next(ongoing)
+    sibling = threading.Thread(target=lambda: results.append(list(cache.read_records("key", reader))))
+    sibling.start()
+    sibling.join(timeout=0.2)
+    # the sibling waits for the ongoing read instead of reading the parent again
+    assert sibling.is_alive()
+
+    assert [first_record] + list(ongoing) == reader.records
+    sibling.join()
+    assert results == [reader.records]
+    assert reader.reads == 1
+
+
+def test_nested_read_of_the_same_key_does_not_wait():
+    cache = RecordCache()
+    reader = CountingReader([{"id": 1}])
+
+    ongoing = cache.read_records("key", reader)
+    next(ongoing)
+
+    assert list(cache.read_records("key", reader)) == reader.records
+    assert reader.reads == 2
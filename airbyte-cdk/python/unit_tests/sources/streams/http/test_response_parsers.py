@@ -0,0 +1,98 @@
+#
+# Copyright (c) 2021 Airbyte, Inc., all rights reserved.
+#
+
+import io
+import json
+
+import pytest
+import requests
+from airbyte_cdk.sources.streams.http.response_parsers import iter_csv_records, iter_json_array, iter_json_lines, iter_lines
+
+
+def make_response(body: bytes, encoding: str = None) -> requests.Response:
+    response = requests.Response()
+    response.raw = io.BytesIO(body)
+    response.status_code = 200
+    response.encoding = encoding
+    return response
+
+
+# small chunks make sure values split between chunks are handled, including multi-byte characters
+CHUNK_SIZES = [1, 2, 3, 7, 64 * 1024]
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_iter_lines(chunk_size):
+    body = b"first\nsecond\r\n\nwith \xe2\x80\xa8 separator \r inside\nlast without line ending"
+
+    lines = list(iter_lines(make_response(body), chunk_size=chunk_size))
+
+    assert lines == [b"first", b"second", b"", b"with \xe2\x80\xa8 separator \r inside", b"last without line ending"]
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_iter_json_lines(chunk_size):
+    records = [{"id": 1, "name": "café  "}, {"id": 2, "nested": {"list": [1, 2.5, None]}}, {"id": 3}]
+    body = ("\n".join(json.dumps(record, ensure_ascii=False) for record in records) + "\n\n").encode("utf-8")
+
+    assert list(iter_json_lines(make_response(body), chunk_size=chunk_size)) == records
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_iter_csv_records(chunk_size):
+    body = 'id,name,comment\r\n1,café,"multi\nline, quoted"\r\n2,b,\r\n'.encode("utf-8")
+
+    records = list(iter_csv_records(make_response(body), chunk_size=chunk_size))
+
+    assert records == [{"id": "1", "name": "café", "comment": "multi\nline, quoted"}, {"id": "2", "name": "b", "comment": ""}]
+
+
+def test_iter_csv_records_options():
+    body = "1;\xe9\n".encode("latin-1")
+
+    records = list(iter_csv_records(make_response(body), encoding="latin-1", delimiter=";", fieldnames=["id", "name"]))
+
+    assert records == [{"id": "1", "name": "\xe9"}]
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+@pytest.mark.parametrize(
+    "elements",
+    [
+        [],
+        [{"id": 1, "name": "café", "tags": ["a", "b"]}, {"id": 2, "value": 12345.678e3}],
+        [123456789, -1.5e-7, True, False, None, "string with ] and , inside", [], {}],
+        [[1, [2, [3]]], {"a": {"b": {"c": "]"}}}],
+    ],
+)
+def test_iter_json_array(chunk_size, elements):
+    for body in [json.dumps(elements), json.dumps(elements, indent=2), json.dumps(elements, separators=(",", ":"))]:
+        assert list(iter_json_array(make_response(body.encode("utf-8")), chunk_size=chunk_size)) == elements
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b"",
+        b'{"id": 1}',
+        b'[{"id": 1}, {"id": 2}',
+        b'[{"id": 1}, {"id": ',
+        b'[{"id": 1} {"id": 2}]',
+        b"[1, 2,]",
+    ],
+)
+def test_iter_json_array_invalid(body):
+    with pytest.raises(ValueError):
+        list(iter_json_array(make_response(body), chunk_size=3))
+
+
+def test_iter_json_array_is_lazy():
+    response = make_response(b'[{"id": 1}, {"id": 2}, ' + b"x" * 1000)
+
+    records = iter_json_array(response, chunk_size=4)
+
+    assert next(records) == {"id": 1}
+    assert next(records) == {"id": 2}
+    # only the beginning of the body was read
+    assert response.raw.tell() < 40
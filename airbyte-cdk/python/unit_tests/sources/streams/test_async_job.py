@@ -0,0 +1,142 @@
+#
+# Copyright (c) 2021 Airbyte, Inc., all rights reserved.
+#
+
+from typing import Any, Iterable, List, Mapping, Optional
+from unittest.mock import patch
+
+import pytest
+from airbyte_cdk.models import SyncMode
+from airbyte_cdk.sources.streams import AsyncJob, AsyncJobFailedException, AsyncJobStatus, AsyncJobStream
+
+
+class StubAsyncJobStream(AsyncJobStream):
+    """
+    Jobs over ranges of days: a job completes after `duration[start]` polls, ranges listed in `failing` fail
+    """
+
+    primary_key = None
+    min_poll_interval = 1
+    max_poll_interval = 8
+    max_running_jobs = 2
+    max_job_attempts = 2
+
+    def __init__(self, ranges, duration=None, failing=(), **kwargs):
+        super().__init__(**kwargs)
+        self.ranges = ranges
+        self.duration = duration or {}
+        self.failing = set(failing)
+        self.polls = {}
+        self.created = []
+        self.max_running = 0
+        self.running = set()
+
+    def job_slices(self, stream_state: Mapping[str, Any] = None) -> Iterable[Mapping[str, Any]]:
+        for start, end in self.ranges:
+            yield {"start": start, "end": end}
+
+    def create_job(self, job_slice: Mapping[str, Any]) -> Any:
+        handle = (job_slice["start"], job_slice["end"], len(self.created))
+        self.created.append((job_slice["start"], job_slice["end"]))
+        self.polls[handle] = 0
+        self.running.add(handle)
+        self.max_running = max(self.max_running, len(self.running))
+        return handle
+
+    def check_job_status(self, job: AsyncJob) -> AsyncJobStatus:
+        start, end, _ = job.handle
+        self.polls[job.handle] += 1
+        if self.polls[job.handle] < self.duration.get(start, 1):
+            return AsyncJobStatus.RUNNING
+        self.running.discard(job.handle)
+        return AsyncJobStatus.FAILED if (start, end) in self.failing else AsyncJobStatus.COMPLETED
+
+    def split_job_slice(self, job_slice: Mapping[str, Any]) -> Optional[List[Mapping[str, Any]]]:
+        start, end = job_slice["start"], job_slice["end"]
+        if end == start:
+            return None
+        middle = (start + end) // 2
+        return [{"start": start, "end": middle}, {"start": middle + 1, "end": end}]
+
+    def read_job_records(self, job: AsyncJob) -> Iterable[Mapping[str, Any]]:
+        for day in range(job.job_slice["start"], job.job_slice["end"] + 1):
+            yield {"day": day}
+
+
+def read(stream: AsyncJobStream) -> List[Mapping[str, Any]]:
+    records = []
+    for stream_slice in stream.stream_slices(sync_mode=SyncMode.full_refresh):
+        records.extend(stream.read_records(sync_mode=SyncMode.full_refresh, stream_slice=stream_slice))
+    return records
+
+
+@pytest.fixture
+def sleeps():
+    with patch("time.sleep") as sleep:
+        yield sleep
+
+
+def test_slices_are_read_in_order_while_jobs_run_concurrently(sleeps):
+    # the first job is the slowest one, later jobs complete first but their records come after it
+    stream = StubAsyncJobStream(ranges=[(1, 1), (2, 2), (3, 3), (4, 4)], duration={1: 3})
+
+    slices = list(stream.stream_slices(sync_mode=SyncMode.full_refresh))
+
+    assert [s["job_slice"] for s in slices] == [{"start": day, "end": day} for day in range(1, 5)]
+    assert all(job.status == AsyncJobStatus.COMPLETED for s in slices for job in s["jobs"])
+    assert read(StubAsyncJobStream(ranges=[(1, 1), (2, 2), (3, 3)], duration={1: 3})) == [{"day": 1}, {"day": 2}, {"day": 3}]
+    assert stream.max_running == stream.max_running_jobs
+
+
+def test_poll_interval_grows_until_a_job_completes(sleeps):
+    stream = StubAsyncJobStream(ranges=[(1, 1), (2, 2)], duration={1: 6, 2: 7})
+
+    read(stream)
+
+    assert [c.args[0] for c in sleeps.call_args_list] == [1, 2, 4, 8, 8, 8, 1]
+
+
+def test_check_jobs_status_polls_running_jobs_together(sleeps):
+    stream = StubAsyncJobStream(ranges=[(1, 1), (2, 2), (3, 3)], duration={1: 2, 2: 2, 3: 2})
+    batches = []
+    check_jobs_status = stream.check_jobs_status
+
+    def record_batch(jobs):
+        batches.append([job.job_slice["start"] for job in jobs])
+        return check_jobs_status(jobs)
+
+    stream.check_jobs_status = record_batch
+    read(stream)
+
+    assert batches == [[1, 2], [1, 2], [3], [3]]
+
+
+def test_failed_job_is_retried_then_split(sleeps):
+    stream = StubAsyncJobStream(ranges=[(1, 4), (5, 5)], failing=[(1, 4), (1, 2)])
+
+    records = read(stream)
+
+    assert records == [{"day": day} for day in range(1, 6)]
+    assert stream.created == [(1, 4), (5, 5), (1, 4), (1, 2), (3, 4), (1, 2), (1, 1), (2, 2)]
+
+
+def test_job_failing_without_split_raises(sleeps):
+    stream = StubAsyncJobStream(ranges=[(1, 1)], failing=[(1, 1)])
+
+    with pytest.raises(AsyncJobFailedException):
+        read(stream)
+    assert stream.created == [(1, 1), (1, 1)]
+
+
+def test_timed_out_job_is_cancelled_and_retried(sleeps):
+    stream = StubAsyncJobStream(ranges=[(1, 1)], duration={1: 3})
+    stream.job_timeout = 10
+    cancelled = []
+    stream.cancel_job = cancelled.append
+
+    with patch("time.monotonic", side_effect=[0, 20, 30, 30, 30, 30]):
+        records = read(stream)
+
+    assert records == [{"day": 1}]
+    assert [job.attempt for job in cancelled] == [1]
+    assert stream.created == [(1, 1), (1, 1)]
@@ -3,8 +3,10 @@
 #
 
 
+import random
+import time
 from collections import defaultdict
-from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, List, Mapping, MutableMapping, Optional, Tuple, Union
 
 import pytest
 from airbyte_cdk.logger import AirbyteLogger
@@ -24,6 +26,7 @@ from airbyte_cdk.models import (
 )
 from airbyte_cdk.sources import AbstractSource
 from airbyte_cdk.sources.streams import Stream
+from airbyte_cdk.sources.streams.http import HttpStream
 
 
 class MockSource(AbstractSource):
@@ -346,3 +349,152 @@ def test_valid_incremental_read_with_slices_and_interval(mocker, logger):
     messages = _fix_emitted_at(list(src.read(logger, {}, catalog, state=defaultdict(dict))))
 
     assert expected == messages
+
+
+def test_concurrent_full_refresh_read(mocker, logger):
+    """Tests that reading streams concurrently outputs every record of every stream, keeping the order of records within a stream"""
+    s1_output = [{"k": i} for i in range(100)]
+    s2_output = [{"k": -i} for i in range(100)]
+    s1 = MockStream([({"sync_mode": SyncMode.full_refresh}, s1_output)], name="s1")
+    s2 = MockStream([({"sync_mode": SyncMode.full_refresh}, s2_output)], name="s2")
+
+    mocker.patch.object(MockStream, "get_json_schema", return_value={})
+    mocker.patch.object(MockSource, "max_concurrent_streams", new_callable=mocker.PropertyMock, return_value=2)
+
+    src = MockSource(streams=[s1, s2])
+    catalog = ConfiguredAirbyteCatalog(
+        streams=[_configured_stream(s1, SyncMode.full_refresh), _configured_stream(s2, SyncMode.full_refresh)]
+    )
+
+    messages = _fix_emitted_at(list(src.read(logger, {}, catalog)))
+
+    assert len(messages) == 200
+    assert [m for m in messages if m.record.stream == "s1"] == _as_records("s1", s1_output)
+    assert [m for m in messages if m.record.stream == "s2"] == _as_records("s2", s2_output)
+
+
+def test_concurrent_incremental_read_keeps_state_after_records(mocker, logger):
+    """Tests that reading streams concurrently emits each stream's STATE messages after that stream's records and merges state of all streams"""
+    slices = [{"1": "1"}, {"2": "2"}]
+    stream_output = [{"k1": "v1"}, {"k2": "v2"}]
+    s1 = MockStream(
+        [({"sync_mode": SyncMode.incremental, "stream_slice": s, "stream_state": mocker.ANY}, stream_output) for s in slices], name="s1"
+    )
+    s2 = MockStream(
+        [({"sync_mode": SyncMode.incremental, "stream_slice": s, "stream_state": mocker.ANY}, stream_output) for s in slices], name="s2"
+    )
+    state = {"cursor": "value"}
+    mocker.patch.object(MockStream, "get_updated_state", return_value=state)
+    mocker.patch.object(MockStream, "supports_incremental", return_value=True)
+    mocker.patch.object(MockStream, "get_json_schema", return_value={})
+    mocker.patch.object(MockStream, "stream_slices", return_value=slices)
+    mocker.patch.object(MockSource, "max_concurrent_streams", new_callable=mocker.PropertyMock, return_value=2)
+
+    src = MockSource(streams=[s1, s2])
+    catalog = ConfiguredAirbyteCatalog(streams=[_configured_stream(s1, SyncMode.incremental), _configured_stream(s2, SyncMode.incremental)])
+
+    messages = _fix_emitted_at(list(src.read(logger, {}, catalog, state=defaultdict(dict))))
+
+    for stream in ["s1", "s2"]:
+        stream_messages = [m for m in messages if (m.record and m.record.stream == stream) or (m.state and stream in m.state.data)]
+        first_state = next(i for i, m in enumerate(stream_messages) if m.type == Type.STATE)
+        assert [m.type for m in stream_messages[:first_state]] == [Type.RECORD, Type.RECORD]
+    assert messages[-1] == _state({"s1": state, "s2": state})
+
+
+def test_concurrent_read_raises_stream_exception(mocker, logger):
+    """Tests that an exception raised by one of the concurrently read streams fails the sync"""
+    s1 = MockStream([({"sync_mode": SyncMode.full_refresh}, [{"k": "v"}])], name="s1")
+    s2 = MockStream(name="s2")
+
+    mocker.patch.object(MockStream, "get_json_schema", return_value={})
+    mocker.patch.object(MockSource, "max_concurrent_streams", new_callable=mocker.PropertyMock, return_value=2)
+
+    src = MockSource(streams=[s1, s2])
+    catalog = ConfiguredAirbyteCatalog(
+        streams=[_configured_stream(s1, SyncMode.full_refresh), _configured_stream(s2, SyncMode.full_refresh)]
+    )
+    with pytest.raises(Exception, match="No mocked output supplied"):
+        list(src.read(logger, {}, catalog))
+
+
+class MockSlicedHttpStream(HttpStream):
+    url_base = "https://test_base_url.com"
+    primary_key = "pk"
+    cursor_field = "cursor"
+    max_concurrent_slices = 4
+
+    def stream_slices(self, **kwargs):
+        return [{"slice": i} for i in range(10)]
+
+    def read_records(self, stream_slice: Mapping[str, Any] = None, **kwargs) -> Iterable[Mapping[str, Any]]:
+        # finish slices out of order
+        time.sleep(random.random() / 100)
+        return [{"slice": stream_slice["slice"], "cursor": stream_slice["slice"] * 10 + i} for i in range(3)]
+
+    def get_updated_state(self, current_stream_state: MutableMapping[str, Any], latest_record: Mapping[str, Any]):
+        return {"cursor": max(current_stream_state.get("cursor", 0), latest_record["cursor"])}
+
+    def next_page_token(self, response):
+        return None
+
+    def path(self, **kwargs) -> str:
+        return ""
+
+    def parse_response(self, response, **kwargs):
+        return []
+
+
+def test_concurrent_slices_keep_slice_order(mocker, logger):
+    """Tests that reading slices concurrently emits records and states slice by slice in the order of stream_slices"""
+    mocker.patch.object(MockSlicedHttpStream, "get_json_schema", return_value={})
+    stream = MockSlicedHttpStream()
+
+    src = MockSource(streams=[stream])
+    catalog = ConfiguredAirbyteCatalog(streams=[_configured_stream(stream, SyncMode.incremental)])
+
+    messages = list(src.read(logger, {}, catalog, state=defaultdict(dict)))
+
+    expected_types = ([Type.RECORD] * 3 + [Type.STATE]) * 10
+    assert [m.type for m in messages] == expected_types
+    assert [m.record.data["cursor"] for m in messages if m.type == Type.RECORD] == [s * 10 + i for s in range(10) for i in range(3)]
+    assert [m.state.data["mock_sliced_http_stream"]["cursor"] for m in messages if m.type == Type.STATE] == [s * 10 + 2 for s in range(10)]
+
+
+class MockInPlaceStateSlicedHttpStream(MockSlicedHttpStream):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.slice_states = {}
+
+    def read_records(self, stream_slice: Mapping[str, Any] = None, stream_state: Mapping[str, Any] = None, **kwargs):
+        self.slice_states[stream_slice["slice"]] = dict(stream_state)
+        records = super().read_records(stream_slice=stream_slice, **kwargs)
+        # state received by a slice doesn't change while the slice is read
+        assert stream_state == self.slice_states[stream_slice["slice"]]
+        return records
+
+    def get_updated_state(self, current_stream_state: MutableMapping[str, Any], latest_record: Mapping[str, Any]):
+        current_stream_state["cursor"] = max(current_stream_state.get("cursor", 0), latest_record["cursor"])
+        return current_stream_state
+
+
+def test_concurrent_slices_read_a_snapshot_of_the_state(mocker, logger):
+    """Tests that slices read concurrently each get the state they were submitted with, even when get_updated_state mutates it in place"""
+    mocker.patch.object(MockInPlaceStateSlicedHttpStream, "get_json_schema", return_value={})
+    stream = MockInPlaceStateSlicedHttpStream()
+
+    src = MockSource(streams=[stream])
+    catalog = ConfiguredAirbyteCatalog(streams=[_configured_stream(stream, SyncMode.incremental)])
+
+    # the state is mutated in place, read the checkpoints as they are emitted
+    states = [
+        m.state.data["mock_in_place_state_sliced_http_stream"]["cursor"]
+        for m in src.read(logger, {}, catalog, state=defaultdict(dict))
+        if m.type == Type.STATE
+    ]
+
+    assert states == [s * 10 + 2 for s in range(10)]
+    # the first slices are submitted together before any record is read, the next ones once the slice of the window before them is read
+    window = stream.max_concurrent_slices
+    assert [stream.slice_states[s] for s in range(window)] == [{}] * window
+    assert [stream.slice_states[s] for s in range(window, 10)] == [{"cursor": (s - window) * 10 + 2} for s in range(window, 10)]
@@ -0,0 +1,103 @@
+#
+# Copyright (c) 2021 Airbyte, Inc., all rights reserved.
+#
+
+import time
+
+import pytest
+from airbyte_cdk.sources.utils.concurrency import interleave, ordered_map, ordered_prefetch
+
+
+def test_interleave_keeps_order_within_producer():
+    producers = [lambda i=i: (f"{i}-{n}" for n in range(50)) for i in range(5)]
+
+    items = list(interleave(producers, max_workers=3, buffer_size=4))
+
+    assert len(items) == 250
+    for i in range(5):
+        assert [item for index, item in items if index == i] == [f"{i}-{n}" for n in range(50)]
+
+
+def test_interleave_runs_producers_concurrently():
+    def slow():
+        time.sleep(0.2)
+        yield 1
+
+    start = time.time()
+    list(interleave([slow] * 5, max_workers=5))
+
+    assert time.time() - start < 0.6
+
+
+def test_interleave_raises_producer_error():
+    def failing():
+        yield 1
+        raise ValueError("producer failed")
+
+    with pytest.raises(ValueError, match="producer failed"):
+        list(interleave([failing, lambda: iter(range(1000))], max_workers=2, buffer_size=1))
+
+
+def test_ordered_map_keeps_input_order():
+    def slow_square(n):
+        time.sleep((10 - n) / 100)
+        return n * n
+
+    assert list(ordered_map(slow_square, range(10), max_workers=4)) == [n * n for n in range(10)]
+
+
+def test_ordered_map_consumes_items_lazily():
+    consumed = []
+
+    def items():
+        for n in range(100):
+            consumed.append(n)
+            yield n
+
+    results = ordered_map(lambda n: n, items(), max_workers=3)
+    assert next(results) == 0
+    assert len(consumed) == 3
+    results.close()
+
+
+def test_ordered_prefetch_keeps_input_order():
+    def slow_range(n):
+        time.sleep((10 - n) / 100)
+        return (f"{n}-{i}" for i in range(n))
+
+    iterators = ordered_prefetch(slow_range, range(10), max_workers=4, buffer_size=2)
+
+    assert [list(iterator) for iterator in iterators] == [[f"{n}-{i}" for i in range(n)] for n in range(10)]
+
+
+def test_ordered_prefetch_reads_ahead_within_buffer_size():
+    read = []
+
+    def values(n):
+        for i in range(100):
+            read.append((n, i))
+            yield i
+
+    iterators = ordered_prefetch(values, range(3), max_workers=3, buffer_size=5)
+    first = next(iterators)
+    assert next(first) == 0
+    time.sleep(0.2)
+
+    # every iterable is read ahead up to its buffer, plus the value waiting to be put in it
+    for n in range(3):
+        assert len([value for item, value in read if item == n]) <= 7
+    iterators.close()
+
+
+def test_ordered_prefetch_raises_error_after_values():
+    def failing(n):
+        yield n
+        raise ValueError("iterable failed")
+
+    iterators = ordered_prefetch(failing, range(2), max_workers=2)
+    first = next(iterators)
+
+    assert next(first) == 0
+    with pytest.raises(ValueError, match="iterable failed"):
+        next(first)
+    iterators.close()
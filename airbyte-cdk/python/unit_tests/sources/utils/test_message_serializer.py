@@ -0,0 +1,63 @@
+#
+# Copyright (c) 2021 Airbyte, Inc., all rights reserved.
+#
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from airbyte_cdk.models import AirbyteMessage, AirbyteRecordMessage, AirbyteStateMessage, Type
+from airbyte_cdk.sources.utils.message_serializer import SerializedAirbyteMessage, airbyte_message_to_json, as_record_message
+
+RECORDS = [
+    {},
+    {"id": 1, "name": "octavia", "price": 10.5, "active": True, "deleted_at": None},
+    {"nested": {"list": [1, "2", {"3": [None]}], "empty": {}}, "unicode": "héllo ✓ 日本", "escape": 'quote " and \\ and \n'},
+    {"created_at": datetime(2021, 1, 1, 12, 30), "day": date(2021, 1, 1), "amount": Decimal("1.25"), "tags": ("a", "b")},
+    {"float": 1e100, "int": 2 ** 64, "negative": -0.0},
+]
+
+
+@pytest.mark.parametrize("data", RECORDS)
+def test_record_serialization_is_byte_identical(data):
+    expected = AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream="users", data=data, emitted_at=1000)).json(
+        exclude_unset=True
+    )
+
+    assert airbyte_message_to_json(as_record_message("users", data, emitted_at=1000)) == expected
+
+
+def test_validated_record_serialization_is_byte_identical():
+    message = AirbyteMessage(
+        type=Type.RECORD, record=AirbyteRecordMessage(stream="users", data=RECORDS[1], emitted_at=1000, namespace="ns")
+    )
+
+    assert airbyte_message_to_json(message) == message.json(exclude_unset=True)
+
+
+def test_fast_record_message_equals_validated_message():
+    message = AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream="users", data=RECORDS[1], emitted_at=1000))
+
+    assert as_record_message("users", RECORDS[1], emitted_at=1000) == message
+
+
+def test_non_record_messages_use_pydantic():
+    message = AirbyteMessage(type=Type.STATE, state=AirbyteStateMessage(data={"users": {"cursor": 1}}))
+
+    assert airbyte_message_to_json(message) == message.json(exclude_unset=True)
+
+
+@pytest.mark.parametrize("data", RECORDS)
+def test_orjson_record_serialization_is_equivalent(data):
+    pytest.importorskip("orjson")
+    message = as_record_message("users", data, emitted_at=1000)
+
+    assert json.loads(airbyte_message_to_json(message, use_orjson=True)) == json.loads(airbyte_message_to_json(message))
+
+
+def test_serialized_messages_are_written_as_is():
+    serialized = '{"type": "RECORD", "record": {"stream": "users", "data": {"id": 1}, "emitted_at": 1000}}'
+
+    assert airbyte_message_to_json(SerializedAirbyteMessage(type=Type.RECORD, json=serialized)) == serialized
+    assert airbyte_message_to_json(SerializedAirbyteMessage(type=Type.RECORD, json=serialized), use_orjson=True) == serialized
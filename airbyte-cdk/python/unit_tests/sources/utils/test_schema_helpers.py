@@ -7,6 +7,7 @@ import json
 import os
 import shutil
 import sys
+import tempfile
 import traceback
 from collections.abc import Mapping
 from pathlib import Path
@@ -14,7 +15,7 @@ from pathlib import Path
 import jsonref
 from airbyte_cdk.logger import AirbyteLogger
 from airbyte_cdk.models.airbyte_protocol import ConnectorSpecification
-from airbyte_cdk.sources.utils.schema_helpers import ResourceSchemaLoader, check_config_against_spec_or_exit
+from airbyte_cdk.sources.utils.schema_helpers import ResourceSchemaLoader, check_config_against_spec_or_exit, get_schema_cache_dir
 from pytest import fixture
 from pytest import raises as pytest_raises
 
@@ -155,3 +156,10 @@ class TestResourceSchemaLoader:
         # Make sure generated schema is JSON serializable
         assert json.dumps(actual_schema)
         assert jsonref.JsonRef.replace_refs(actual_schema)
+
+
+def test_get_schema_cache_dir(monkeypatch, tmp_path):
+    monkeypatch.delenv("AIRBYTE_SCHEMA_CACHE_DIR", raising=False)
+    assert get_schema_cache_dir() == tempfile.gettempdir()
+    monkeypatch.setenv("AIRBYTE_SCHEMA_CACHE_DIR", str(tmp_path))
+    assert get_schema_cache_dir() == str(tmp_path)
@@ -218,3 +218,46 @@ def test_custom_transform_with_default_normalization():
     obj = {"value": 12}
     s.transformer.transform(obj, SIMPLE_SCHEMA)
     assert obj == {"value": "transformed"}
+
+
+def test_schema_is_compiled_once(mocker):
+    t = TypeTransformer(TransformConfig.DefaultSchemaNormalization)
+    compile_spy = mocker.spy(t, "_compile")
+    t.transform({"value": 1, "nested": {"a": 0}}, COMPLEX_SCHEMA)
+    compile_calls = compile_spy.call_count
+
+    for i in range(10):
+        record = {"value": 1, "nested": {"a": i}}
+        t.transform(record, COMPLEX_SCHEMA)
+        assert record == {"value": True, "nested": {"a": str(i)}}
+
+    assert compile_spy.call_count == compile_calls
+
+
+def test_recursive_schema():
+    schema = {
+        "type": "object",
+        "properties": {"value": {"type": "integer"}, "child": {"$ref": "#/definitions/node"}},
+        "definitions": {
+            "node": {"type": ["null", "object"], "properties": {"value": {"type": "integer"}, "child": {"$ref": "#/definitions/node"}}}
+        },
+    }
+    record = {"value": "1", "child": {"value": "2", "child": {"value": "3", "child": None}}}
+
+    TypeTransformer(TransformConfig.DefaultSchemaNormalization).transform(record, schema)
+
+    assert record == {"value": 1, "child": {"value": 2, "child": {"value": 3, "child": None}}}
+
+
+@pytest.mark.parametrize(
+    "config, warnings",
+    [(TransformConfig.DefaultSchemaNormalization, 1), (TransformConfig.DefaultSchemaNormalization | TransformConfig.SkipValidation, 0)],
+)
+def test_skip_validation(mocker, config, warnings):
+    warn = mocker.patch("airbyte_cdk.sources.utils.transform.logger.warn")
+    record = {"number_prop": "not a number", "prop": 1}
+
+    TypeTransformer(config).transform(record, COMPLEX_SCHEMA)
+
+    assert record == {"number_prop": "not a number", "prop": "1"}
+    assert warn.call_count == warnings
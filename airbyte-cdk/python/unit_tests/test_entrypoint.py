@@ -10,11 +10,13 @@ from unittest.mock import MagicMock
 
 import pytest
 from airbyte_cdk import AirbyteEntrypoint
+from airbyte_cdk.entrypoint import launch
 from airbyte_cdk.models import (
     AirbyteCatalog,
     AirbyteConnectionStatus,
     AirbyteMessage,
     AirbyteRecordMessage,
+    AirbyteStateMessage,
     AirbyteStream,
     ConnectorSpecification,
     Status,
@@ -174,3 +176,16 @@ def test_run_read(entrypoint: AirbyteEntrypoint, mocker, spec_mock, config_mock)
 def test_invalid_command(entrypoint: AirbyteEntrypoint, mocker, config_mock):
     with pytest.raises(Exception):
         list(entrypoint.run(Namespace(command="invalid", config="conf")))
+
+
+def test_launch_writes_messages_to_stdout(mocker, spec_mock, config_mock, capsys):
+    messages = [
+        AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream="s", data={"k": i}, emitted_at=1)) for i in range(3)
+    ] + [AirbyteMessage(type=Type.STATE, state=AirbyteStateMessage(data={"s": {"k": 2}}))]
+    mocker.patch.object(MockSource, "read_state", return_value={})
+    mocker.patch.object(MockSource, "read_catalog", return_value={})
+    mocker.patch.object(MockSource, "read", return_value=iter(messages))
+
+    launch(MockSource(), ["read", "--config", "config_path", "--catalog", "catalog_path"])
+
+    assert capsys.readouterr().out == "".join(f"{m.json(exclude_unset=True)}\n" for m in messages)
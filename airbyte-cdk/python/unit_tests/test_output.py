@@ -0,0 +1,85 @@
+#
+# Copyright (c) 2021 Airbyte, Inc., all rights reserved.
+#
+
+import io
+import time
+
+from airbyte_cdk.logger import AirbyteLogger, init_logger
+from airbyte_cdk.output import BufferedOutput
+
+
+class CountingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, s: str) -> int:
+        self.writes += 1
+        return super().write(s)
+
+
+def test_messages_are_written_in_bulk():
+    stream = CountingStream()
+    with BufferedOutput(stream, buffer_size=100) as output:
+        for i in range(100):
+            output.write(f"message {i}")
+
+    assert stream.getvalue() == "".join(f"message {i}\n" for i in range(100))
+    assert 1 < stream.writes < 100
+
+
+def test_nothing_is_written_before_threshold():
+    stream = CountingStream()
+    with BufferedOutput(stream, flush_interval=60) as output:
+        output.write("record")
+        assert stream.getvalue() == ""
+    assert stream.getvalue() == "record\n"
+
+
+def test_flush_writes_buffer_right_away():
+    stream = CountingStream()
+    with BufferedOutput(stream, flush_interval=60) as output:
+        output.write("record")
+        output.write("state", flush=True)
+        assert stream.getvalue() == "record\nstate\n"
+        assert stream.writes == 1
+
+
+def test_old_messages_are_flushed_periodically():
+    stream = CountingStream()
+    with BufferedOutput(stream, flush_interval=0.1) as output:
+        output.write("record")
+        time.sleep(0.3)
+        assert stream.getvalue() == "record\n"
+
+
+def test_buffer_is_written_on_error():
+    stream = CountingStream()
+    try:
+        with BufferedOutput(stream, flush_interval=60) as output:
+            output.write("record")
+            raise ValueError()
+    except ValueError:
+        pass
+    assert stream.getvalue() == "record\n"
+
+
+def test_logs_are_written_in_order_with_messages(capsys):
+    stream = CountingStream()
+    native_logger = init_logger("buffered output")
+    with BufferedOutput(stream, flush_interval=60) as output:
+        output.write("record 1")
+        AirbyteLogger().info("log 1")
+        output.write("record 2")
+        native_logger.info("log 2")
+        assert stream.getvalue() == ""
+
+    lines = stream.getvalue().splitlines()
+    assert lines[0] == "record 1"
+    assert '"message": "log 1"' in lines[1]
+    assert lines[2] == "record 2"
+    assert '"message": "log 2"' in lines[3]
+    # outside of the buffered output, logs are printed right away
+    AirbyteLogger().info("log 3")
+    assert '"message": "log 3"' in capsys.readouterr().out
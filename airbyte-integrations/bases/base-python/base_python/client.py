@@ -31,6 +31,12 @@ class StreamStateMixin:
         """Tell if stream supports incremental sync"""
         return False
 
+    def get_stream_state_checkpoint(self, name: str) -> Any:
+        """Get state of stream with corresponding name if it advanced since the last call while the stream is read, None otherwise.
+        Override to output the state while the stream is read, so an interrupted sync resumes from the last checkpoint
+        """
+        return None
+
 
 class BaseClient(StreamStateMixin, ABC):
     """Base client for API"""
@@ -90,6 +90,12 @@ class BaseSource(Source):
             message = AirbyteRecordMessage(stream=stream_name, data=record, emitted_at=now)
             yield AirbyteMessage(type=MessageType.RECORD, record=message)
 
+            if use_incremental:
+                checkpoint = client.get_stream_state_checkpoint(stream_name)
+                if checkpoint:
+                    state[stream_name] = checkpoint
+                    yield AirbyteMessage(type=MessageType.STATE, state=AirbyteStateMessage(data=state))
+
         if use_incremental and client.get_stream_state(stream_name):
             state[stream_name] = client.get_stream_state(stream_name)
             # output state object only together with other stream states
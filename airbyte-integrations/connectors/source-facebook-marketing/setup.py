@@ -6,7 +6,7 @@
 from setuptools import find_packages, setup
 
 MAIN_REQUIREMENTS = [
-    "airbyte-cdk~=0.1.24",
+    "airbyte-cdk~=0.1.41",
     "cached_property~=1.5",
     "facebook_business~=12.0",
     "pendulum>=2,<3",
@@ -61,7 +61,10 @@ class MyFacebookAdsApi(FacebookAdsApi):
             max_pause_interval = self.pause_interval_minimum
 
             for record in response.json():
-                headers = {header["name"].lower(): header["value"] for header in record["headers"]}
+                if not record:
+                    # no response for this request, the batch has to be retried for it
+                    continue
+                headers = {header["name"].lower(): header["value"] for header in record.get("headers", [])}
                 usage, pause_interval = self.parse_call_rate_header(headers)
                 max_usage = max(max_usage, usage)
                 max_pause_interval = max(max_pause_interval, pause_interval)
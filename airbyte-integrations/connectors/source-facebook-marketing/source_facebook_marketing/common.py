@@ -4,7 +4,8 @@
 
 import logging
 import sys
-from typing import Any, Iterable, Sequence
+from itertools import islice
+from typing import Any, Iterable, Iterator, List
 
 import backoff
 import pendulum
@@ -27,11 +28,21 @@ class JobTimeoutException(Exception):
     """Scheduled job timed out"""
 
 
-def batch(iterable: Sequence, size: int = 1) -> Iterable:
-    """Split sequence in chunks"""
-    total_size = len(iterable)
-    for ndx in range(0, total_size, size):
-        yield iterable[ndx : min(ndx + size, total_size)]
+def batch(iterable: Iterable, size: int = 1) -> Iterator[List]:
+    """Split iterable in chunks, lazily"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def should_retry_api_error(exc: Exception) -> bool:
+    if isinstance(exc, FacebookRequestError):
+        call_rate_limit_error = exc.api_error_code() in FACEBOOK_RATE_LIMIT_ERROR_CODES
+        return exc.api_transient_error() or exc.api_error_subcode() == FACEBOOK_UNKNOWN_ERROR_CODE or call_rate_limit_error
+    return True
 
 
 def retry_pattern(backoff_type, exception, **wait_gen_kwargs):
@@ -40,12 +51,6 @@ def retry_pattern(backoff_type, exception, **wait_gen_kwargs):
         logger.info(str(exc))
         logger.info(f"Caught retryable error after {details['tries']} tries. Waiting {details['wait']} more seconds then retrying...")
 
-    def should_retry_api_error(exc):
-        if isinstance(exc, FacebookRequestError):
-            call_rate_limit_error = exc.api_error_code() in FACEBOOK_RATE_LIMIT_ERROR_CODES
-            return exc.api_transient_error() or exc.api_error_subcode() == FACEBOOK_UNKNOWN_ERROR_CODE or call_rate_limit_error
-        return True
-
     return backoff.on_exception(
         backoff_type,
         exception,
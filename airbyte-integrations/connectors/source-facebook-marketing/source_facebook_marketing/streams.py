@@ -2,18 +2,19 @@
 # Copyright (c) 2021 Airbyte, Inc., all rights reserved.
 #
 
-import time
 import urllib.parse as urlparse
 from abc import ABC
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
 from typing import Any, Iterable, Iterator, List, Mapping, MutableMapping, Optional, Sequence
 
 import airbyte_cdk.sources.utils.casing as casing
 import backoff
 import pendulum
 from airbyte_cdk.models import SyncMode
-from airbyte_cdk.sources.streams import Stream
+from airbyte_cdk.sources.streams import AsyncJob, AsyncJobStatus, AsyncJobStream, Stream
 from airbyte_cdk.sources.streams.core import package_name_from_class
 from airbyte_cdk.sources.utils.schema_helpers import ResourceSchemaLoader
 from airbyte_cdk.sources.utils.transform import TransformConfig, TypeTransformer
@@ -23,9 +24,11 @@ from facebook_business.api import FacebookAdsApiBatch, FacebookRequest, Facebook
 from facebook_business.exceptions import FacebookRequestError
 from source_facebook_marketing.api import API
 
-from .common import FacebookAPIException, JobTimeoutException, batch, deep_merge, retry_pattern
+from .common import FacebookAPIException, batch, deep_merge, retry_pattern, should_retry_api_error
 
 backoff_policy = retry_pattern(backoff.expo, FacebookRequestError, max_tries=5, factor=5)
+# requests of a batch without a response raise FacebookAPIException and are retried as well
+batch_backoff_policy = retry_pattern(backoff.expo, (FacebookRequestError, FacebookAPIException), max_tries=5, factor=5)
 
 
 def remove_params_from_url(url: str, params: List[str]) -> str:
@@ -50,6 +53,9 @@ class FBMarketingStream(Stream, ABC):
     transformer: TypeTransformer = TypeTransformer(TransformConfig.DefaultSchemaNormalization)
 
     page_size = 100
+    # maximum number of requests in a call to the batch API, see https://developers.facebook.com/docs/graph-api/batch-requests
+    batch_size = 50
+    max_concurrent_batches = 4
 
     enable_deleted = False
     entity_prefix = None
@@ -64,25 +70,51 @@ class FBMarketingStream(Stream, ABC):
         """List of fields that we want to query, for now just all properties from stream's schema"""
         return list(self.get_json_schema().get("properties", {}).keys())
 
-    @backoff_policy
-    def execute_in_batch(self, requests: Iterable[FacebookRequest]) -> Sequence[MutableMapping[str, Any]]:
-        """Execute list of requests in batches"""
-        records = []
-
-        def success(response: FacebookResponse):
-            records.append(response.json())
-
-        def failure(response: FacebookResponse):
-            raise response.error()
-
-        api_batch: FacebookAdsApiBatch = self._api.api.new_batch()
-        for request in requests:
-            api_batch.add_request(request, success=success, failure=failure)
-        retry_batch = api_batch.execute()
-        if retry_batch:
-            raise FacebookAPIException(f"Batch has failed {len(retry_batch)} requests")
-
-        return records
+    def execute_in_batch(self, requests: Sequence[FacebookRequest]) -> List[MutableMapping[str, Any]]:
+        """Execute list of requests in a single batch, only the failed requests are sent again when retrying
+        :return: response of each request, in the same order
+        """
+        responses = {}
+
+        def success(index: int, response: FacebookResponse):
+            responses[index] = response.json()
+
+        @batch_backoff_policy
+        def execute_pending():
+            errors = []
+            api_batch: FacebookAdsApiBatch = self._api.api.new_batch()
+            for index, request in enumerate(requests):
+                if index not in responses:
+                    api_batch.add_request(
+                        request, success=partial(success, index), failure=lambda response: errors.append(response.error())
+                    )
+            retry_batch = api_batch.execute()
+            # raise errors which can't be retried first, so the batch gives up
+            errors.sort(key=should_retry_api_error)
+            if errors:
+                raise errors[0]
+            if retry_batch:
+                raise FacebookAPIException(f"Batch has failed {len(retry_batch)} requests")
+
+        execute_pending()
+        return [responses[index] for index in range(len(requests))]
+
+    def execute_in_batches(self, requests: Iterable[FacebookRequest]) -> Iterator[MutableMapping[str, Any]]:
+        """Execute requests in batches of batch_size, up to max_concurrent_batches batches being sent at the same time
+        :return: iterator of the response of each request, in the same order
+        """
+        running_batches = deque()
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_batches) as executor:
+            try:
+                for requests_batch in batch(requests, size=self.batch_size):
+                    running_batches.append(executor.submit(self.execute_in_batch, requests_batch))
+                    if len(running_batches) >= self.max_concurrent_batches:
+                        yield from running_batches.popleft().result()
+                while running_batches:
+                    yield from running_batches.popleft().result()
+            finally:
+                for running_batch in running_batches:
+                    running_batch.cancel()
 
     def read_records(
         self,
@@ -91,9 +123,9 @@ class FBMarketingStream(Stream, ABC):
         stream_slice: Mapping[str, Any] = None,
         stream_state: Mapping[str, Any] = None,
     ) -> Iterable[Mapping[str, Any]]:
-        """Main read method used by CDK"""
-        for record in self._read_records(params=self.request_params(stream_state=stream_state)):
-            yield self._extend_record(record, fields=self.fields)
+        """Main read method used by CDK, records are listed then their fields read using the batch API"""
+        records = self._read_records(params=self.request_params(stream_state=stream_state))
+        yield from self.execute_in_batches(record.api_get(fields=self.fields, pending=True) for record in records)
 
     def _read_records(self, params: Mapping[str, Any]) -> Iterable:
         """Wrapper around query to backoff errors.
@@ -101,11 +133,6 @@ class FBMarketingStream(Stream, ABC):
         """
         return []
 
-    @backoff_policy
-    def _extend_record(self, obj: Any, **kwargs):
-        """Wrapper around api_get to backoff errors"""
-        return obj.api_get(**kwargs).export_all_data()
-
     def request_params(self, **kwargs) -> MutableMapping[str, Any]:
         """Parameters that should be passed to query_records method"""
         params = {"limit": self.page_size}
@@ -196,7 +223,6 @@ class AdCreatives(FBMarketingStream):
     """
 
     entity_prefix = "adcreative"
-    batch_size = 50
 
     def read_records(
         self,
@@ -205,12 +231,10 @@ class AdCreatives(FBMarketingStream):
         stream_slice: Mapping[str, Any] = None,
         stream_state: Mapping[str, Any] = None,
     ) -> Iterable[Mapping[str, Any]]:
-        """Read records using batch API"""
-        records = self._read_records(params=self.request_params(stream_state=stream_state))
-        requests = [record.api_get(fields=self.fields, pending=True) for record in records]
-        for requests_batch in batch(requests, size=self.batch_size):
-            for record in self.execute_in_batch(requests_batch):
-                yield self.clear_urls(record)
+        for record in super().read_records(
+            sync_mode=sync_mode, cursor_field=cursor_field, stream_slice=stream_slice, stream_state=stream_state
+        ):
+            yield self.clear_urls(record)
 
     @staticmethod
     def clear_urls(record: MutableMapping[str, Any]) -> MutableMapping[str, Any]:
@@ -258,7 +282,7 @@ class Campaigns(FBMarketingIncrementalStream):
         return self._api.account.get_campaigns(params=params)
 
 
-class AdsInsights(FBMarketingIncrementalStream):
+class AdsInsights(AsyncJobStream, FBMarketingIncrementalStream):
     """doc: https://developers.facebook.com/docs/marketing-api/insights"""
 
     cursor_field = "date_start"
@@ -292,6 +316,11 @@ class AdsInsights(FBMarketingIncrementalStream):
 
     breakdowns = []
 
+    max_running_jobs = MAX_ASYNC_JOBS
+    min_poll_interval = 2
+    max_poll_interval = MAX_ASYNC_SLEEP.in_seconds()
+    job_timeout = MAX_WAIT_TO_FINISH.in_seconds()
+
     def __init__(
         self,
         buffer_days,
@@ -319,73 +348,59 @@ class AdsInsights(FBMarketingIncrementalStream):
         name = self._new_class_name or self.__class__.__name__
         return casing.camel_to_snake(name)
 
-    def read_records(
-        self,
-        sync_mode: SyncMode,
-        cursor_field: List[str] = None,
-        stream_slice: Mapping[str, Any] = None,
-        stream_state: Mapping[str, Any] = None,
-    ) -> Iterable[Mapping[str, Any]]:
-        """Waits for current job to finish (slice) and yield its result"""
-        result = self.wait_for_job(stream_slice["job"])
-        # because we query `lookback_window` days before actual cursor we might get records older then cursor
-
-        for obj in result.get_result():
-            yield obj.export_all_data()
-
-    def stream_slices(self, stream_state: Mapping[str, Any] = None, **kwargs) -> Iterable[Optional[Mapping[str, Any]]]:
-        """Slice by date periods and schedule async job for each period, run at most MAX_ASYNC_JOBS jobs at the same time.
-        This solution for Async was chosen because:
-        1. we should commit state after each successful job
-        2. we should run as many job as possible before checking for result
-        3. we shouldn't proceed to consumption of the next job before previous succeed
+    def job_slices(self, stream_state: Mapping[str, Any] = None) -> Iterable[Mapping[str, Any]]:
+        """Slice by date periods, one async job per period. AsyncJobStream runs at most max_running_jobs jobs at the same time and
+        yields them in order, so the state is committed after each successful job and the next jobs keep running meanwhile.
         """
-        stream_state = stream_state or {}
-        running_jobs = deque()
-        date_ranges = list(self._date_ranges(stream_state=stream_state))
-        for params in date_ranges:
-            params = deep_merge(params, self.request_params(stream_state=stream_state))
-            job = self._create_insights_job(params)
-            running_jobs.append(job)
-            if len(running_jobs) >= self.MAX_ASYNC_JOBS:
-                yield {"job": running_jobs.popleft()}
-
-        while running_jobs:
-            yield {"job": running_jobs.popleft()}
+        return self._date_ranges(stream_state=stream_state or {})
+
+    def create_job(self, job_slice: Mapping[str, Any]) -> AdReportRun:
+        params = deep_merge(job_slice, self.request_params(stream_state={}))
+        return self._create_insights_job(params)
+
+    def check_jobs_status(self, jobs: List[AsyncJob]) -> List[AsyncJobStatus]:
+        """Polls all the running AdReportRuns with a single batch request"""
+        results = self.execute_in_batch([job.handle.api_get(pending=True) for job in jobs])
+        return [self._job_status(job, result) for job, result in zip(jobs, results)]
+
+    def check_job_status(self, job: AsyncJob) -> AsyncJobStatus:
+        return self.check_jobs_status([job])[0]
+
+    def _job_status(self, job: AsyncJob, result: Mapping[str, Any]) -> AsyncJobStatus:
+        job_progress_pct = result["async_percent_completion"]
+        job_id = result["report_run_id"]
+        runtime = pendulum.duration(seconds=job.elapsed_time())
+        self.logger.info(f"ReportRunId {job_id} is {job_progress_pct}% complete ({result['async_status']})")
+
+        if result["async_status"] == "Job Completed":
+            return AsyncJobStatus.COMPLETED
+        elif result["async_status"] in ("Job Failed", "Job Skipped"):
+            self.logger.info(f"AdReportRun {job_id} {result['async_status']} after {runtime.in_seconds()} seconds.")
+            return AsyncJobStatus.FAILED
+        elif runtime > self.MAX_WAIT_TO_START and job_progress_pct == 0:
+            self.logger.info(
+                f"AdReportRun {job_id} did not start after {runtime.in_seconds()} seconds."
+                f" This is an intermittent error which may be fixed by retrying the job."
+            )
+            return AsyncJobStatus.FAILED
+        return AsyncJobStatus.RUNNING
+
+    def split_job_slice(self, job_slice: Mapping[str, Any]) -> Optional[List[Mapping[str, Any]]]:
+        """Halves the date range of a job which keeps failing, e.g: because its report is too large"""
+        since, until = pendulum.parse(job_slice["time_range"]["since"]), pendulum.parse(job_slice["time_range"]["until"])
+        days = (until - since).in_days()
+        if days < 1:
+            return None
+        middle = since.add(days=days // 2)
+        return [
+            {**job_slice, "time_range": {"since": since.to_date_string(), "until": middle.to_date_string()}},
+            {**job_slice, "time_range": {"since": middle.add(days=1).to_date_string(), "until": until.to_date_string()}},
+        ]
 
-    @backoff_policy
-    def wait_for_job(self, job) -> AdReportRun:
-        factor = 2
-        start_time = pendulum.now()
-        sleep_seconds = factor
-        while True:
-            job = job.api_get()
-            job_progress_pct = job["async_percent_completion"]
-            job_id = job["report_run_id"]
-            self.logger.info(f"ReportRunId {job_id} is {job_progress_pct}% complete ({job['async_status']})")
-            runtime = pendulum.now() - start_time
-
-            if job["async_status"] == "Job Completed":
-                return job
-            elif job["async_status"] == "Job Failed":
-                raise JobTimeoutException(f"AdReportRun {job} failed after {runtime.in_seconds()} seconds.")
-            elif job["async_status"] == "Job Skipped":
-                raise JobTimeoutException(f"AdReportRun {job} skipped after {runtime.in_seconds()} seconds.")
-
-            if runtime > self.MAX_WAIT_TO_START and job_progress_pct == 0:
-                raise JobTimeoutException(
-                    f"AdReportRun {job} did not start after {runtime.in_seconds()} seconds."
-                    f" This is an intermittent error which may be fixed by retrying the job. Aborting."
-                )
-            elif runtime > self.MAX_WAIT_TO_FINISH:
-                raise JobTimeoutException(
-                    f"AdReportRun {job} did not finish after {runtime.in_seconds()} seconds."
-                    f" This is an intermittent error which may be fixed by retrying the job. Aborting."
-                )
-            self.logger.info(f"Sleeping {sleep_seconds} seconds while waiting for AdReportRun: {job_id} to complete")
-            time.sleep(sleep_seconds)
-            if sleep_seconds < self.MAX_ASYNC_SLEEP.in_seconds():
-                sleep_seconds *= factor
+    def read_job_records(self, job: AsyncJob) -> Iterable[Mapping[str, Any]]:
+        # because we query `lookback_window` days before actual cursor we might get records older then cursor
+        for obj in job.handle.get_result():
+            yield obj.export_all_data()
 
     def request_params(self, stream_state: Mapping[str, Any], **kwargs) -> MutableMapping[str, Any]:
         params = super().request_params(stream_state=stream_state, **kwargs)
@@ -4,11 +4,13 @@
 
 import json
 from datetime import datetime
+from urllib.parse import parse_qs
 
 import pendulum
 import pytest
 from airbyte_cdk.models import SyncMode
 from facebook_business import FacebookAdsApi, FacebookSession
+from facebook_business.adobjects.adcreative import AdCreative
 from facebook_business.exceptions import FacebookRequestError
 from source_facebook_marketing.api import API
 from source_facebook_marketing.streams import AdCreatives, Campaigns
@@ -82,19 +84,28 @@ class TestBackoff:
         campaign_responses = [
             fb_call_rate_response,
             {
-                "json": {"data": [{"id": 1, "updated_time": "2020-09-25T00:00:00Z"}, {"id": 2, "updated_time": "2020-09-25T00:00:00Z"}]},
+                "json": {
+                    "data": [{"id": "1", "updated_time": "2020-09-25T00:00:00Z"}, {"id": "2", "updated_time": "2020-09-25T00:00:00Z"}]
+                },
                 "status_code": 200,
             },
         ]
+        batch_responses = [
+            {
+                "json": [
+                    {"body": json.dumps({"id": "1", "name": "campaign 1"}), "code": 200, "headers": []},
+                    {"body": json.dumps({"id": "2", "name": "campaign 2"}), "code": 200, "headers": []},
+                ]
+            },
+        ]
 
         requests_mock.register_uri("GET", FacebookSession.GRAPH + f"/{FB_API_VERSION}/act_{account_id}/campaigns", campaign_responses)
-        requests_mock.register_uri("GET", FacebookSession.GRAPH + f"/{FB_API_VERSION}/1/", [{"status_code": 200}])
-        requests_mock.register_uri("GET", FacebookSession.GRAPH + f"/{FB_API_VERSION}/2/", [{"status_code": 200}])
+        requests_mock.register_uri("POST", FacebookSession.GRAPH + f"/{FB_API_VERSION}/", batch_responses)
 
         stream = Campaigns(api=api, start_date=pendulum.now(), end_date=pendulum.now(), include_deleted=False)
         try:
             records = list(stream.read_records(sync_mode=SyncMode.full_refresh, stream_state={}))
-            assert records
+            assert records == [{"id": "1", "name": "campaign 1"}, {"id": "2", "name": "campaign 2"}]
         except FacebookRequestError:
             pytest.fail("Call rate error has not being handled")
 
@@ -139,6 +150,39 @@ class TestBackoff:
 
         assert records == [{"name": "creative 1"}, {"name": "creative 2"}]
 
+    def test_batch_retries_failed_requests_only(self, requests_mock, api, fb_call_rate_response, mocker):
+        """Only the requests of a batch that failed or got no response are sent again, responses keep the order of the requests"""
+        mocker.patch("time.sleep")
+        rate_limited = {"body": json.dumps(fb_call_rate_response["json"]), "code": 400, "headers": []}
+        batch_responses = [
+            {"json": [{"body": json.dumps({"id": "1"}), "code": 200, "headers": []}, rate_limited, None]},
+            {"json": [{"body": json.dumps({"id": "2"}), "code": 200, "headers": []}, rate_limited]},
+            {"json": [{"body": json.dumps({"id": "3"}), "code": 200, "headers": []}]},
+        ]
+        requests_mock.register_uri("POST", FacebookSession.GRAPH + f"/{FB_API_VERSION}/", batch_responses)
+        stream = AdCreatives(api=api, include_deleted=False)
+        requests = [AdCreative(fbid=fbid).api_get(fields=["id"], pending=True) for fbid in ("1", "2", "3")]
+
+        assert stream.execute_in_batch(requests) == [{"id": "1"}, {"id": "2"}, {"id": "3"}]
+        sent = [json.loads(parse_qs(request.text)["batch"][0]) for request in requests_mock.request_history]
+        assert [[item["relative_url"].split("/")[0] for item in batch] for batch in sent] == [["1", "2", "3"], ["2", "3"], ["3"]]
+
+    def test_execute_in_batches(self, api, mocker):
+        stream = AdCreatives(api=api, include_deleted=False)
+        stream.batch_size = 2
+        batches = []
+
+        def execute_in_batch(requests):
+            batches.append(requests)
+            return [{"id": request} for request in requests]
+
+        mocker.patch.object(stream, "execute_in_batch", side_effect=execute_in_batch)
+
+        records = list(stream.execute_in_batches(iter(range(7))))
+
+        assert records == [{"id": i} for i in range(7)]
+        assert sorted(batches) == [[0, 1], [2, 3], [4, 5], [6]]
+
     def test_server_error(self, requests_mock, api, account_id):
         """Error once, check that we retry and not fail"""
         responses = [
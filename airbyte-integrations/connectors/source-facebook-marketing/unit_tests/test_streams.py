@@ -2,7 +2,12 @@
 # Copyright (c) 2021 Airbyte, Inc., all rights reserved.
 #
 
-from source_facebook_marketing.streams import remove_params_from_url
+from unittest.mock import MagicMock
+
+import pendulum
+from airbyte_cdk.models import SyncMode
+from airbyte_cdk.sources.streams import AsyncJobStatus
+from source_facebook_marketing.streams import AdsInsights, remove_params_from_url
 
 
 class TestUrlParsing:
@@ -45,3 +50,76 @@ class TestUrlParsing:
         url = "https://google.com?test=123&test2=456"
         parsed_url = remove_params_from_url(url=url, params=["test2"])
         assert parsed_url == "https://google.com?test=123"
+
+
+def make_insights_stream(api, days_per_job=10) -> AdsInsights:
+    return AdsInsights(
+        api=api,
+        start_date=pendulum.datetime(2021, 1, 1),
+        end_date=pendulum.datetime(2021, 1, 20),
+        buffer_days=28,
+        days_per_job=days_per_job,
+    )
+
+
+def report_run(report_run_id, statuses):
+    """fake AdReportRun going through the given (async_status, async_percent_completion), one per poll"""
+    job = MagicMock()
+    job.__getitem__.side_effect = {"report_run_id": report_run_id}.__getitem__
+    job.api_get.side_effect = [
+        {"report_run_id": report_run_id, "async_status": status, "async_percent_completion": percent} for status, percent in statuses
+    ]
+    job.get_result.return_value = [MagicMock(export_all_data=MagicMock(return_value={"report_run_id": report_run_id}))]
+    return job
+
+
+class TestAdsInsights:
+    def test_jobs_are_polled_in_batch_and_read_in_order(self, mocker):
+        mocker.patch("time.sleep")
+        api = MagicMock()
+        api.account.get_insights.side_effect = [
+            report_run(1, [("Job Running", 50), ("Job Running", 90), ("Job Completed", 100)]),
+            report_run(2, [("Job Completed", 100), ("Job Completed", 100), ("Job Completed", 100)]),
+        ]
+        stream = make_insights_stream(api)
+        batches = []
+        mocker.patch.object(stream, "execute_in_batch", side_effect=lambda requests: batches.append(requests) or list(requests))
+
+        records = []
+        for stream_slice in stream.stream_slices(sync_mode=SyncMode.incremental, stream_state={}):
+            records.extend(stream.read_records(sync_mode=SyncMode.incremental, stream_slice=stream_slice))
+
+        assert records == [{"report_run_id": 1}, {"report_run_id": 2}]
+        assert [len(requests) for requests in batches] == [2, 1, 1]
+        assert [c.kwargs["params"]["time_range"] for c in api.account.get_insights.call_args_list] == [
+            {"since": "2021-01-01", "until": "2021-01-10"},
+            {"since": "2021-01-11", "until": "2021-01-20"},
+        ]
+
+    def test_job_status(self):
+        stream = make_insights_stream(MagicMock())
+        job = MagicMock(elapsed_time=MagicMock(return_value=10))
+        stale_job = MagicMock(elapsed_time=MagicMock(return_value=stream.MAX_WAIT_TO_START.in_seconds() + 1))
+
+        def status(job, async_status, percent):
+            return stream._job_status(job, {"report_run_id": 1, "async_status": async_status, "async_percent_completion": percent})
+
+        assert status(job, "Job Running", 0) == AsyncJobStatus.RUNNING
+        assert status(job, "Job Completed", 100) == AsyncJobStatus.COMPLETED
+        assert status(job, "Job Failed", 10) == AsyncJobStatus.FAILED
+        assert status(job, "Job Skipped", 10) == AsyncJobStatus.FAILED
+        assert status(stale_job, "Job Not Started", 0) == AsyncJobStatus.FAILED
+        assert status(stale_job, "Job Running", 10) == AsyncJobStatus.RUNNING
+
+    def test_split_job_slice(self):
+        stream = make_insights_stream(MagicMock())
+
+        assert stream.split_job_slice({"time_range": {"since": "2021-01-01", "until": "2021-01-10"}}) == [
+            {"time_range": {"since": "2021-01-01", "until": "2021-01-05"}},
+            {"time_range": {"since": "2021-01-06", "until": "2021-01-10"}},
+        ]
+        assert stream.split_job_slice({"time_range": {"since": "2021-01-01", "until": "2021-01-02"}}) == [
+            {"time_range": {"since": "2021-01-01", "until": "2021-01-01"}},
+            {"time_range": {"since": "2021-01-02", "until": "2021-01-02"}},
+        ]
+        assert stream.split_job_slice({"time_range": {"since": "2021-01-01", "until": "2021-01-01"}}) is None
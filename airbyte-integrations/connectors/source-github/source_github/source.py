@@ -10,6 +10,7 @@ from airbyte_cdk import AirbyteLogger
 from airbyte_cdk.models import SyncMode
 from airbyte_cdk.sources import AbstractSource
 from airbyte_cdk.sources.streams import Stream
+from airbyte_cdk.sources.streams.http import RecordCache
 from airbyte_cdk.sources.streams.http.auth import MultipleTokenAuthenticator
 
 from .streams import (
@@ -133,6 +134,8 @@ class SourceGithub(AbstractSource):
         full_refresh_args = {"authenticator": authenticator, "repositories": repositories}
         incremental_args = {**full_refresh_args, "start_date": config["start_date"]}
         organization_args = {"authenticator": authenticator, "organizations": organizations}
+        # pull requests are read once for all the pull request sub-streams, and dropped along with the streams once the sync is over
+        pull_request_substream_args = {**full_refresh_args, "pull_requests_cache": RecordCache()}
         default_branches, branches_to_pull = self._get_branches_data(config.get("branch", ""), full_refresh_args)
 
         return [
@@ -153,12 +156,12 @@ class SourceGithub(AbstractSource):
             Organizations(**organization_args),
             Projects(**incremental_args),
             PullRequestCommentReactions(**incremental_args),
-            PullRequestStats(**full_refresh_args),
+            PullRequestStats(**pull_request_substream_args),
             PullRequests(**incremental_args),
             Releases(**incremental_args),
             Repositories(**organization_args),
             ReviewComments(**incremental_args),
-            Reviews(**full_refresh_args),
+            Reviews(**pull_request_substream_args),
             Stargazers(**incremental_args),
             Tags(**full_refresh_args),
             Teams(**organization_args),
@@ -6,13 +6,14 @@ import os
 import time
 from abc import ABC, abstractmethod
 from copy import deepcopy
+from functools import partial
 from typing import Any, Iterable, List, Mapping, MutableMapping, Optional, Union
 from urllib import parse
 
 import requests
 import vcr
 from airbyte_cdk.models import SyncMode
-from airbyte_cdk.sources.streams.http import HttpStream
+from airbyte_cdk.sources.streams.http import HttpStream, RecordCache
 from requests.exceptions import HTTPError
 from vcr.cassette import Cassette
 
@@ -286,13 +287,39 @@ class Assignees(GithubStream):
     """
 
 
-class PullRequestStats(GithubStream):
+class PullRequestSubstream(GithubStream, ABC):
     """
-    API docs: https://docs.github.com/en/rest/reference/pulls#get-a-pull-request
+    Base class of the streams reading an entity for every pull request of the repositories
     """
 
     top_level_stream = False
 
+    def __init__(self, pull_requests_cache: RecordCache = None, **kwargs):
+        """
+        :param pull_requests_cache: pull request numbers of every repository, share it between the sub-streams to read them once
+        """
+        super().__init__(**kwargs)
+        self.pull_requests_cache = pull_requests_cache or RecordCache()
+
+    def _read_pull_request_numbers(self, stream_slice: Mapping[str, Any]) -> Iterable[Mapping[str, Any]]:
+        pull_requests_stream = PullRequests(authenticator=self.authenticator, repositories=[stream_slice["repository"]], start_date="")
+        for pull_request in pull_requests_stream.read_records(sync_mode=SyncMode.full_refresh, stream_slice=stream_slice):
+            yield {"number": pull_request["number"]}
+
+    def stream_slices(self, **kwargs) -> Iterable[Optional[Mapping[str, Any]]]:
+        for stream_slice in super().stream_slices(**kwargs):
+            pull_requests = self.pull_requests_cache.read_records(
+                stream_slice["repository"], partial(self._read_pull_request_numbers, stream_slice)
+            )
+            for pull_request in pull_requests:
+                yield {"pull_request_number": pull_request["number"], "repository": stream_slice["repository"]}
+
+
+class PullRequestStats(PullRequestSubstream):
+    """
+    API docs: https://docs.github.com/en/rest/reference/pulls#get-a-pull-request
+    """
+
     @property
     def record_keys(self) -> List[str]:
         return list(self.get_json_schema()["properties"].keys())
@@ -302,12 +329,6 @@ class PullRequestStats(GithubStream):
     ) -> str:
         return f"repos/{stream_slice['repository']}/pulls/{stream_slice['pull_request_number']}"
 
-    def stream_slices(self, **kwargs) -> Iterable[Optional[Mapping[str, Any]]]:
-        for stream_slice in super().stream_slices(**kwargs):
-            pull_requests_stream = PullRequests(authenticator=self.authenticator, repositories=[stream_slice["repository"]], start_date="")
-            for pull_request in pull_requests_stream.read_records(sync_mode=SyncMode.full_refresh, stream_slice=stream_slice):
-                yield {"pull_request_number": pull_request["number"], "repository": stream_slice["repository"]}
-
     def parse_response(self, response: requests.Response, stream_slice: Mapping[str, Any], **kwargs) -> Iterable[Mapping]:
         yield self.transform(response.json(), repository=stream_slice["repository"])
 
@@ -316,24 +337,16 @@ class PullRequestStats(GithubStream):
         return {key: value for key, value in record.items() if key in self.record_keys}
 
 
-class Reviews(GithubStream):
+class Reviews(PullRequestSubstream):
     """
     API docs: https://docs.github.com/en/rest/reference/pulls#list-reviews-for-a-pull-request
     """
 
-    top_level_stream = False
-
     def path(
         self, stream_state: Mapping[str, Any] = None, stream_slice: Mapping[str, Any] = None, next_page_token: Mapping[str, Any] = None
     ) -> str:
         return f"repos/{stream_slice['repository']}/pulls/{stream_slice['pull_request_number']}/reviews"
 
-    def stream_slices(self, **kwargs) -> Iterable[Optional[Mapping[str, Any]]]:
-        for stream_slice in super().stream_slices(**kwargs):
-            pull_requests_stream = PullRequests(authenticator=self.authenticator, repositories=[stream_slice["repository"]], start_date="")
-            for pull_request in pull_requests_stream.read_records(sync_mode=SyncMode.full_refresh, stream_slice=stream_slice):
-                yield {"pull_request_number": pull_request["number"], "repository": stream_slice["repository"]}
-
 
 class Branches(GithubStream):
     """
@@ -2,8 +2,12 @@
 # Copyright (c) 2021 Airbyte, Inc., all rights reserved.
 #
 
+from unittest.mock import patch
+
+from airbyte_cdk.sources.streams.http import RecordCache
 from airbyte_cdk.sources.streams.http.auth import MultipleTokenAuthenticator
 from source_github import SourceGithub
+from source_github.streams import PullRequests, PullRequestStats, Reviews
 
 
 def test_single_token():
@@ -20,3 +24,23 @@ def test_multiple_tokens():
     authenticator = SourceGithub._get_authenticator({"access_token": "123, 456"})
     assert isinstance(authenticator, MultipleTokenAuthenticator)
     assert ["123", "456"] == authenticator._tokens
+
+
+def test_pull_request_substreams_share_pull_requests():
+    pull_requests = [{"number": 1, "title": "first"}, {"number": 2, "title": "second"}]
+    expected_slices = [
+        {"pull_request_number": 1, "repository": "airbytehq/test_shared_reads"},
+        {"pull_request_number": 2, "repository": "airbytehq/test_shared_reads"},
+    ]
+
+    pull_requests_cache = RecordCache()
+    with patch.object(PullRequests, "read_records", side_effect=lambda **kwargs: iter(pull_requests)) as read_records:
+        for stream_class in (PullRequestStats, Reviews):
+            stream = stream_class(repositories=["airbytehq/test_shared_reads"], pull_requests_cache=pull_requests_cache)
+            assert list(stream.stream_slices()) == expected_slices
+        read_records.assert_called_once()
+
+        # streams of another source don't share its cache
+        stream = Reviews(repositories=["airbytehq/test_shared_reads"])
+        assert list(stream.stream_slices()) == expected_slices
+        assert read_records.call_count == 2
@@ -13,9 +13,10 @@ from typing import Any, Dict, Iterable, List, Mapping, MutableMapping, Optional,
 import jwt
 import pendulum
 import requests
+from airbyte_cdk.models import SyncMode
 from airbyte_cdk.sources import AbstractSource
 from airbyte_cdk.sources.streams import Stream
-from airbyte_cdk.sources.streams.http import HttpStream
+from airbyte_cdk.sources.streams.http import HttpStream, RateLimiter
 from airbyte_cdk.sources.streams.http.auth import Oauth2Authenticator
 
 
@@ -74,10 +75,21 @@ class GoogleAnalyticsV4TypesList(HttpStream):
         return dimensions, metrics
 
 
+class SampledReportException(Exception):
+    """
+    Raised when the report of a date range spanning several days is sampled, the date range is then read again in smaller ones
+    """
+
+
 class GoogleAnalyticsV4Stream(HttpStream, ABC):
     primary_key = None
     http_method = "POST"
 
+    # The Analytics Reporting API allows 10 concurrent requests per view and 10 queries per second per IP address.
+    # https://developers.google.com/analytics/devguides/reporting/core/v4/limits-quotas
+    max_concurrent_slices = 4
+    rate_limiter = RateLimiter(limits=[(10, 1)])
+
     # The Analytics Core Reporting API returns a maximum of 100,000 rows per request.
     # https://developers.google.com/analytics/devguides/reporting/core/v4/rest/v4/reports/batchGet?hl=en
     page_size = 100000
@@ -131,6 +143,7 @@ class GoogleAnalyticsV4Stream(HttpStream, ABC):
                 {
                     "viewId": self.view_id,
                     "dateRanges": [stream_slice],
+                    "samplingLevel": "LARGE",
                     "pageSize": self.page_size,
                     "metrics": metrics,
                     "dimensions": dimensions,
@@ -211,6 +224,48 @@ class GoogleAnalyticsV4Stream(HttpStream, ABC):
 
         return date_slices
 
+    def split_date_range(self, date_range: Mapping[str, str]) -> Optional[List[Mapping[str, str]]]:
+        """
+        Splits a date range in two halves, the first one ending on its middle day.
+        :return: the two halves, or None if the date range is a single day
+        """
+        start_date = pendulum.parse(date_range["startDate"]).date()
+        end_date = pendulum.parse(date_range["endDate"]).date()
+        if start_date >= end_date:
+            return None
+        middle_date = start_date.add(days=(end_date - start_date).in_days() // 2)
+        return [
+            {"startDate": self.to_datetime_str(start_date), "endDate": self.to_datetime_str(middle_date)},
+            {"startDate": self.to_datetime_str(middle_date.add(days=1)), "endDate": self.to_datetime_str(end_date)},
+        ]
+
+    def read_records(
+        self,
+        sync_mode: SyncMode,
+        cursor_field: List[str] = None,
+        stream_slice: Mapping[str, Any] = None,
+        stream_state: Mapping[str, Any] = None,
+    ) -> Iterable[Mapping[str, Any]]:
+        """
+        Reads the records of a date range. When its report is sampled, the date range is split in two halves which are read one after
+        the other, and split again while their reports are sampled, down to a single day.
+        """
+        records = super().read_records(sync_mode=sync_mode, cursor_field=cursor_field, stream_slice=stream_slice, stream_state=stream_state)
+        read_any = False
+        try:
+            for record in records:
+                read_any = True
+                yield record
+        except SampledReportException:
+            # sampling is reported along with the first page of a report, before any of its record is yielded
+            if read_any:
+                raise
+            self.logger.info(f"Report from {stream_slice['startDate']} to {stream_slice['endDate']} is sampled, splitting it")
+            for date_range in self.split_date_range(stream_slice):
+                yield from self.read_records(
+                    sync_mode=sync_mode, cursor_field=cursor_field, stream_slice=date_range, stream_state=stream_state
+                )
+
     def get_data(self, data):
         for data_field in self.data_fields:
             if data and isinstance(data, dict):
@@ -333,8 +388,14 @@ class GoogleAnalyticsV4Stream(HttpStream, ABC):
         """
         json_response = response.json()
         reports = json_response.get(self.report_field, [])
+        stream_slice = kwargs.get("stream_slice")
 
         for report in reports:
+            if report.get("data", {}).get("samplesReadCounts"):
+                if stream_slice and self.split_date_range(stream_slice):
+                    raise SampledReportException()
+                self.logger.warning(f"Report for {stream_slice} is sampled and can't be split any further, its data may not be accurate")
+
             column_header = report.get("columnHeader", {})
             dimension_headers = column_header.get("dimensions", [])
             metric_headers = column_header.get("metricHeader", {}).get("metricHeaderEntries", [])
@@ -8,6 +8,7 @@ from unittest.mock import MagicMock, patch
 from urllib.parse import unquote
 
 import pytest
+from airbyte_cdk.models import SyncMode
 from airbyte_cdk.sources.streams.http.auth import NoAuth
 from source_google_analytics_v4.source import GoogleAnalyticsV4Stream, GoogleAnalyticsV4TypesList, SourceGoogleAnalyticsV4
 
@@ -97,3 +98,35 @@ def test_check_connection_oauth(jwt_encode_mock, mocker, mock_metrics_dimensions
     assert "client_secret_val" in unquote(mock_auth_call.last_request.body)
     assert "refresh_token_val" in unquote(mock_auth_call.last_request.body)
     assert mock_auth_call.called
+
+
+def test_sampled_report_is_split_until_not_sampled(requests_mock, mock_metrics_dimensions_type_list_link):
+    test_config = json.loads(read_file("../integration_tests/sample_config.json"))
+    test_config["authenticator"] = NoAuth()
+    test_config["metrics"] = ["ga:users"]
+    test_config["dimensions"] = ["ga:date"]
+
+    def batch_get(request, context):
+        report_request = request.json()["reportRequests"][0]
+        assert report_request["samplingLevel"] == "LARGE"
+        date_range = report_request["dateRanges"][0]
+        data = {"rows": [{"dimensions": [date_range["startDate"]], "metrics": [{"values": ["1"]}]}]}
+        # every report including the first day is sampled, once it's a single day it can't be split and is read as is
+        if date_range["startDate"] == "2021-01-01":
+            data["samplesReadCounts"] = ["1000"]
+        header = {"dimensions": ["ga:date"], "metricHeader": {"metricHeaderEntries": [{"name": "ga:users", "type": "INTEGER"}]}}
+        return {"reports": [{"columnHeader": header, "data": data}]}
+
+    batch_get_mock = requests_mock.post("https://analyticsreporting.googleapis.com/v4/reports:batchGet", json=batch_get)
+    stream = GoogleAnalyticsV4Stream(config=test_config)
+
+    records = list(stream.read_records(sync_mode=SyncMode.full_refresh, stream_slice={"startDate": "2021-01-01", "endDate": "2021-01-04"}))
+
+    assert [record["ga_date"] for record in records] == ["2021-01-01", "2021-01-02", "2021-01-03"]
+    assert [request.json()["reportRequests"][0]["dateRanges"][0] for request in batch_get_mock.request_history] == [
+        {"startDate": "2021-01-01", "endDate": "2021-01-04"},
+        {"startDate": "2021-01-01", "endDate": "2021-01-02"},
+        {"startDate": "2021-01-01", "endDate": "2021-01-01"},
+        {"startDate": "2021-01-02", "endDate": "2021-01-02"},
+        {"startDate": "2021-01-03", "endDate": "2021-01-04"},
+    ]
@@ -4,7 +4,10 @@
 
 
 import json
-from typing import Dict, Generator
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, Generator, Iterable, Iterator, List, Tuple
 
 from airbyte_protocol import AirbyteCatalog, AirbyteConnectionStatus, AirbyteMessage, ConfiguredAirbyteCatalog, Status, Type
 from apiclient import errors
@@ -14,9 +17,13 @@ from requests.status_codes import codes as status_codes
 from .client import GoogleSheetsClient
 from .helpers import Helpers
 from .models.spreadsheet import Spreadsheet
-from .models.spreadsheet_values import SpreadsheetValues
 
 ROW_BATCH_SIZE = 200
+# row ranges fetched by a single values.batchGet request, they can belong to different sheets
+RANGES_PER_REQUEST = 10
+# requests sent ahead of the one being read, they are sent one after the other by a single thread:
+# it stays within the Sheets API quota and the client isn't thread-safe
+MAX_PENDING_REQUESTS = 2
 
 
 class GoogleSheetsSource(Source):
@@ -124,35 +131,71 @@ class GoogleSheetsSource(Source):
         sheet_to_column_index_to_name = Helpers.get_available_sheets_to_column_index_to_name(client, spreadsheet_id, sheet_to_column_name)
         sheet_row_counts = Helpers.get_sheet_row_count(client, spreadsheet_id)
         logger.info(f"Row counts: {sheet_row_counts}")
-        for sheet in sheet_to_column_index_to_name.keys():
-            logger.info(f"Syncing sheet {sheet}")
+        current_sheet = None
+        for sheet, row in self._read_rows(logger, client, spreadsheet_id, sheet_to_column_index_to_name.keys(), sheet_row_counts):
+            if sheet != current_sheet:
+                logger.info(f"Syncing sheet {sheet}")
+                current_sheet = sheet
             column_index_to_name = sheet_to_column_index_to_name[sheet]
+            if not Helpers.is_row_empty(row) and Helpers.row_contains_relevant_data(row, column_index_to_name.keys()):
+                yield AirbyteMessage(type=Type.RECORD, record=Helpers.row_data_to_record_message(sheet, row, column_index_to_name))
+        logger.info(f"Finished syncing spreadsheet {spreadsheet_id}")
+
+    @staticmethod
+    def _row_ranges(sheets: Iterable[str], sheet_row_counts: Dict[str, int]) -> Iterator[Tuple[str, str]]:
+        for sheet in sheets:
             row_cursor = 2  # we start syncing past the header row
-            # For the loop, it is necessary that the initial row exists when we send a request to the API,
-            # if the last row of the interval goes outside the sheet - this is normal, we will return
-            # only the real data of the sheet and in the next iteration we will loop out.
+            # The first row of a range must exist in the sheet, the last one can go beyond it,
+            # only the real data of the sheet is returned.
             while row_cursor <= sheet_row_counts[sheet]:
-                range = f"{sheet}!{row_cursor}:{row_cursor + ROW_BATCH_SIZE}"
-                logger.info(f"Fetching range {range}")
-                row_batch = SpreadsheetValues.parse_obj(
-                    client.get_values(spreadsheetId=spreadsheet_id, ranges=range, majorDimension="ROWS")
-                )
-
+                yield sheet, f"{sheet}!{row_cursor}:{row_cursor + ROW_BATCH_SIZE}"
                 row_cursor += ROW_BATCH_SIZE + 1
-                # there should always be one range since we requested only one
-                value_ranges = row_batch.valueRanges[0]
 
-                if not value_ranges.values:
-                    break
-
-                row_values = value_ranges.values
-                if len(row_values) == 0:
-                    break
-
-                for row in row_values:
-                    if not Helpers.is_row_empty(row) and Helpers.row_contains_relevant_data(row, column_index_to_name.keys()):
-                        yield AirbyteMessage(type=Type.RECORD, record=Helpers.row_data_to_record_message(sheet, row, column_index_to_name))
-        logger.info(f"Finished syncing spreadsheet {spreadsheet_id}")
+    def _read_rows(
+        self,
+        logger: AirbyteLogger,
+        client: GoogleSheetsClient,
+        spreadsheet_id: str,
+        sheets: Iterable[str],
+        sheet_row_counts: Dict[str, int],
+    ) -> Iterator[Tuple[str, List[str]]]:
+        """
+        Fetches the row ranges of the sheets RANGES_PER_REQUEST at a time, the next requests are sent while the rows are read.
+        A sheet ends with its first blank range.
+        :return: iterator of the rows of each sheet, along with their sheet, in order
+        """
+        finished_sheets = set()
+        row_ranges = ((sheet, range) for sheet, range in self._row_ranges(sheets, sheet_row_counts) if sheet not in finished_sheets)
+
+        def get_value_ranges(ranges: List[str]) -> List[dict]:
+            logger.info(f"Fetching ranges {ranges}")
+            return client.get_values(spreadsheetId=spreadsheet_id, ranges=ranges, majorDimension="ROWS")["valueRanges"]
+
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            try:
+                while True:
+                    while len(pending) < MAX_PENDING_REQUESTS:
+                        batch = list(islice(row_ranges, RANGES_PER_REQUEST))
+                        if not batch:
+                            break
+                        pending.append((batch, executor.submit(get_value_ranges, [range for _, range in batch])))
+                    if not pending:
+                        return
+
+                    batch, future = pending.popleft()
+                    for (sheet, _), value_range in zip(batch, future.result()):
+                        if sheet in finished_sheets:
+                            continue
+                        rows = value_range.get("values")
+                        if not rows:
+                            finished_sheets.add(sheet)
+                            continue
+                        for row in rows:
+                            yield sheet, row
+            finally:
+                for _, future in pending:
+                    future.cancel()
 
     @staticmethod
     def get_credentials(config):
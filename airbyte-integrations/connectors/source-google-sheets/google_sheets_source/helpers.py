@@ -127,7 +127,8 @@ class Helpers(object):
             if cell_value.strip() != "":
                 data[column_index_to_name[relevant_index]] = cell_value
 
-        return AirbyteRecordMessage(stream=sheet_name, data=data, emitted_at=int(datetime.now().timestamp()) * 1000)
+        # the data is built from plain strings, no need to validate it again
+        return AirbyteRecordMessage.construct(stream=sheet_name, data=data, emitted_at=int(datetime.now().timestamp()) * 1000)
 
     @staticmethod
     def get_available_sheets_to_column_index_to_name(
@@ -0,0 +1,58 @@
+#
+# Copyright (c) 2021 Airbyte, Inc., all rights reserved.
+#
+
+
+from unittest.mock import Mock, patch
+
+from airbyte_protocol import AirbyteStream, ConfiguredAirbyteCatalog, ConfiguredAirbyteStream, SyncMode
+from airbyte_protocol.models.airbyte_protocol import DestinationSyncMode
+from base_python import AirbyteLogger
+from google_sheets_source import google_sheets_source
+from google_sheets_source.google_sheets_source import GoogleSheetsSource
+
+
+def configured_catalog(*sheets):
+    return ConfiguredAirbyteCatalog(
+        streams=[
+            ConfiguredAirbyteStream(
+                stream=AirbyteStream(name=sheet, json_schema={"properties": {"name": {"type": "string"}}}),
+                sync_mode=SyncMode.full_refresh,
+                destination_sync_mode=DestinationSyncMode.overwrite,
+            )
+            for sheet in sheets
+        ]
+    )
+
+
+def test_read_fetches_ranges_of_several_sheets_together():
+    # the rows of sheet1 end with its third range, which is blank. sheet2 has a single range of rows
+    rows = {"sheet1!2:3": [["a"], ["b"]], "sheet1!4:5": [["c"]], "sheet2!2:3": [["d"], [""], ["e"]]}
+    client = Mock()
+    client.get_values.side_effect = lambda ranges, **kwargs: {"valueRanges": [{"range": r, "values": rows.get(r, [])} for r in ranges]}
+
+    with patch.object(google_sheets_source, "ROW_BATCH_SIZE", 1), patch.object(google_sheets_source, "RANGES_PER_REQUEST", 3), patch.object(
+        google_sheets_source, "GoogleSheetsClient", return_value=client
+    ), patch.object(
+        google_sheets_source.Helpers,
+        "get_available_sheets_to_column_index_to_name",
+        return_value={"sheet1": {0: "name"}, "sheet2": {0: "name"}},
+    ), patch.object(
+        google_sheets_source.Helpers, "get_sheet_row_count", return_value={"sheet1": 19, "sheet2": 3}
+    ):
+        messages = list(GoogleSheetsSource().read(AirbyteLogger(), {"spreadsheet_id": "id"}, configured_catalog("sheet1", "sheet2"), {}))
+
+    assert [(message.record.stream, message.record.data) for message in messages] == [
+        ("sheet1", {"name": "a"}),
+        ("sheet1", {"name": "b"}),
+        ("sheet1", {"name": "c"}),
+        ("sheet2", {"name": "d"}),
+        ("sheet2", {"name": "e"}),
+    ]
+    requested_ranges = [call.kwargs["ranges"] for call in client.get_values.call_args_list]
+    # the second request is sent before the blank range of sheet1 is read, the next ranges of sheet1 aren't requested after that
+    assert requested_ranges == [
+        ["sheet1!2:3", "sheet1!4:5", "sheet1!6:7"],
+        ["sheet1!8:9", "sheet1!10:11", "sheet1!12:13"],
+        ["sheet2!2:3"],
+    ]
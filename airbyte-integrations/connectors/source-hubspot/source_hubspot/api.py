@@ -5,14 +5,19 @@
 
 import sys
 import time
+import urllib.parse
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache, partial
 from http import HTTPStatus
-from typing import Any, Callable, Iterable, Iterator, List, Mapping, MutableMapping, Optional, Union
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, MutableMapping, Optional, Tuple, Union
 
 import backoff
 import pendulum as pendulum
 import requests
+from airbyte_cdk.sources.streams.http import RateLimiter
 from airbyte_cdk.sources.streams.http.requests_native_auth import Oauth2Authenticator
 from base_python.entrypoint import logger
 from source_hubspot.errors import HubspotAccessDenied, HubspotInvalidAuth, HubspotRateLimited, HubspotTimeout
@@ -20,6 +25,9 @@ from source_hubspot.errors import HubspotAccessDenied, HubspotInvalidAuth, Hubsp
 # we got this when provided API Token has incorrect format
 CLOUDFLARE_ORIGIN_DNS_ERROR = 530
 
+# maximum length of the URL encoded `properties` query parameter, longer lists of properties are requested in several chunks
+PROPERTIES_PARAM_MAX_LENGTH = 15000
+
 VALID_JSON_SCHEMA_TYPES = {
     "string",
     "integer",
@@ -49,6 +57,21 @@ CUSTOM_FIELD_TYPE_TO_VALUE = {
 CUSTOM_FIELD_VALUE_TO_TYPE = {v: k for k, v in CUSTOM_FIELD_TYPE_TO_VALUE.items()}
 
 
+def split_properties(properties: Iterable[str], max_length: int = PROPERTIES_PARAM_MAX_LENGTH) -> Iterator[List[str]]:
+    """Split properties in chunks which URL encoded and comma separated fit in max_length characters"""
+    separator_length = len(urllib.parse.quote(","))
+    chunk, chunk_length = [], 0
+    for property_ in properties:
+        property_length = len(urllib.parse.quote(property_))
+        if chunk and chunk_length + separator_length + property_length > max_length:
+            yield chunk
+            chunk, chunk_length = [], 0
+        chunk_length += property_length + (separator_length if chunk else 0)
+        chunk.append(property_)
+    if chunk:
+        yield chunk
+
+
 def retry_connection_handler(**kwargs):
     """Retry helper, log each attempt"""
 
@@ -102,9 +125,13 @@ class API:
 
     BASE_URL = "https://api.hubapi.com"
     USER_AGENT = "Airbyte"
+    # https://developers.hubspot.com/docs/api/usage-details#rate-limits
+    RATE_LIMITS = [(100, 10)]
 
     def __init__(self, credentials: Mapping[str, Any]):
         self._session = requests.Session()
+        # shared by all the streams, which may send requests concurrently
+        self._rate_limiter = RateLimiter(limits=self.RATE_LIMITS, remaining_headers=["X-HubSpot-RateLimit-Remaining"], reset_headers=[])
         credentials_title = credentials.get("credentials_title")
 
         if credentials_title == "OAuth Credentials":
@@ -153,13 +180,17 @@ class API:
     @retry_connection_handler(max_tries=5, factor=5)
     @retry_after_handler(max_tries=3)
     def get(self, url: str, params: MutableMapping[str, Any] = None) -> Union[MutableMapping[str, Any], List[MutableMapping[str, Any]]]:
+        self._rate_limiter.acquire()
         response = self._session.get(self.BASE_URL + url, params=params)
+        self._rate_limiter.update(response)
         return self._parse_and_handle_errors(response)
 
     def post(
         self, url: str, data: Mapping[str, Any], params: MutableMapping[str, Any] = None
     ) -> Union[Mapping[str, Any], List[Mapping[str, Any]]]:
+        self._rate_limiter.acquire()
         response = self._session.post(self.BASE_URL + url, params=params, json=data)
+        self._rate_limiter.update(response)
         return self._parse_and_handle_errors(response)
 
 
@@ -178,6 +209,11 @@ class Stream(ABC):
     limit_field = "limit"
     limit = 100
 
+    # field identifying a record, when set properties too long for a single request are read in chunks and merged on it
+    primary_key: Optional[str] = None
+    # maximum number of chunks of properties read at the same time
+    max_concurrent_property_chunks = 4
+
     @property
     @abstractmethod
     def url(self):
@@ -349,11 +385,60 @@ class Stream(ABC):
                 else:
                     params[self.page_filter] = params.get(self.page_filter, 0) + self.limit
 
+    @staticmethod
+    def _merge_records(merged: Optional[MutableMapping[str, Any]], record: MutableMapping[str, Any]) -> MutableMapping[str, Any]:
+        """Merge the properties of a partial record read with another chunk of properties"""
+        if merged is None:
+            return record
+        for key, value in record.items():
+            if key == "properties":
+                merged.setdefault("properties", {}).update(value or {})
+            else:
+                merged.setdefault(key, value)
+        return merged
+
+    def _read_properties_in_chunks(self, getter: Callable, params: MutableMapping[str, Any], chunks: List[List[str]]) -> Iterator:
+        """Read every chunk of properties concurrently, page by page, and yield each record once all its chunks were read.
+        Pages of all the chunks list the same records in the same order, so only a few partial records are kept at a time.
+        """
+        # other fields are the same in every chunk, so associations are only requested with the first one
+        other_params = {key: value for key, value in params.items() if key != "associations"}
+        readers = [
+            self._read(getter, {**(params if index == 0 else other_params), "properties": ",".join(chunk)})
+            for index, chunk in enumerate(chunks)
+        ]
+        partial_records: Dict[Any, Tuple[int, MutableMapping[str, Any]]] = {}
+        with ThreadPoolExecutor(max_workers=min(len(readers), self.max_concurrent_property_chunks)) as executor:
+            while readers:
+                pages = list(executor.map(lambda reader: list(islice(reader, self.limit)), readers))
+                readers = [reader for reader, page in zip(readers, pages) if page]
+                for page in pages:
+                    for record in page:
+                        key = record[self.primary_key]
+                        read_chunks, merged = partial_records.pop(key, (0, None))
+                        merged = self._merge_records(merged, record)
+                        if read_chunks + 1 == len(chunks):
+                            yield merged
+                        else:
+                            partial_records[key] = (read_chunks + 1, merged)
+        # records created or deleted while reading are missing from some chunks
+        for _, merged in partial_records.values():
+            yield merged
+
+    def _read_properties(self, getter: Callable, params: MutableMapping[str, Any]) -> Iterator:
+        chunks = list(split_properties(self.properties.keys()))
+        if "properties" in params or not self.primary_key or len(chunks) < 2:
+            params = {"properties": ",".join(self.properties.keys()), **params}
+            yield from self._read(getter, params)
+        else:
+            logger.info(f"Reading {len(self.properties)} properties of stream {self.name} in {len(chunks)} chunks")
+            yield from self._read_properties_in_chunks(getter, params, chunks)
+
     def read(self, getter: Callable, params: Mapping[str, Any] = None) -> Iterator:
-        default_params = {self.limit_field: self.limit, "properties": ",".join(self.properties.keys())}
+        default_params = {self.limit_field: self.limit}
         params = {**default_params, **params} if params else {**default_params}
 
-        yield from self._filter_dynamic_fields(self._filter_old_records(self._transform(self._read(getter, params))))
+        yield from self._filter_dynamic_fields(self._filter_old_records(self._transform(self._read_properties(getter, params))))
 
     @staticmethod
     def _get_field_props(field_type: str) -> Mapping[str, List[str]]:
@@ -398,6 +483,8 @@ class IncrementalStream(Stream, ABC):
 
     state_pk = "timestamp"
     limit = 1000
+    # maximum number of chunks read at the same time, the records of a chunk are kept in memory until the chunks before it are read
+    max_concurrent_chunks = 4
 
     @property
     @abstractmethod
@@ -419,41 +506,69 @@ class IncrementalStream(Stream, ABC):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._state = None
+        self._state_advanced = False
+
+    def _advance_state(self, latest_cursor: pendulum.DateTime):
+        new_state = max(latest_cursor, self._state) if self._state else latest_cursor
+        if new_state != self._state:
+            logger.info(f"Advancing bookmark for {self.name} stream from {self._state} to {latest_cursor}")
+            self._state = new_state
+            self._state_advanced = True
+
+    def state_checkpoint(self) -> Optional[Mapping[str, Any]]:
+        """State if it advanced since the last call, i.e: once a chunk was read entirely, None otherwise"""
+        if not self._state_advanced:
+            return None
+        self._state_advanced = False
+        return self.state
 
     def read(self, getter: Callable, params: Mapping[str, Any] = None) -> Iterator:
-        """Apply state filter to set of records, update cursor(state) if necessary in the end"""
+        """Apply state filter to set of records, update cursor(state) after each chunk and in the end"""
         latest_cursor = None
         # to track state, there is no guarantee that returned records sorted in ascending order. Having exact
-        # boundary we could always ensure we don't miss records between states. In the future, if we would
-        # like to save the state more often we can do this every batch
-        for record in self.read_chunked(getter, params):
-            yield record
-            cursor = self._field_to_datetime(record[self.updated_at_field])
-            latest_cursor = max(cursor, latest_cursor) if latest_cursor else cursor
+        # boundary we could always ensure we don't miss records between states, so the state only advances
+        # once all the records of a chunk and of the chunks before it were read
+        for chunk_records in self.read_chunked(getter, params):
+            for record in chunk_records:
+                yield record
+                cursor = self._field_to_datetime(record[self.updated_at_field])
+                latest_cursor = max(cursor, latest_cursor) if latest_cursor else cursor
+            if latest_cursor:
+                self._advance_state(latest_cursor)
 
-        if latest_cursor:
-            new_state = max(latest_cursor, self._state) if self._state else latest_cursor
-            if new_state != self._state:
-                logger.info(f"Advancing bookmark for {self.name} stream from {self._state} to {latest_cursor}")
-                self._state = new_state
-                self._start_date = self._state
+        if self._state:
+            self._start_date = max(self._state, self._start_date)
+
+    def _read_chunk(self, getter: Callable, params: Mapping[str, Any]) -> List[Mapping[str, Any]]:
+        return list(super().read(getter, params))
 
     def read_chunked(
         self, getter: Callable, params: Mapping[str, Any] = None, chunk_size: pendulum.duration = pendulum.duration(days=1)
-    ) -> Iterator:
-        params = {**params} if params else {}
+    ) -> Iterator[List[Mapping[str, Any]]]:
+        """Read chunks of chunk_size concurrently, up to max_concurrent_chunks at a time, the API rate limit being shared.
+        :return: iterator of the records of every chunk, in chronological order of the chunks
+        """
         now_ts = int(pendulum.now().timestamp() * 1000)
         start_ts = int(self._start_date.timestamp() * 1000)
         chunk_size = int(chunk_size.total_seconds() * 1000)
 
-        for ts in range(start_ts, now_ts, chunk_size):
-            end_ts = ts + chunk_size
-            params["startTimestamp"] = ts
-            params["endTimestamp"] = end_ts
-            logger.info(
-                f"Reading chunk from stream {self.name} between {pendulum.from_timestamp(ts / 1000)} and {pendulum.from_timestamp(end_ts / 1000)}"
-            )
-            yield from super().read(getter, params)
+        chunks = deque()
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_chunks) as executor:
+            try:
+                for ts in range(start_ts, now_ts, chunk_size):
+                    end_ts = ts + chunk_size
+                    logger.info(
+                        f"Reading chunk from stream {self.name} between {pendulum.from_timestamp(ts / 1000)} and {pendulum.from_timestamp(end_ts / 1000)}"
+                    )
+                    chunk_params = {**(params or {}), "startTimestamp": ts, "endTimestamp": end_ts}
+                    chunks.append(executor.submit(self._read_chunk, getter, chunk_params))
+                    if len(chunks) >= self.max_concurrent_chunks:
+                        yield chunks.popleft().result()
+                while chunks:
+                    yield chunks.popleft().result()
+            finally:
+                for chunk in chunks:
+                    chunk.cancel()
 
 
 class CRMObjectStream(Stream):
@@ -469,6 +584,7 @@ class CRMObjectStream(Stream):
     associations: List[str] = []
     updated_at_field = "updatedAt"
     created_at_field = "createdAt"
+    primary_key = "id"
 
     @property
     def url(self):
@@ -83,6 +83,10 @@ class Client(BaseClient):
         """Set state of stream with corresponding name"""
         self._apis[name].state = state
 
+    def get_stream_state_checkpoint(self, name: str) -> Any:
+        """Get state of stream with corresponding name if it advanced since the last call while the stream is read"""
+        return self._apis[name].state_checkpoint()
+
     def health_check(self) -> Tuple[bool, Optional[str]]:
         alive = True
         error_msg = None
@@ -0,0 +1,81 @@
+#
+# Copyright (c) 2021 Airbyte, Inc., all rights reserved.
+#
+
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pendulum
+from airbyte_protocol import ConfiguredAirbyteStream, SyncMode
+from airbyte_protocol import Type as MessageType
+from airbyte_protocol.models.airbyte_protocol import DestinationSyncMode
+from source_hubspot.api import EmailEventStream
+from source_hubspot.source import SourceHubspot
+
+DAY_MS = 24 * 3600 * 1000
+
+
+def make_getter(running: list, lock: threading.Lock):
+    """fake API returning one event in the middle of each requested day, slow enough for requests to overlap"""
+
+    def getter(params):
+        with lock:
+            running.append(1)
+            concurrent = len(running)
+        time.sleep(0.05)
+        with lock:
+            running.pop()
+        return {"events": [{"id": params["startTimestamp"], "created": params["startTimestamp"] + DAY_MS // 2, "concurrent": concurrent}]}
+
+    return getter
+
+
+def test_read_chunked_reads_chunks_concurrently_in_order():
+    start_date = pendulum.now().subtract(days=10).start_of("day")
+    stream = EmailEventStream(api=MagicMock(), start_date=str(start_date))
+    running, lock = [], threading.Lock()
+
+    records = list(stream.read(make_getter(running, lock)))
+
+    assert len(records) in (10, 11)
+    assert [record["id"] for record in records] == sorted(record["id"] for record in records)
+    assert 1 < max(record["concurrent"] for record in records) <= stream.max_concurrent_chunks
+    assert stream.state == {"timestamp": str(pendulum.from_timestamp(records[-1]["created"] / 1000))}
+
+
+def test_state_advances_after_each_chunk():
+    start_date = pendulum.now().subtract(days=5).start_of("day")
+    stream = EmailEventStream(api=MagicMock(), start_date=str(start_date))
+
+    records_and_states = [(record, stream.state) for record in stream.read(make_getter([], threading.Lock()))]
+
+    # with the first record of a chunk, the state covers all the chunks before it
+    assert records_and_states[0][1] is None
+    for (previous_record, _), (_, state) in zip(records_and_states, records_and_states[1:]):
+        assert state == {"timestamp": str(pendulum.from_timestamp(previous_record["created"] / 1000))}
+
+
+def test_source_outputs_state_while_reading():
+    start_date = pendulum.now().subtract(days=3).start_of("day")
+    stream = EmailEventStream(api=MagicMock(), start_date=str(start_date))
+    client = MagicMock()
+    client.stream_has_state.return_value = True
+    client.get_stream_state.side_effect = lambda name: stream.state
+    client.get_stream_state_checkpoint.side_effect = lambda name: stream.state_checkpoint()
+    client.read_stream.side_effect = lambda _: stream.read(make_getter([], threading.Lock()))
+    configured_stream = ConfiguredAirbyteStream(
+        stream={"name": "email_events", "json_schema": {}}, sync_mode=SyncMode.incremental, destination_sync_mode=DestinationSyncMode.append
+    )
+
+    messages = list(SourceHubspot()._read_stream(logger=MagicMock(), client=client, configured_stream=configured_stream, state={}))
+
+    types = [message.type for message in messages]
+    assert types.count(MessageType.RECORD) in (3, 4)
+    # one state per record after the first one, plus the final state
+    assert types[:2] == [MessageType.RECORD, MessageType.RECORD]
+    assert types.count(MessageType.STATE) == types.count(MessageType.RECORD)
+    assert types[-1] == MessageType.STATE
+    # the state is only compared at chunk boundaries, not fetched again after each record
+    assert client.get_stream_state.call_count == 2
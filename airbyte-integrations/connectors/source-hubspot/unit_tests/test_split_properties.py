@@ -0,0 +1,70 @@
+#
+# Copyright (c) 2021 Airbyte, Inc., all rights reserved.
+#
+
+
+import urllib.parse
+
+import pytest
+from source_hubspot.api import API, PROPERTIES_PARAM_MAX_LENGTH, CRMObjectStream, split_properties
+
+
+@pytest.fixture(name="some_credentials")
+def some_credentials_fixture():
+    return {"credentials_title": "API Key Credentials", "api_key": "wrong_key"}
+
+
+def test_split_properties():
+    properties = [f"property_number_{i}" for i in range(2000)]
+
+    chunks = list(split_properties(properties))
+
+    assert len(chunks) > 1
+    assert [property_ for chunk in chunks for property_ in chunk] == properties
+    for chunk in chunks:
+        assert len(urllib.parse.quote(",".join(chunk))) <= PROPERTIES_PARAM_MAX_LENGTH
+
+
+def test_split_properties_short_list():
+    assert list(split_properties(["a", "b", "c"])) == [["a", "b", "c"]]
+    assert list(split_properties(["a", "b", "c"], max_length=len("a%2Cb"))) == [["a", "b"], ["c"]]
+    assert list(split_properties([])) == []
+
+
+def test_properties_are_read_in_chunks_and_merged(requests_mock, some_credentials):
+    properties = [f"property_number_{i}" for i in range(2000)]
+    chunks = list(split_properties(properties))
+    requests_mock.register_uri(
+        "GET", "/properties/v2/contact/properties", json=[{"name": property_, "type": "string"} for property_ in properties]
+    )
+
+    def objects_page(request, context):
+        requested = request.qs["properties"][0].split(",")
+        assert len(requested) < len(properties)
+        after = int(request.qs.get("after", [0])[0])
+        records = [
+            {"id": str(i), "updatedAt": "2021-02-02T00:00:00Z", "properties": {property_: f"{i}-{property_}" for property_ in requested}}
+            for i in range(after, min(after + 2, 5))
+        ]
+        if "associations" in request.qs:
+            for record in records:
+                record["associations"] = {"companies": {"results": [{"id": "1", "type": "contact_to_company"}]}}
+        response = {"results": records}
+        if after + 2 < 5:
+            response["paging"] = {"next": {"after": str(after + 2)}}
+        return response
+
+    requests_mock.register_uri("GET", "/crm/v3/objects/contact", json=objects_page)
+    stream = CRMObjectStream(entity="contact", associations=["companies"], api=API(some_credentials), start_date="2021-02-01T00:00:00Z")
+    stream.limit = 2
+
+    records = list(stream.list(fields=[]))
+
+    assert [record["id"] for record in records] == ["0", "1", "2", "3", "4"]
+    for record in records:
+        assert record["properties"] == {property_: f"{record['id']}-{property_}" for property_ in properties}
+        assert record["companies"] == ["1"]
+    object_requests = [request for request in requests_mock.request_history if request.path == "/crm/v3/objects/contact"]
+    # 3 pages per chunk, associations are only requested with the first chunk
+    assert len(object_requests) == 3 * len(chunks)
+    assert sum("associations" in request.qs for request in object_requests) == 3
@@ -5,10 +5,11 @@
 
 from setuptools import find_packages, setup
 
-MAIN_REQUIREMENTS = ["airbyte-cdk~=0.1", "requests==2.25.1", "pendulum>=1.2.0", "vcrpy==4.1.1"]
+MAIN_REQUIREMENTS = ["airbyte-cdk~=0.1.40", "requests==2.25.1", "pendulum>=1.2.0", "vcrpy==4.1.1"]
 
 TEST_REQUIREMENTS = [
     "pytest==6.1.2",
+    "requests-mock~=1.9.3",
     "source-acceptance-test",
 ]
 
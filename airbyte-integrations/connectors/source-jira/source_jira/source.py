@@ -10,6 +10,7 @@ from airbyte_cdk import AirbyteLogger
 from airbyte_cdk.models import SyncMode
 from airbyte_cdk.sources import AbstractSource
 from airbyte_cdk.sources.streams import Stream
+from airbyte_cdk.sources.streams.http import RecordCache
 from airbyte_cdk.sources.streams.http.auth import TokenAuthenticator
 
 from .streams import (
@@ -101,6 +102,8 @@ class SourceJira(AbstractSource):
         authenticator = self.get_authenticator(config)
         args = {"authenticator": authenticator, "domain": config["domain"], "projects": config["projects"]}
         incremental_args = {**args, "start_date": config["start_date"]}
+        # issues are searched once for all the issue child streams, and dropped along with the streams once the sync is over
+        issue_child_args = {**incremental_args, "issue_index": RecordCache()}
         return [
             ApplicationRoles(**args),
             Avatars(**args),
@@ -116,7 +119,7 @@ class SourceJira(AbstractSource):
                 additional_fields=config.get("additional_fields", []),
                 expand_changelog=config.get("expand_issue_changelog", False)
             ),
-            IssueComments(**incremental_args),
+            IssueComments(**issue_child_args),
             IssueFields(**args),
             IssueFieldConfigurations(**args),
             IssueCustomFieldContexts(**args),
@@ -124,15 +127,15 @@ class SourceJira(AbstractSource):
             IssueNavigatorSettings(**args),
             IssueNotificationSchemes(**args),
             IssuePriorities(**args),
-            IssueProperties(**incremental_args),
-            IssueRemoteLinks(**incremental_args),
+            IssueProperties(**issue_child_args),
+            IssueRemoteLinks(**issue_child_args),
             IssueResolutions(**args),
             IssueSecuritySchemes(**args),
             IssueTypeSchemes(**args),
             IssueTypeScreenSchemes(**args),
-            IssueVotes(**incremental_args),
-            IssueWatchers(**incremental_args),
-            IssueWorklogs(**incremental_args),
+            IssueVotes(**issue_child_args),
+            IssueWatchers(**issue_child_args),
+            IssueWorklogs(**issue_child_args),
             JiraSettings(**args),
             Labels(**args),
             Permissions(**args),
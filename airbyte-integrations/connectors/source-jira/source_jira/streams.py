@@ -10,7 +10,7 @@ from urllib.parse import parse_qs
 import pendulum
 import requests
 from airbyte_cdk.models import SyncMode
-from airbyte_cdk.sources.streams.http import HttpStream
+from airbyte_cdk.sources.streams.http import HttpStream, RecordCache
 
 API_VERSION = 3
 
@@ -112,6 +112,68 @@ class IncrementalJiraStream(StartDateJiraStream, ABC):
             return {self.cursor_field: str(latest_record_date)}
 
 
+class IssueChildStream(StartDateJiraStream, ABC):
+    """
+    Base class of the streams reading a sub-resource of every issue, e.g: issue/{key}/comment.
+    Issues are searched once per sync for all these streams and kept in `issue_index`, spilled to disk when they are large.
+    Records embedded in the search results are read from there instead of being requested for every issue.
+    """
+
+    # fields of the issues kept in the index, they embed the records of some issue child streams
+    index_fields = ["comment", "worklog"]
+    # field of the search results embedding the records of the stream, under parse_response_root
+    embedded_field: str = None
+    # path of the sub-resource, relative to the issue
+    issue_path: str = None
+
+    def __init__(self, issue_index: RecordCache = None, **kwargs):
+        """
+        :param issue_index: issues read by the stream, share it between the issue child streams of a source to search issues only once
+        """
+        super().__init__(**kwargs)
+        self.issue_index = issue_index or RecordCache()
+
+    def path(self, stream_slice: Mapping[str, Any] = None, **kwargs) -> str:
+        key = stream_slice["key"]
+        return f"issue/{key}/{self.issue_path}"
+
+    def read_issues(self) -> Iterable[Mapping[str, Any]]:
+        def read() -> Iterable[Mapping[str, Any]]:
+            issues_stream = Issues(
+                authenticator=self.authenticator,
+                domain=self._domain,
+                projects=self._projects,
+                start_date=self._start_date,
+                fields=self.index_fields,
+            )
+            for issue in issues_stream.read_records(sync_mode=SyncMode.full_refresh):
+                yield {"key": issue["key"], "fields": issue.get("fields") or {}}
+
+        return self.issue_index.read_records((self._domain, tuple(self._projects), self._start_date), read)
+
+    def embedded_records(self, issue: Mapping[str, Any]) -> Optional[List[Mapping[str, Any]]]:
+        """
+        :return: records of the issue embedded in the search results, None if they aren't or only some of them are
+        """
+        embedded = issue["fields"].get(self.embedded_field) if self.embedded_field else None
+        if not embedded:
+            return None
+        records = embedded.get(self.parse_response_root) or []
+        if len(records) < embedded.get("total", 0):
+            return None
+        return records
+
+    def read_records(self, stream_slice: Optional[Mapping[str, Any]] = None, **kwargs) -> Iterable[Mapping[str, Any]]:
+        for issue in self.read_issues():
+            issue_slice = {"key": issue["key"]}
+            records = self.embedded_records(issue)
+            if records is None:
+                yield from super().read_records(stream_slice=issue_slice, **kwargs)
+            else:
+                for record in records:
+                    yield self.transform(record=record, stream_slice=issue_slice)
+
+
 class ApplicationRoles(JiraStream):
     """
     https://developer.atlassian.com/cloud/jira/platform/rest/v3/api-group-application-roles/#api-rest-api-3-applicationrole-key-get
@@ -287,10 +349,14 @@ class Issues(IncrementalJiraStream):
     parse_response_root = "issues"
     use_cache = True
 
-    def __init__(self, additional_fields: List[str] = [], expand_changelog: bool = False, **kwargs):
+    def __init__(self, additional_fields: List[str] = [], expand_changelog: bool = False, fields: List[str] = None, **kwargs):
+        """
+        :param fields: fields of the issues to read instead of the default ones
+        """
         super().__init__(**kwargs)
         self._additional_fields = additional_fields
         self._expand_changelog = expand_changelog
+        self._fields = fields
 
     def path(self, **kwargs) -> str:
         return "search"
@@ -307,7 +373,7 @@ class Issues(IncrementalJiraStream):
             params["expand"] = "changelog"
         return params
 
-    def read_records(self, stream_slice: Optional[Mapping[str, Any]] = None, **kwargs) -> Iterable[Mapping[str, Any]]:
+    def default_fields(self) -> List[str]:
         stream_args = {"authenticator": self.authenticator, "domain": self._domain, "projects": self._projects}
         field_ids_by_name = IssueFields(**stream_args).field_ids_by_name()
         fields = [
@@ -332,6 +398,11 @@ class Issues(IncrementalJiraStream):
         for name in additional_field_names + self._additional_fields:
             if name in field_ids_by_name:
                 fields.append(field_ids_by_name[name])
+        return fields
+
+    def read_records(self, stream_slice: Optional[Mapping[str, Any]] = None, **kwargs) -> Iterable[Mapping[str, Any]]:
+        stream_args = {"authenticator": self.authenticator, "domain": self._domain, "projects": self._projects}
+        fields = self._fields or self.default_fields()
         projects_stream = Projects(**stream_args)
         for project in projects_stream.read_records(sync_mode=SyncMode.full_refresh):
             yield from super().read_records(
@@ -344,21 +415,14 @@ class Issues(IncrementalJiraStream):
         return record
 
 
-class IssueComments(StartDateJiraStream):
+class IssueComments(IssueChildStream):
     """
     https://developer.atlassian.com/cloud/jira/platform/rest/v3/api-group-issue-comments/#api-rest-api-3-issue-issueidorkey-comment-get
     """
 
     parse_response_root = "comments"
-
-    def path(self, stream_slice: Mapping[str, Any] = None, **kwargs) -> str:
-        key = stream_slice["key"]
-        return f"issue/{key}/comment"
-
-    def read_records(self, stream_slice: Optional[Mapping[str, Any]] = None, **kwargs) -> Iterable[Mapping[str, Any]]:
-        issues_stream = Issues(authenticator=self.authenticator, domain=self._domain, projects=self._projects, start_date=self._start_date)
-        for issue in issues_stream.read_records(sync_mode=SyncMode.full_refresh):
-            yield from super().read_records(stream_slice={"key": issue["key"]}, **kwargs)
+    issue_path = "comment"
+    embedded_field = "comment"
 
 
 class IssueFields(JiraStream):
@@ -461,37 +525,35 @@ class IssuePropertyKeys(JiraStream):
         yield from super().read_records(stream_slice={"key": issue_key}, **kwargs)
 
 
-class IssueProperties(StartDateJiraStream):
+class IssueProperties(IssueChildStream):
     """
-    https://developer.atlassian.com/cloud/jira/platform/rest/v3/api-group-issue-properties/#api-rest-api-3-issue-issueidorkey-properties-propertykey-get
+    https://developer.atlassian.com/cloud/jira/platform/rest/v3/api-group-issues/#api-rest-api-3-issue-issueidorkey-get
+
+    All the properties of an issue are read at once with the issue rather than one by one.
     """
 
     def path(self, stream_slice: Mapping[str, Any] = None, **kwargs) -> str:
         key = stream_slice["key"]
-        issue_key = stream_slice["issue_key"]
-        return f"issue/{issue_key}/properties/{key}"
+        return f"issue/{key}"
 
-    def read_records(self, stream_slice: Optional[Mapping[str, Any]] = None, **kwargs) -> Iterable[Mapping[str, Any]]:
-        issues_stream = Issues(authenticator=self.authenticator, domain=self._domain, projects=self._projects, start_date=self._start_date)
-        issue_property_keys_stream = IssuePropertyKeys(authenticator=self.authenticator, domain=self._domain, projects=self._projects)
-        for issue in issues_stream.read_records(sync_mode=SyncMode.full_refresh):
-            for property_key in issue_property_keys_stream.read_records(stream_slice={"key": issue["key"]}, **kwargs):
-                yield from super().read_records(stream_slice={"key": property_key["key"], "issue_key": issue["key"]}, **kwargs)
+    def request_params(self, stream_state: Mapping[str, Any], stream_slice: Mapping[str, Any] = None, **kwargs) -> MutableMapping[str, Any]:
+        params = super().request_params(stream_state=stream_state, stream_slice=stream_slice, **kwargs)
+        params["properties"] = "*all"
+        # none of the fields of the issue are needed
+        params["fields"] = "id"
+        return params
+
+    def parse_response(self, response: requests.Response, **kwargs) -> Iterable[Mapping]:
+        for key, value in response.json().get("properties", {}).items():
+            yield {"key": key, "value": value}
 
 
-class IssueRemoteLinks(StartDateJiraStream):
+class IssueRemoteLinks(IssueChildStream):
     """
     https://developer.atlassian.com/cloud/jira/platform/rest/v3/api-group-issue-remote-links/#api-rest-api-3-issue-issueidorkey-remotelink-get
     """
 
-    def path(self, stream_slice: Mapping[str, Any] = None, **kwargs) -> str:
-        key = stream_slice["key"]
-        return f"issue/{key}/remotelink"
-
-    def read_records(self, stream_slice: Optional[Mapping[str, Any]] = None, **kwargs) -> Iterable[Mapping[str, Any]]:
-        issues_stream = Issues(authenticator=self.authenticator, domain=self._domain, projects=self._projects, start_date=self._start_date)
-        for issue in issues_stream.read_records(sync_mode=SyncMode.full_refresh):
-            yield from super().read_records(stream_slice={"key": issue["key"]}, **kwargs)
+    issue_path = "remotelink"
 
 
 class IssueResolutions(JiraStream):
@@ -536,7 +598,7 @@ class IssueTypeScreenSchemes(JiraStream):
         return "issuetypescreenscheme"
 
 
-class IssueVotes(StartDateJiraStream):
+class IssueVotes(IssueChildStream):
     """
     https://developer.atlassian.com/cloud/jira/platform/rest/v3/api-group-issue-votes/#api-rest-api-3-issue-issueidorkey-votes-get
 
@@ -548,17 +610,10 @@ class IssueVotes(StartDateJiraStream):
 
     # parse_response_root = "voters"
 
-    def path(self, stream_slice: Mapping[str, Any] = None, **kwargs) -> str:
-        key = stream_slice["key"]
-        return f"issue/{key}/votes"
-
-    def read_records(self, stream_slice: Optional[Mapping[str, Any]] = None, **kwargs) -> Iterable[Mapping[str, Any]]:
-        issues_stream = Issues(authenticator=self.authenticator, domain=self._domain, projects=self._projects, start_date=self._start_date)
-        for issue in issues_stream.read_records(sync_mode=SyncMode.full_refresh):
-            yield from super().read_records(stream_slice={"key": issue["key"]}, **kwargs)
+    issue_path = "votes"
 
 
-class IssueWatchers(StartDateJiraStream):
+class IssueWatchers(IssueChildStream):
     """
     https://developer.atlassian.com/cloud/jira/platform/rest/v3/api-group-issue-watchers/#api-rest-api-3-issue-issueidorkey-watchers-get
 
@@ -567,31 +622,17 @@ class IssueWatchers(StartDateJiraStream):
 
     # parse_response_root = "watchers"
 
-    def path(self, stream_slice: Mapping[str, Any] = None, **kwargs) -> str:
-        key = stream_slice["key"]
-        return f"issue/{key}/watchers"
+    issue_path = "watchers"
 
-    def read_records(self, stream_slice: Optional[Mapping[str, Any]] = None, **kwargs) -> Iterable[Mapping[str, Any]]:
-        issues_stream = Issues(authenticator=self.authenticator, domain=self._domain, projects=self._projects, start_date=self._start_date)
-        for issue in issues_stream.read_records(sync_mode=SyncMode.full_refresh):
-            yield from super().read_records(stream_slice={"key": issue["key"]}, **kwargs)
 
-
-class IssueWorklogs(StartDateJiraStream):
+class IssueWorklogs(IssueChildStream):
     """
     https://developer.atlassian.com/cloud/jira/platform/rest/v3/api-group-issue-worklogs/#api-rest-api-3-issue-issueidorkey-worklog-get
     """
 
     parse_response_root = "worklogs"
-
-    def path(self, stream_slice: Mapping[str, Any] = None, **kwargs) -> str:
-        key = stream_slice["key"]
-        return f"issue/{key}/worklog"
-
-    def read_records(self, stream_slice: Optional[Mapping[str, Any]] = None, **kwargs) -> Iterable[Mapping[str, Any]]:
-        issues_stream = Issues(authenticator=self.authenticator, domain=self._domain, projects=self._projects, start_date=self._start_date)
-        for issue in issues_stream.read_records(sync_mode=SyncMode.full_refresh):
-            yield from super().read_records(stream_slice={"key": issue["key"]}, **kwargs)
+    issue_path = "worklog"
+    embedded_field = "worklog"
 
 
 class JiraSettings(JiraStream):
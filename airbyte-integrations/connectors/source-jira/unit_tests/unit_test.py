@@ -0,0 +1,94 @@
+#
+# Copyright (c) 2021 Airbyte, Inc., all rights reserved.
+#
+
+import pytest
+from airbyte_cdk.models import SyncMode
+from airbyte_cdk.sources.streams.http import RecordCache
+from source_jira.streams import IssueComments, IssueProperties, IssueWorklogs
+
+DOMAIN = "domain.atlassian.net"
+API_URL = f"https://{DOMAIN}/rest/api/3"
+
+
+@pytest.fixture(autouse=True)
+def cache_files_dir(tmp_path, monkeypatch):
+    # streams using use_cache write their cache files to the working directory
+    monkeypatch.chdir(tmp_path)
+
+
+@pytest.fixture
+def stream_args():
+    return {"domain": DOMAIN, "projects": ["P"], "start_date": "2021-01-01T00:00:00Z"}
+
+
+def mock_issues(requests_mock, issues):
+    requests_mock.get(f"{API_URL}/project/search", json={"values": [{"id": "1", "key": "P"}]})
+    return requests_mock.get(f"{API_URL}/search", json={"issues": issues})
+
+
+def comments(*ids, total=None):
+    return {"comments": [{"id": comment_id} for comment_id in ids], "total": len(ids) if total is None else total}
+
+
+def test_embedded_records_are_read_from_the_search_results(requests_mock, stream_args):
+    mock_issues(requests_mock, [{"key": "P-1", "fields": {"comment": comments("1", "2")}}])
+    comment_mock = requests_mock.get(f"{API_URL}/issue/P-1/comment", json={"comments": []})
+
+    records = list(IssueComments(**stream_args).read_records(sync_mode=SyncMode.full_refresh))
+
+    assert records == [{"id": "1"}, {"id": "2"}]
+    assert not comment_mock.called
+
+
+def test_truncated_embedded_records_are_requested(requests_mock, stream_args):
+    # the search results only embed the first comments of an issue
+    mock_issues(requests_mock, [{"key": "P-1", "fields": {"comment": comments("1", "2", total=3)}}])
+    comment_mock = requests_mock.get(f"{API_URL}/issue/P-1/comment", json=comments("1", "2", "3"))
+
+    records = list(IssueComments(**stream_args).read_records(sync_mode=SyncMode.full_refresh))
+
+    assert records == [{"id": "1"}, {"id": "2"}, {"id": "3"}]
+    assert comment_mock.call_count == 1
+
+
+def test_issue_without_embedded_records(requests_mock, stream_args):
+    mock_issues(
+        requests_mock,
+        [{"key": "P-1", "fields": {"comment": comments()}}, {"key": "P-2", "fields": {"comment": comments("3")}}],
+    )
+    comment_mock = requests_mock.get(f"{API_URL}/issue/P-1/comment", json=comments())
+
+    records = list(IssueComments(**stream_args).read_records(sync_mode=SyncMode.full_refresh))
+
+    assert records == [{"id": "3"}]
+    assert not comment_mock.called
+
+
+def test_issues_are_searched_once_for_streams_sharing_an_index(requests_mock, stream_args):
+    search_mock = mock_issues(
+        requests_mock,
+        [{"key": "P-1", "fields": {"comment": comments("1"), "worklog": {"worklogs": [{"id": "10"}], "total": 1}}}],
+    )
+    issue_index = RecordCache()
+
+    comment_records = list(IssueComments(issue_index=issue_index, **stream_args).read_records(sync_mode=SyncMode.full_refresh))
+    worklog_records = list(IssueWorklogs(issue_index=issue_index, **stream_args).read_records(sync_mode=SyncMode.full_refresh))
+
+    assert comment_records == [{"id": "1"}]
+    assert worklog_records == [{"id": "10"}]
+    assert search_mock.call_count == 1
+    assert set(search_mock.last_request.qs["fields"]) == {"comment", "worklog"}
+
+
+def test_issue_properties(requests_mock, stream_args):
+    mock_issues(requests_mock, [{"key": "P-1", "fields": {}}])
+    issue_mock = requests_mock.get(
+        f"{API_URL}/issue/P-1",
+        json={"id": "10001", "key": "P-1", "properties": {"support": {"level": 2}, "flagged": True}},
+    )
+
+    records = list(IssueProperties(**stream_args).read_records(sync_mode=SyncMode.full_refresh))
+
+    assert records == [{"key": "support", "value": {"level": 2}}, {"key": "flagged", "value": True}]
+    assert issue_mock.last_request.qs == {"properties": ["*all"], "fields": ["id"]}
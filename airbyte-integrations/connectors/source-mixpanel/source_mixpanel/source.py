@@ -5,7 +5,6 @@
 
 import base64
 import json
-import time
 from abc import ABC
 from datetime import date, datetime, timedelta
 from typing import Any, Iterable, List, Mapping, MutableMapping, Optional, Tuple, Union
@@ -17,8 +16,9 @@ from airbyte_cdk.logger import AirbyteLogger
 from airbyte_cdk.models import SyncMode
 from airbyte_cdk.sources import AbstractSource
 from airbyte_cdk.sources.streams import Stream
-from airbyte_cdk.sources.streams.http import HttpStream
+from airbyte_cdk.sources.streams.http import HttpStream, RateLimiter
 from airbyte_cdk.sources.streams.http.auth import HttpAuthenticator, TokenAuthenticator
+from airbyte_cdk.sources.streams.http.response_parsers import iter_lines
 
 
 class MixpanelStream(HttpStream, ABC):
@@ -28,12 +28,8 @@ class MixpanelStream(HttpStream, ABC):
       400 queries per hour.
 
     API Rate Limit Handler:
-    If total number of planned requests is lower than it is allowed per hour
-    then
-        reset reqs_per_hour_limit and send requests with small delay (1 reqs/sec)
-        because API endpoint accept requests bursts up to 3 reqs/sec
-    else
-        send requests with planned delay: 3600/reqs_per_hour_limit seconds
+    Requests of all the streams share the same rate limiter: bursts of up to 3 reqs/sec are sent
+    until the hourly quota is used, after that requests are spread over the hour (1 req in 9 secs).
     """
 
     @property
@@ -42,7 +38,7 @@ class MixpanelStream(HttpStream, ABC):
         return f"https://{prefix}mixpanel.com/api/2.0/"
 
     # https://help.mixpanel.com/hc/en-us/articles/115004602563-Rate-Limits-for-Export-API-Endpoints#api-export-endpoint-rate-limits
-    reqs_per_hour_limit = 400  # 1 req in 9 secs
+    rate_limiter = RateLimiter(limits=[(3, 1), (400, 3600)])
 
     def __init__(
         self,
@@ -94,9 +90,6 @@ class MixpanelStream(HttpStream, ABC):
         for record in data:
             yield record
 
-        # wait for X seconds to match API limitations
-        time.sleep(3600 / self.reqs_per_hour_limit)
-
     def get_stream_params(self) -> Mapping[str, Any]:
         """
         Fetch required parameters in a given stream. Used to create sub-streams
@@ -190,10 +183,6 @@ class DateSlicesMixin:
             # add 1 additional day because date range is inclusive
             start_date = end_date + timedelta(days=1)
 
-        # reset reqs_per_hour_limit if we expect less requests (1 req per stream) than it is allowed by API reqs_per_hour_limit
-        if len(date_slices) < self.reqs_per_hour_limit:
-            self.reqs_per_hour_limit = 3600  # 1 query per sec
-
         return date_slices
 
     def request_params(
@@ -268,10 +257,6 @@ class Funnels(DateSlicesMixin, IncrementalMixpanelStream):
             date_slices = super().stream_slices(sync_mode, cursor_field=cursor_field, stream_state=funnel_state)
             for date_slice in date_slices:
                 stream_slices.append({**funnel_slice, **date_slice})
-
-        # reset reqs_per_hour_limit if we expect less requests (1 req per stream) than it is allowed by API reqs_per_hour_limit
-        if len(stream_slices) < self.reqs_per_hour_limit:
-            self.reqs_per_hour_limit = 3600  # queries per hour (1 query per sec)
         return stream_slices
 
     def request_params(
@@ -681,13 +666,19 @@ class Export(DateSlicesMixin, IncrementalMixpanelStream):
 
     primary_key = None
     cursor_field = "time"
-    reqs_per_hour_limit = 60  # 1 query per minute
+    # the Raw Export API has its own quota, separate from the one of the other endpoints
+    rate_limiter = RateLimiter(limits=[(3, 1), (60, 3600)])
 
     @property
     def url_base(self):
         prefix = "-eu" if self.region == "EU" else ""
         return f"https://data{prefix}.mixpanel.com/api/2.0/"
 
+    @property
+    def stream_response(self) -> bool:
+        """Export responses can be very large, records are parsed as the body is downloaded instead of loading it into memory"""
+        return True
+
     def path(self, **kwargs) -> str:
         return "export"
 
@@ -710,12 +701,13 @@ class Export(DateSlicesMixin, IncrementalMixpanelStream):
                 }
             }
         """
-        if response.text == "terminated early\n":
-            # no data available
-            self.logger.warn(f"Couldn't fetch data from Export API. Response: {response.text}")
-            return []
-
-        for record_line in response.text.splitlines():
+        for record_line in iter_lines(response):
+            if record_line == b"terminated early":
+                # no data available
+                self.logger.warn(f"Couldn't fetch data from Export API. Response: {record_line.decode()}")
+                return
+            if not record_line.strip():
+                continue
             record = json.loads(record_line)
             # transform record into flat dict structure
             item = {"event": record["event"]}
@@ -737,9 +729,6 @@ class Export(DateSlicesMixin, IncrementalMixpanelStream):
 
             yield item
 
-        # wait for X seconds to meet API limitation
-        time.sleep(3600 / self.reqs_per_hour_limit)
-
     def get_json_schema(self) -> Mapping[str, Any]:
         """
         :return: A dict of the JSON schema representing this stream.
@@ -2,10 +2,12 @@
 # Copyright (c) 2021 Airbyte, Inc., all rights reserved.
 #
 
-from datetime import date, timedelta
+import io
+from datetime import date, datetime, timedelta
 
+import requests
 from airbyte_cdk.sources.streams.http.auth import NoAuth
-from source_mixpanel.source import Annotations
+from source_mixpanel.source import Annotations, Export, Funnels
 
 
 def test_date_slices():
@@ -92,3 +94,41 @@ def test_date_slices():
         date_window_size=1,
     ).stream_slices(sync_mode="any", stream_state={"date": "2021-07-02"})
     assert [{"start_date": "2021-07-02", "end_date": "2021-07-02"}, {"start_date": "2021-07-03", "end_date": "2021-07-03"}] == stream_slices
+
+
+def test_export_parse_response_streams_lines():
+    stream = Export(authenticator=NoAuth(), start_date=date(2021, 7, 1), end_date=date(2021, 7, 1))
+    response = requests.Response()
+    response.raw = io.BytesIO(
+        b'{"event": "Viewed Page", "properties": {"time": 1623860880, "$browser": "Chrome", "url": "https://example.com/\xe2\x80\xa8"}}\n'
+        b'{"event": "Clicked", "properties": {"$insert_id": "abc"}}\n'
+    )
+
+    records = list(stream.parse_response(response))
+
+    assert stream.stream_response
+    assert records == [
+        {
+            "event": "Viewed Page",
+            "time": datetime.fromtimestamp(1623860880).isoformat(),
+            "browser": "Chrome",
+            "url": "https://example.com/\u2028",
+        },
+        {"event": "Clicked", "insert_id": "abc"},
+    ]
+
+
+def test_export_parse_response_terminated_early():
+    stream = Export(authenticator=NoAuth(), start_date=date(2021, 7, 1), end_date=date(2021, 7, 1))
+    response = requests.Response()
+    response.raw = io.BytesIO(b"terminated early\n")
+
+    assert list(stream.parse_response(response)) == []
+
+
+def test_streams_share_rate_limiters():
+    annotations = Annotations(authenticator=NoAuth())
+    export = Export(authenticator=NoAuth())
+
+    assert annotations.rate_limiter is Funnels(authenticator=NoAuth()).rate_limiter
+    assert export.rate_limiter is not annotations.rate_limiter
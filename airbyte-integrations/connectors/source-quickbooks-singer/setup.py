@@ -7,7 +7,7 @@ from setuptools import find_packages, setup
 
 MAIN_REQUIREMENTS = [
     "tap-quickbooks @ https://github.com/airbytehq//tap-quickbooks/tarball/v1.0.5-airbyte",
-    "airbyte-cdk",
+    "airbyte-cdk~=0.1.42",
 ]
 
 TEST_REQUIREMENTS = [
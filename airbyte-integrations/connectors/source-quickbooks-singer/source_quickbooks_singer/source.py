@@ -14,6 +14,7 @@ from tap_quickbooks.client import PROD_ENDPOINT_BASE, SANDBOX_ENDPOINT_BASE, TOK
 
 class SourceQuickbooksSinger(SingerSource):
     TAP_CMD = "tap-quickbooks"
+    passthrough_records = True
 
     def _write_config(self, token):
         logger = AirbyteLogger()
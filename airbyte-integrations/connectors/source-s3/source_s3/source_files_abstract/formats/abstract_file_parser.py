@@ -39,14 +39,40 @@ class AbstractFileParser(ABC):
         """
 
     @abstractmethod
-    def stream_records(self, file: Union[TextIO, BinaryIO]) -> Iterator[Mapping[str, Any]]:
+    def stream_batches(self, file: Union[TextIO, BinaryIO]) -> Iterator[pa.RecordBatch]:
         """
-        Override this with format-specifc logic to stream each data row from the file as a mapping of {columns:values}
+        Override this with format-specifc logic to stream the data of the file as pyarrow RecordBatches
+        Values must already be JSON-compatible once converted to python (e.g. no datetime objects)
         Note: avoid loading the whole file into memory to avoid OOM breakages
 
         :param file: file-like object (opened via StorageFile)
+        :yield: pyarrow RecordBatch holding a chunk of data rows
+        """
+
+    def stream_records(self, file: Union[TextIO, BinaryIO]) -> Iterator[Mapping[str, Any]]:
+        """
+        Streams each data row from the file as a mapping of {columns:values}, see stream_batches()
+
+        :param file: file-like object (opened via StorageFile)
+        :yield: data record as a mapping of {columns:values}
+        """
+        for batch in self.stream_batches(file):
+            yield from self.batch_to_records(batch)
+
+    @staticmethod
+    def batch_to_records(batch: pa.RecordBatch) -> Iterator[Mapping[str, Any]]:
+        """
+        Converts a RecordBatch to records, this should be the last step of processing as it leaves the columnar format
+        PyArrow converts each column to a list of python values in one go so we only have to zip() these up into records
+
+        :param batch: pyarrow RecordBatch
         :yield: data record as a mapping of {columns:values}
         """
+        columns = batch.schema.names
+        # this gives us a list of lists where each nested list holds ordered values for a single column
+        # e.g. [ [1,2,3], ["a", "b", "c"], [True, True, False] ] which we zip to get row-by-row, e.g. [ [1, "a", True], ... ]
+        for record_values in zip(*[column.to_pylist() for column in batch.columns]):
+            yield dict(zip(columns, record_values))
 
     @staticmethod
     def json_type_to_pyarrow_type(typ: str, reverse: bool = False, logger: AirbyteLogger = AirbyteLogger()) -> str:
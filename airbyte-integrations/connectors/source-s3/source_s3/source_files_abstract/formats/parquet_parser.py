@@ -4,6 +4,7 @@
 
 from typing import Any, BinaryIO, Iterator, List, Mapping, TextIO, Tuple, Union
 
+import pyarrow as pa
 import pyarrow.parquet as pq
 from pyarrow.parquet import ParquetFile
 
@@ -101,7 +102,17 @@ class ParquetParser(AbstractFileParser):
             raise OSError("empty Parquet file")
         return schema_dict
 
-    def stream_records(self, file: Union[TextIO, BinaryIO]) -> Iterator[Mapping[str, Any]]:
+    def _convert_batch(self, batch: pa.RecordBatch, logical_types: Mapping[str, str]) -> pa.RecordBatch:
+        """Converts columns of not JSON types (see PARQUET_TYPES) to JSON ones, other columns are kept as they are"""
+        columns = []
+        for name, column in zip(batch.schema.names, batch.columns):
+            logical_type = logical_types[name]
+            if PARQUET_TYPES[logical_type][2] is not None:
+                column = pa.array([self.convert_field_data(logical_type, value) for value in column.to_pylist()], type=pa.string())
+            columns.append(column)
+        return pa.RecordBatch.from_arrays(columns, names=batch.schema.names)
+
+    def stream_batches(self, file: Union[TextIO, BinaryIO]) -> Iterator[pa.RecordBatch]:
         """
         https://arrow.apache.org/docs/python/generated/pyarrow.parquet.ParquetFile.html
         PyArrow reads streaming batches from a Parquet file
@@ -123,15 +134,4 @@ class ParquetParser(AbstractFileParser):
         for num_row_group in num_row_groups:
             args["row_groups"] = [num_row_group]
             for batch in reader.iter_batches(**args):
-                # this gives us a dist of lists where each nested list holds ordered values for a single column
-                # {'number': [1.0, 2.0, 3.0], 'name': ['foo', None, 'bar'], 'flag': [True, False, True], 'delta': [-1.0, 2.5, 0.1]}
-                batch_columns = [col.name for col in batch.schema]
-                batch_dict = batch.to_pydict()
-                columnwise_record_values = [batch_dict[column] for column in batch_columns]
-
-                # we zip this to get row-by-row
-                for record_values in zip(*columnwise_record_values):
-                    yield {
-                        batch_columns[i]: self.convert_field_data(logical_types[batch_columns[i]], record_values[i])
-                        for i in range(len(batch_columns))
-                    }
+                yield self._convert_batch(batch, logical_types)
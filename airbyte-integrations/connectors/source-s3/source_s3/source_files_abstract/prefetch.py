@@ -0,0 +1,78 @@
+#
+# Copyright (c) 2021 Airbyte, Inc., all rights reserved.
+#
+
+
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Iterable, Iterator
+
+# how long a worker blocked on a full buffer waits before checking whether the reader went away
+POLL_INTERVAL_SECONDS = 0.1
+
+
+class _End:
+    """ marks the end of a producer's output, holding the exception which stopped it if any """
+
+    def __init__(self, error: BaseException = None):
+        self.error = error
+
+
+def prefetch_in_order(producers: Iterable[Callable[[], Iterable[Any]]], max_workers: int, buffer_size: int) -> Iterator[Any]:
+    """
+    Yields all items of the first producer, then all items of the second one and so on, exactly as if they were consumed one by one.
+    Meanwhile, up to max_workers producers (the one being yielded included) run ahead in threads, each one buffering up to buffer_size items.
+    This lets us overlap the network latency and parsing of several files while keeping a deterministic order.
+    Any exception raised by a producer is re-raised when its items are reached.
+
+    :param producers: callables returning the iterables to consume, e.g. reading a single file
+    :param max_workers: maximum number of producers running at the same time
+    :param buffer_size: maximum number of items buffered per producer, workers block once their buffer is full
+    :yield: items of every producer, in order
+    """
+    stopped = threading.Event()
+
+    def put(buffer: queue.Queue, item: Any):
+        while not stopped.is_set():
+            try:
+                buffer.put(item, timeout=POLL_INTERVAL_SECONDS)
+                return
+            except queue.Full:
+                continue
+
+    def run(producer: Callable[[], Iterable[Any]], buffer: queue.Queue):
+        try:
+            for item in producer():
+                if stopped.is_set():
+                    return
+                put(buffer, item)
+        except BaseException as e:
+            put(buffer, _End(error=e))
+        else:
+            put(buffer, _End())
+
+    def drain(buffer: queue.Queue) -> Iterator[Any]:
+        while True:
+            item = buffer.get()
+            if isinstance(item, _End):
+                if item.error is not None:
+                    raise item.error
+                return
+            yield item
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        buffers: Deque[queue.Queue] = deque()
+        try:
+            for producer in producers:
+                buffer = queue.Queue(maxsize=buffer_size)
+                executor.submit(run, producer, buffer)
+                buffers.append(buffer)
+                if len(buffers) >= max_workers:
+                    yield from drain(buffers.popleft())
+            while buffers:
+                yield from drain(buffers.popleft())
+        finally:
+            # unblocks the workers if we stopped reading early (e.g. on error), so the executor can shut down
+            stopped.set()
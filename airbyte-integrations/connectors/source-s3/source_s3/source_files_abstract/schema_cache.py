@@ -0,0 +1,90 @@
+#
+# Copyright (c) 2021 Airbyte, Inc., all rights reserved.
+#
+
+import json
+import os
+import tempfile
+from typing import Iterable, Mapping, Optional
+
+from airbyte_cdk.logger import AirbyteLogger
+
+LOGGER = AirbyteLogger()
+
+
+class SchemaCache:
+    """
+    Keeps the schema inferred from each file so that unchanged files don't need to be opened again, e.g. on the next discover or sync
+    when the JSON file of the cache is kept between runs.
+    Entries are keyed by file url and hold the version of the file (e.g. its last modified timestamp) they were inferred from,
+    an entry is ignored as soon as the file has a different version.
+    The cache is persisted as a JSON file if a path is given, otherwise it only lives in memory.
+    Failing to load or save the cache is never an error, we just infer the schemas again.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        :param path: location of the JSON file to load the cache from and save it to, defaults to None (in memory only)
+        """
+        self._path = path
+        self._entries = self._load()
+        self._changed = False
+
+    def _load(self) -> dict:
+        if self._path is None:
+            return {}
+        try:
+            with open(self._path, "r") as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            LOGGER.warn(f"Ignoring unreadable schema cache at '{self._path}': {repr(e)}")
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def get(self, url: str, version: str) -> Optional[Mapping[str, str]]:
+        """
+        :param url: file url
+        :param version: current version of the file
+        :return: the cached schema of this version of the file, None if we don't have it
+        """
+        entry = self._entries.get(url)
+        if isinstance(entry, dict) and entry.get("version") == version:
+            return entry.get("schema")
+        return None
+
+    def set(self, url: str, version: str, schema: Mapping[str, str]):
+        """
+        :param url: file url
+        :param version: version of the file the schema was inferred from
+        :param schema: inferred schema of the file, mapping of {columns:datatypes}
+        """
+        self._entries[url] = {"version": version, "schema": schema}
+        self._changed = True
+
+    def retain(self, urls: Iterable[str]):
+        """
+        Removes the entries of all files but these, so that deleted files don't stay in the cache forever
+
+        :param urls: urls of all existing files
+        """
+        urls = set(urls)
+        for url in [url for url in self._entries if url not in urls]:
+            del self._entries[url]
+            self._changed = True
+
+    def save(self):
+        """ Writes the cache to its JSON file if anything changed, the file is replaced atomically so concurrent runs can't corrupt it """
+        if self._path is None or not self._changed:
+            return
+        try:
+            directory = os.path.dirname(self._path) or "."
+            os.makedirs(directory, exist_ok=True)
+            with tempfile.NamedTemporaryFile("w", dir=directory, delete=False) as f:
+                json.dump(self._entries, f)
+            os.replace(f.name, self._path)
+        except OSError as e:
+            LOGGER.warn(f"Failed to save schema cache at '{self._path}': {repr(e)}")
+        else:
+            self._changed = False
@@ -4,22 +4,28 @@
 
 
 import concurrent
+import hashlib
 import json
+import os
 from abc import ABC, abstractmethod
 from copy import deepcopy
 from datetime import datetime
-from functools import lru_cache
+from functools import lru_cache, partial
 from operator import itemgetter
 from traceback import format_exc
 from typing import Any, Iterable, Iterator, List, Mapping, MutableMapping, Optional, Tuple, Union
 
+import pyarrow as pa
 from airbyte_cdk.logger import AirbyteLogger
 from airbyte_cdk.models.airbyte_protocol import SyncMode
 from airbyte_cdk.sources.streams import Stream
+from airbyte_cdk.sources.utils.schema_helpers import get_schema_cache_dir
 from wcmatch.glob import GLOBSTAR, SPLIT, globmatch
 
 from .formats.csv_parser import CsvParser
 from .formats.parquet_parser import ParquetParser
+from .prefetch import prefetch_in_order
+from .schema_cache import SchemaCache
 
 JSON_TYPES = ["string", "number", "integer", "object", "array", "boolean", "null"]
 
@@ -45,6 +51,11 @@ class FileStream(Stream, ABC):
     ab_file_name_col = "_ab_source_file_url"
     airbyte_columns = [ab_additional_col, ab_last_mod_col, ab_file_name_col]
     datetime_format_string = "%Y-%m-%dT%H:%M:%S%z"
+    # TODO: make these user configurable in spec.json
+    # number of files in a stream_slice that are downloaded and parsed at the same time
+    max_concurrent_files = 8
+    # number of batches that a file being read ahead can hold in memory before waiting for the previous files to be consumed
+    prefetched_batches_per_file = 10
 
     def __init__(self, dataset: str, provider: dict, format: dict, path_pattern: str, schema: str = None):
         """
@@ -62,6 +73,8 @@ class FileStream(Stream, ABC):
         if schema:
             self._schema = self._parse_user_input_schema(schema)
         self.master_schema = None
+        # directory of the local file caching the schema inferred from each file, set to None to disable persisting it
+        self.schema_cache_dir = get_schema_cache_dir()
         LOGGER.info(f"initialised stream with format: {format}")
 
     @staticmethod
@@ -143,21 +156,20 @@ class FileStream(Stream, ABC):
             if globmatch(filepath, self._path_pattern, flags=GLOBSTAR | SPLIT):
                 yield filepath
 
-    @lru_cache(maxsize=None)
-    def get_time_ordered_filepaths(self) -> Iterable[Tuple[datetime, str]]:
+    def last_modified_iterator(self) -> Iterator[Tuple[datetime, str]]:
         """
-        Iterates through pattern_matched_filepath_iterator(), acquiring last_modified property of each file to return in time ascending order.
-        Uses concurrent.futures to thread this asynchronously in order to improve performance when there are many files (network I/O)
-        Caches results after first run of method to avoid repeating network calls as this is used more than once
+        Iterates through pattern_matched_filepath_iterator(), acquiring last_modified property of each file.
+        By default this needs a network call per file, so it uses concurrent.futures to thread this asynchronously
+        in order to improve performance when there are many files.
+        Override this if the provider's listing already returns last_modified, to avoid these calls entirely.
 
-        :return: list in time-ascending order
+        :yield: tuple of (last_modified, filepath) for every file matching user-provided path patterns, in any order
         """
 
         def get_storagefile_with_lastmod(filepath: str) -> Tuple[datetime, str]:
             fc = self.storagefile_class(filepath, self._provider)
             return (fc.last_modified, filepath)
 
-        storagefiles = []
         # use concurrent future threads to parallelise grabbing last_modified from all the files
         # TODO: don't hardcode max_workers like this
         with concurrent.futures.ThreadPoolExecutor(max_workers=64) as executor:
@@ -168,10 +180,18 @@ class FileStream(Stream, ABC):
 
             for future in concurrent.futures.as_completed(futures):
                 # this will failfast on any errors
-                storagefiles.append(future.result())
+                yield future.result()
+
+    @lru_cache(maxsize=None)
+    def get_time_ordered_filepaths(self) -> Iterable[Tuple[datetime, str]]:
+        """
+        Gets the last_modified property of each file from last_modified_iterator() to return files in time ascending order.
+        Caches results after first run of method to avoid repeating network calls as this is used more than once
 
-        # The array storagefiles contain tuples of (last_modified, filepath), so sort by last_modified
-        return sorted(storagefiles, key=itemgetter(0))
+        :return: list in time-ascending order
+        """
+        # The tuples are (last_modified, filepath), so sort by last_modified
+        return sorted(self.last_modified_iterator(), key=itemgetter(0))
 
     def _get_schema_map(self) -> Mapping[str, Any]:
         if self._schema != {}:
@@ -184,6 +204,19 @@ class FileStream(Stream, ABC):
         return_schema[self.ab_file_name_col] = "string"
         return return_schema
 
+    def _get_schema_cache(self) -> SchemaCache:
+        """
+        The cache file is specific to the provider location and file format options since both affect the inferred schemas.
+        Credentials are left out so that rotating them doesn't invalidate the cache.
+        """
+        if self.schema_cache_dir is None:
+            return SchemaCache()
+        provider = {key: value for key, value in self._provider.items() if key not in ["aws_access_key_id", "aws_secret_access_key"]}
+        cache_key = hashlib.sha256(
+            json.dumps({"provider": provider, "format": self._format}, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        return SchemaCache(os.path.join(self.schema_cache_dir, f"airbyte_schema_cache_{cache_key}.json"))
+
     def get_json_schema(self) -> Mapping[str, Any]:
         """
         :return: the JSON schema representing this stream.
@@ -204,6 +237,8 @@ class FileStream(Stream, ABC):
             to build up this superset schema (master_schema).
         This runs datatype checks to Warn or Error if we find incompatible schemas (e.g. same column is 'date' in one file but 'float' in another).
         This caches the master_schema after first run in order to avoid repeated compute and network calls to infer schema on all files.
+        The schema inferred from each file is also kept in a SchemaCache, so only new or modified files are opened as long as the cache
+            is persisted between runs (see schema_cache_dir).
 
         :param min_datetime: if passed, will only use files with last_modified >= this to determine master schema
 
@@ -216,15 +251,22 @@ class FileStream(Stream, ABC):
             master_schema = deepcopy(self._schema)
 
             file_reader = self.fileformatparser_class(self._format)
+            schema_cache = self._get_schema_cache()
+            filepaths = self.get_time_ordered_filepaths()
 
-            for last_mod, filepath in self.get_time_ordered_filepaths():
+            for last_mod, filepath in filepaths:
                 # skip this file if it's earlier than min_datetime
                 if (min_datetime is not None) and (last_mod < min_datetime):
                     continue
 
-                storagefile = self.storagefile_class(filepath, self._provider)
-                with storagefile.open(file_reader.is_binary) as f:
-                    this_schema = file_reader.get_inferred_schema(f)
+                # only open files we haven't inferred the schema of yet, or which changed since
+                file_version = last_mod.isoformat()
+                this_schema = schema_cache.get(filepath, file_version)
+                if this_schema is None:
+                    storagefile = self.storagefile_class(filepath, self._provider)
+                    with storagefile.open(file_reader.is_binary) as f:
+                        this_schema = file_reader.get_inferred_schema(f)
+                    schema_cache.set(filepath, file_version, this_schema)
 
                 if this_schema == master_schema:
                     continue  # exact schema match so go to next file
@@ -239,14 +281,14 @@ class FileStream(Stream, ABC):
                         # if not, then the read will error anyway
                         if col in self._schema.keys():
                             LOGGER.warn(
-                                f"Detected mismatched datatype on column '{col}', in file '{storagefile.url}'. "
+                                f"Detected mismatched datatype on column '{col}', in file '{filepath}'. "
                                 + f"Should be '{master_schema[col]}', but found '{this_schema[col]}'. "
                                 + f"Airbyte will attempt to coerce this to {master_schema[col]} on read."
                             )
                         # else we're inferring the schema (or at least this column) from scratch and therefore throw an error on mismatching datatypes
                         else:
                             raise RuntimeError(
-                                f"Detected mismatched datatype on column '{col}', in file '{storagefile.url}'. "
+                                f"Detected mismatched datatype on column '{col}', in file '{filepath}'. "
                                 + f"Should be '{master_schema[col]}', but found '{this_schema[col]}'."
                             )
 
@@ -257,6 +299,10 @@ class FileStream(Stream, ABC):
                     if col not in master_schema.keys():
                         master_schema[col] = datatype
 
+            if min_datetime is None:
+                schema_cache.retain(filepath for _, filepath in filepaths)
+            schema_cache.save()
+
             LOGGER.info(f"determined master schema: {master_schema}")
             self.master_schema = master_schema
 
@@ -280,44 +326,58 @@ class FileStream(Stream, ABC):
             storagefile = self.storagefile_class(filepath, self._provider)
             yield [{"unique_url": storagefile.url, "last_modified": last_mod, "storagefile": storagefile}]
 
-    def _match_target_schema(self, record: Mapping[str, Any], target_columns: List) -> Mapping[str, Any]:
+    def _match_target_schema(self, batch: pa.RecordBatch, target_columns: List) -> pa.RecordBatch:
         """
-        This method handles missing or additional fields in each record, according to the provided target_columns.
-        All missing fields are added, with a value of None (null)
-        All additional fields are packed into the _ab_additional_properties object column
-        We start off with a check to see if we're already lined up to target in order to avoid unnecessary iterations (useful if many columns)
+        This method handles missing or additional columns in a batch of records, according to the provided target_columns.
+        All missing columns are added, with values of None (null)
+        All additional columns are packed into the _ab_additional_properties object column
+        This works on whole columns of the batch so it doesn't iterate through the records
 
-        :param record: json-like representation of a data row {column:value}
-        :param target_columns: list of column names to mutate this record into (obtained via self._get_schema_map().keys() as of now)
-        :return: mutated record with columns lining up to target_columns
+        :param batch: pyarrow RecordBatch holding a chunk of data rows
+        :param target_columns: list of column names to mutate this batch into (obtained via self._get_schema_map().keys() as of now)
+        :return: new batch with columns lining up to target_columns
         """
-        compare_columns = [c for c in target_columns if c not in [self.ab_last_mod_col, self.ab_file_name_col]]
-        # check if we're already matching to avoid unnecessary iteration
-        if set(list(record.keys()) + [self.ab_additional_col]) == set(compare_columns):
-            record[self.ab_additional_col] = {}
-            return record
+        compare_columns = [c for c in target_columns if c not in [self.ab_additional_col, self.ab_last_mod_col, self.ab_file_name_col]]
+        batch_columns = dict(zip(batch.schema.names, batch.columns))
         # missing columns
-        for c in [col for col in compare_columns if col != self.ab_additional_col]:
-            if c not in record.keys():
-                record[c] = None
+        arrays = [batch_columns[c] if c in batch_columns else pa.nulls(batch.num_rows) for c in compare_columns]
         # additional columns
-        record[self.ab_additional_col] = {c: deepcopy(record[c]) for c in record.keys() if c not in compare_columns}
-        for c in record[self.ab_additional_col].keys():
-            del record[c]
+        additional_columns = [c for c in batch.schema.names if c not in compare_columns]
+        if additional_columns:
+            additional = pa.StructArray.from_arrays([batch_columns[c] for c in additional_columns], names=additional_columns)
+        else:
+            # a struct without any child array can't infer its length, so we build it from empty objects
+            additional = pa.array([{}] * batch.num_rows, type=pa.struct([]))
 
-        return record
+        return pa.RecordBatch.from_arrays(arrays + [additional], names=compare_columns + [self.ab_additional_col])
 
-    def _add_extra_fields_from_map(self, record: Mapping[str, Any], extra_map: Mapping[str, Any]) -> Mapping[str, Any]:
+    def _add_extra_fields_from_map(self, batch: pa.RecordBatch, extra_map: Mapping[str, Any]) -> pa.RecordBatch:
         """
-        Simple method to take a mapping of columns:values and add them to the provided record
+        Simple method to take a mapping of columns:values and add them as constant columns to the provided batch
 
-        :param record: json-like representation of a data row {column:value}
+        :param batch: pyarrow RecordBatch holding a chunk of data rows
         :param extra_map: map of additional columns and values to add
-        :return: mutated record with additional fields
+        :return: new batch with additional columns
         """
+        names = [c for c in batch.schema.names if c not in extra_map]
+        arrays = [batch.column(batch.schema.get_field_index(c)) for c in names]
         for key, value in extra_map.items():
-            record[key] = value
-        return record
+            names.append(key)
+            arrays.append(pa.repeat(value, batch.num_rows))
+        return pa.RecordBatch.from_arrays(arrays, names=names)
+
+    def _read_file(self, file_reader, file_info: Mapping[str, Any], target_columns: List) -> Iterator[pa.RecordBatch]:
+        """
+        Uses provider-relevant StorageFile to open file and then iterates through stream_batches() using format-relevant AbstractFileParser.
+        Batches are mutated using _match_target_schema() and _add_extra_fields_from_map() to achieve desired final schema.
+        """
+        extra_map = {
+            self.ab_last_mod_col: datetime.strftime(file_info["last_modified"], self.datetime_format_string),
+            self.ab_file_name_col: file_info["unique_url"],
+        }
+        with file_info["storagefile"].open(file_reader.is_binary) as f:
+            for batch in file_reader.stream_batches(f):
+                yield self._add_extra_fields_from_map(self._match_target_schema(batch, target_columns), extra_map)
 
     def _read_from_slice(
         self,
@@ -326,24 +386,15 @@ class FileStream(Stream, ABC):
         stream_state: Mapping[str, Any] = None,
     ) -> Iterable[Mapping[str, Any]]:
         """
-        Uses provider-relevant StorageFile to open file and then iterates through stream_records() using format-relevant AbstractFileParser.
-        Records are mutated on the fly using _match_target_schema() and _add_extra_fields_from_map() to achieve desired final schema.
+        Reads all files in a stream_slice via _read_file(), batches are only converted to records once in their final shape.
+        Up to max_concurrent_files files are read ahead in threads, however records are yielded file by file in the order of the stream_slice,
+        exactly as if files were read one at a time, so the cursor only moves forward.
         Since this is called per stream_slice, this method works for both full_refresh and incremental.
         """
-        # TODO: read all files in a stream_slice concurrently
-        for file_info in stream_slice:
-            with file_info["storagefile"].open(file_reader.is_binary) as f:
-                # TODO: make this more efficient than mutating every record one-by-one as they stream
-                for record in file_reader.stream_records(f):
-                    schema_matched_record = self._match_target_schema(record, list(self._get_schema_map().keys()))
-                    complete_record = self._add_extra_fields_from_map(
-                        schema_matched_record,
-                        {
-                            self.ab_last_mod_col: datetime.strftime(file_info["last_modified"], self.datetime_format_string),
-                            self.ab_file_name_col: file_info["unique_url"],
-                        },
-                    )
-                    yield complete_record
+        target_columns = list(self._get_schema_map().keys())
+        file_readers = [partial(self._read_file, file_reader, file_info, target_columns) for file_info in stream_slice]
+        for batch in prefetch_in_order(file_readers, max_workers=self.max_concurrent_files, buffer_size=self.prefetched_batches_per_file):
+            yield from file_reader.batch_to_records(batch)
         LOGGER.info("finished reading a stream slice")
         # Always return an empty generator just in case no records were ever yielded
         yield from []
@@ -3,7 +3,9 @@
 #
 
 
-from typing import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Iterator, List, Mapping, Tuple
 
 from boto3 import session as boto3session
 from botocore import UNSIGNED
@@ -15,19 +17,16 @@ from .source_files_abstract.stream import IncrementalFileStream
 
 
 class IncrementalFileStreamS3(IncrementalFileStream):
+    # number of prefixes (first level "folders" under path_prefix) listed at the same time
+    # TODO: make this user configurable in spec.json
+    max_concurrent_listings = 16
+
     @property
     def storagefile_class(self) -> type:
         return S3File
 
-    def _list_bucket(self, accept_key=lambda k: True) -> Iterator[str]:
-        """
-        Wrapper for boto3's list_objects_v2 so we can handle pagination, filter by lambda func and operate with or without credentials
-
-        :param accept_key: lambda function to allow filtering return keys, e.g. lambda k: not k.endswith('/'), defaults to lambda k: True
-        :yield: key (name) of each object
-        """
+    def _make_client(self):
         provider = self._provider
-
         client_config = None
         if S3File.use_aws_account(provider):
             session = boto3session.Session(
@@ -36,30 +35,76 @@ class IncrementalFileStreamS3(IncrementalFileStream):
         else:
             session = boto3session.Session()
             client_config = Config(signature_version=UNSIGNED)
-        client = make_s3_client(provider, config=client_config, session=session)
+        return make_s3_client(provider, config=client_config, session=session)
 
+    def _list_objects(self, client, prefix: str, delimiter: str = None) -> Iterator[Tuple[str, Mapping[str, Any]]]:
+        """
+        Wrapper for boto3's list_objects_v2 so we can handle pagination
+
+        :param client: boto3 s3 client, unlike sessions clients are thread-safe so it can be shared between threads
+        :param prefix: only list keys starting with this prefix
+        :param delimiter: if passed, keys containing the delimiter after the prefix are rolled up into "common prefixes" rather than listed
+        :yield: tuples of ("object", object metadata as returned by S3, i.e. Key, LastModified, ETag, Size...)
+            and ("prefix", {"Prefix": common prefix}) if delimiter is passed
+        """
         ctoken = None
         while True:
-            # list_objects_v2 doesn't like a None value for ContinuationToken
-            # so we don't set it if we don't have one.
+            kwargs = dict(Bucket=self._provider["bucket"], Prefix=prefix)
+            # list_objects_v2 doesn't like a None value for ContinuationToken or Delimiter
+            # so we don't set them if we don't have one.
             if ctoken:
-                kwargs = dict(Bucket=provider["bucket"], Prefix=provider.get("path_prefix", ""), ContinuationToken=ctoken)
-            else:
-                kwargs = dict(Bucket=provider["bucket"], Prefix=provider.get("path_prefix", ""))
+                kwargs["ContinuationToken"] = ctoken
+            if delimiter:
+                kwargs["Delimiter"] = delimiter
             response = client.list_objects_v2(**kwargs)
-            try:
-                content = response["Contents"]
-            except KeyError:
-                pass
-            else:
-                for c in content:
-                    key = c["Key"]
-                    if accept_key(key):
-                        yield key
+            for c in response.get("Contents", []):
+                yield "object", c
+            for p in response.get("CommonPrefixes", []):
+                yield "prefix", p
             ctoken = response.get("NextContinuationToken", None)
             if not ctoken:
                 break
 
+    def _list_bucket_objects(self, accept_key=lambda k: True) -> Iterator[Mapping[str, Any]]:
+        """
+        Lists all objects under path_prefix with their metadata.
+        The first level of "folders" under path_prefix is listed with a delimiter, then each of these prefixes is listed in parallel,
+        which is much faster than a single sequential listing for large buckets with partitioned keys (e.g. one folder per day).
+
+        :param accept_key: lambda function to allow filtering return keys, e.g. lambda k: not k.endswith('/'), defaults to lambda k: True
+        :yield: metadata of each object as returned by S3, in no particular order
+        """
+        client = self._make_client()
+        prefix = self._provider.get("path_prefix") or ""
+
+        prefixes = []
+        for kind, item in self._list_objects(client, prefix, delimiter="/"):
+            if kind == "prefix":
+                prefixes.append(item["Prefix"])
+            elif accept_key(item["Key"]):
+                yield item
+
+        def list_prefix(sub_prefix: str) -> List[Mapping[str, Any]]:
+            return [item for _, item in self._list_objects(client, sub_prefix) if accept_key(item["Key"])]
+
+        if len(prefixes) <= 1 or self.max_concurrent_listings <= 1:
+            for sub_prefix in prefixes:
+                yield from list_prefix(sub_prefix)
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrent_listings, len(prefixes))) as executor:
+                for items in executor.map(list_prefix, prefixes):
+                    yield from items
+
+    def _list_bucket(self, accept_key=lambda k: True) -> Iterator[str]:
+        """
+        See _list_bucket_objects() for logic of interacting with S3
+
+        :param accept_key: lambda function to allow filtering return keys, e.g. lambda k: not k.endswith('/'), defaults to lambda k: True
+        :yield: key (name) of each object
+        """
+        for c in self._list_bucket_objects(accept_key=accept_key):
+            yield c["Key"]
+
     def filepath_iterator(self) -> Iterator[str]:
         """
         See _list_bucket() for logic of interacting with S3
@@ -75,3 +120,15 @@ class IncrementalFileStreamS3(IncrementalFileStream):
 
         for blob in self._list_bucket(accept_key=lambda k: not k.endswith("/")):  # filter out 'folders', we just want actual blobs
             yield blob
+
+    def last_modified_iterator(self) -> Iterator[Tuple[datetime, str]]:
+        """
+        list_objects_v2 already returns LastModified for each object, so unlike the default implementation this needs no extra request per file
+
+        :yield: tuple of (last_modified, filepath) for every file matching user-provided path patterns
+        """
+        self.logger.info(f"Iterating S3 bucket '{self._provider['bucket']}' with prefix: '{self._provider.get('path_prefix') or ''}'")
+        # filter out 'folders', we just want actual blobs
+        last_modified = {c["Key"]: c["LastModified"] for c in self._list_bucket_objects(accept_key=lambda k: not k.endswith("/"))}
+        for filepath in self.pattern_matched_filepath_iterator(last_modified):
+            yield last_modified[filepath], filepath
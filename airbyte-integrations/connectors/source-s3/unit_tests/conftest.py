@@ -0,0 +1,11 @@
+#
+# Copyright (c) 2021 Airbyte, Inc., all rights reserved.
+#
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def schema_cache_dir(tmp_path, monkeypatch):
+    """Keeps the schemas cached by the streams under test out of the system temporary directory"""
+    monkeypatch.setenv("AIRBYTE_SCHEMA_CACHE_DIR", str(tmp_path))
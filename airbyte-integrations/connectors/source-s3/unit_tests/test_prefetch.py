@@ -0,0 +1,87 @@
+#
+# Copyright (c) 2021 Airbyte, Inc., all rights reserved.
+#
+
+import threading
+import time
+
+import pytest
+from source_s3.source_files_abstract.prefetch import prefetch_in_order
+
+
+def slow_producer(name: str, count: int, delay: float = 0):
+    def produce():
+        for i in range(count):
+            time.sleep(delay)
+            yield f"{name}{i}"
+
+    return produce
+
+
+@pytest.mark.parametrize("max_workers, buffer_size", [(1, 1), (2, 1), (4, 3), (10, 100)])
+def test_prefetch_in_order_keeps_producer_order(max_workers, buffer_size):
+    # earlier producers are the slowest ones so they would finish last if items were yielded as they come
+    producers = [slow_producer(name, 5, delay) for name, delay in [("a", 0.02), ("b", 0.01), ("c", 0), ("d", 0)]]
+
+    items = list(prefetch_in_order(producers, max_workers=max_workers, buffer_size=buffer_size))
+
+    assert items == [f"{name}{i}" for name in "abcd" for i in range(5)]
+
+
+def test_prefetch_in_order_runs_producers_ahead():
+    running = set()
+    max_running = []
+    lock = threading.Lock()
+
+    def producer(name: str):
+        def produce():
+            with lock:
+                running.add(name)
+                max_running.append(len(running))
+            time.sleep(0.05)
+            yield name
+            with lock:
+                running.remove(name)
+
+        return produce
+
+    start = time.monotonic()
+    items = list(prefetch_in_order([producer(str(i)) for i in range(8)], max_workers=4, buffer_size=10))
+
+    assert items == [str(i) for i in range(8)]
+    assert max(max_running) == 4
+    # 8 producers of 50ms, 4 at a time
+    assert time.monotonic() - start < 0.3
+
+
+def test_prefetch_in_order_raises_producer_error_in_order():
+    def failing():
+        yield "b0"
+        raise ValueError("broken file")
+
+    items = []
+    with pytest.raises(ValueError, match="broken file"):
+        for item in prefetch_in_order([slow_producer("a", 3, 0.01), failing, slow_producer("c", 3)], max_workers=3, buffer_size=10):
+            items.append(item)
+
+    assert items == ["a0", "a1", "a2", "b0"]
+
+
+def test_prefetch_in_order_stops_workers_when_closed_early():
+    produced = []
+
+    def endless():
+        i = 0
+        while True:
+            produced.append(i)
+            yield i
+            i += 1
+
+    items = prefetch_in_order([endless, endless], max_workers=2, buffer_size=2)
+    assert next(items) == 0
+    items.close()
+
+    # workers are blocked on their full buffers and stop as soon as the reader goes away
+    count = len(produced)
+    time.sleep(0.3)
+    assert len(produced) == count
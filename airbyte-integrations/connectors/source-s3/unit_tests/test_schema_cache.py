@@ -0,0 +1,61 @@
+#
+# Copyright (c) 2021 Airbyte, Inc., all rights reserved.
+#
+
+import json
+
+from source_s3.source_files_abstract.schema_cache import SchemaCache
+
+
+def test_get_matches_version(tmp_path):
+    cache = SchemaCache(str(tmp_path / "cache.json"))
+    cache.set("folder/file.csv", "2021-07-25T00:00:00+00:00", {"id": "integer"})
+
+    assert cache.get("folder/file.csv", "2021-07-25T00:00:00+00:00") == {"id": "integer"}
+    assert cache.get("folder/file.csv", "2021-07-26T00:00:00+00:00") is None
+    assert cache.get("folder/other_file.csv", "2021-07-25T00:00:00+00:00") is None
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / "nested" / "cache.json")
+    cache = SchemaCache(path)
+    cache.set("a.csv", "v1", {"id": "integer"})
+    cache.set("b.csv", "v1", {"name": "string"})
+    cache.save()
+
+    loaded = SchemaCache(path)
+    assert loaded.get("a.csv", "v1") == {"id": "integer"}
+    assert loaded.get("b.csv", "v1") == {"name": "string"}
+    assert list(tmp_path.joinpath("nested").iterdir()) == [tmp_path / "nested" / "cache.json"]
+
+
+def test_retain_removes_deleted_files(tmp_path):
+    path = str(tmp_path / "cache.json")
+    cache = SchemaCache(path)
+    cache.set("a.csv", "v1", {"id": "integer"})
+    cache.set("b.csv", "v1", {"name": "string"})
+    cache.retain(["b.csv"])
+    cache.save()
+
+    assert json.loads((tmp_path / "cache.json").read_text()) == {"b.csv": {"version": "v1", "schema": {"name": "string"}}}
+
+
+def test_unreadable_cache_is_ignored(tmp_path):
+    path = tmp_path / "cache.json"
+    path.write_text("{not json")
+
+    cache = SchemaCache(str(path))
+    assert cache.get("a.csv", "v1") is None
+    cache.set("a.csv", "v1", {"id": "integer"})
+    cache.save()
+
+    assert SchemaCache(str(path)).get("a.csv", "v1") == {"id": "integer"}
+
+
+def test_in_memory_cache(tmp_path):
+    cache = SchemaCache()
+    cache.set("a.csv", "v1", {"id": "integer"})
+    cache.save()
+
+    assert cache.get("a.csv", "v1") == {"id": "integer"}
+    assert list(tmp_path.iterdir()) == []
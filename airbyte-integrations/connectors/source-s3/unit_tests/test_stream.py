@@ -2,16 +2,34 @@
 # Copyright (c) 2021 Airbyte, Inc., all rights reserved.
 #
 
-from unittest.mock import patch
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Mapping
+from unittest.mock import MagicMock, PropertyMock, patch
 
+import pyarrow as pa
 import pytest
 from airbyte_cdk import AirbyteLogger
+from smart_open import open as smart_open
+from source_s3.source_files_abstract.formats.abstract_file_parser import AbstractFileParser
+from source_s3.source_files_abstract.formats.csv_parser import CsvParser
 from source_s3.source_files_abstract.stream import FileStream
 
 LOGGER = AirbyteLogger()
+SAMPLE_DIRECTORY = Path(__file__).resolve().parent.joinpath("sample_files/")
 
 
 class TestFileStream:
+    @staticmethod
+    def _to_batch(record: Mapping[str, Any]) -> pa.RecordBatch:
+        return pa.Table.from_pydict({column: [value] for column, value in record.items()}).to_batches()[0]
+
+    @staticmethod
+    def _to_record(batch: pa.RecordBatch) -> Mapping[str, Any]:
+        (record,) = AbstractFileParser.batch_to_records(batch)
+        return record
+
     @pytest.mark.parametrize(  # set return_schema to None for an expected fail
         "schema_string, return_schema",
         [
@@ -95,10 +113,10 @@ class TestFileStream:
     def test_match_target_schema(self, target_columns, record, expected_return_record):
         fs = FileStream(dataset="dummy", provider={}, format={}, path_pattern=[])
         if expected_return_record is not None:
-            assert fs._match_target_schema(record, target_columns) == expected_return_record
+            assert self._to_record(fs._match_target_schema(self._to_batch(record), target_columns)) == expected_return_record
         else:
             with pytest.raises(Exception) as e_info:
-                fs._match_target_schema(record, target_columns)
+                fs._match_target_schema(self._to_batch(record), target_columns)
                 LOGGER.debug(str(e_info))
 
     @pytest.mark.parametrize(  # set expected_return_record to None for an expected fail
@@ -127,12 +145,110 @@ class TestFileStream:
     def test_add_extra_fields_from_map(self, extra_map, record, expected_return_record):
         fs = FileStream(dataset="dummy", provider={}, format={}, path_pattern=[])
         if expected_return_record is not None:
-            assert fs._add_extra_fields_from_map(record, extra_map) == expected_return_record
+            assert self._to_record(fs._add_extra_fields_from_map(self._to_batch(record), extra_map)) == expected_return_record
         else:
             with pytest.raises(Exception) as e_info:
-                fs._add_extra_fields_from_map(record, extra_map)
+                fs._add_extra_fields_from_map(self._to_batch(record), extra_map)
                 LOGGER.debug(str(e_info))
 
+    @patch(
+        "source_s3.source_files_abstract.stream.FileStream.__abstractmethods__", set()
+    )  # patching abstractmethods to empty set so we can instantiate ABC to test
+    def test_read_from_slice(self):
+        fs = FileStream(
+            dataset="dummy",
+            provider={},
+            format={"filetype": "csv"},
+            path_pattern="**",
+            schema='{"id": "integer", "name": "string", "friends": "integer"}',
+        )
+        storagefile = MagicMock()
+        storagefile.open.side_effect = lambda binary: smart_open(os.path.join(SAMPLE_DIRECTORY, "csv/test_file_1.csv"), "rb")
+        stream_slice = [
+            {"unique_url": "test_file_1.csv", "last_modified": datetime(2021, 7, 25, tzinfo=timezone.utc), "storagefile": storagefile}
+        ]
+        # the master schema also holds the columns inferred from the file, on top of the provided ones
+        file_reader = CsvParser({"filetype": "csv"}, {**fs._get_schema_map(), "birthday": "string", "last_seen": "string"})
+
+        records = list(fs._read_from_slice(file_reader, stream_slice))
+
+        assert len(records) == 8
+        assert records[0] == {
+            "id": 1,
+            "name": "PVdhmjb1",
+            "friends": None,
+            "_ab_additional_properties": {
+                "valid": False,
+                "code": 12,
+                "degrees": -31.3,
+                "birthday": "2021-07-14",
+                "last_seen": "2021-07-14 15:30:09.224125",
+            },
+            "_ab_source_file_last_modified": "2021-07-25T00:00:00+0000",
+            "_ab_source_file_url": "test_file_1.csv",
+        }
+
+    @patch(
+        "source_s3.source_files_abstract.stream.FileStream.__abstractmethods__", set()
+    )  # patching abstractmethods to empty set so we can instantiate ABC to test
+    def test_read_from_slice_keeps_file_order(self):
+        fs = FileStream(dataset="dummy", provider={}, format={"filetype": "csv"}, path_pattern="**")
+        stream_slice = []
+        for i in range(20):
+            storagefile = MagicMock()
+            storagefile.open.side_effect = lambda binary: smart_open(os.path.join(SAMPLE_DIRECTORY, "csv/test_file_1.csv"), "rb")
+            stream_slice.append({"unique_url": f"file_{i}.csv", "last_modified": datetime(2021, 7, 25, i), "storagefile": storagefile})
+        fs.master_schema = {"id": "integer", "name": "string", "valid": "boolean", "code": "integer", "degrees": "number"}
+        file_reader = CsvParser({"filetype": "csv"}, fs._get_master_schema())
+
+        records = list(fs._read_from_slice(file_reader, stream_slice))
+
+        assert [(record["_ab_source_file_url"], record["id"]) for record in records] == [
+            (f"file_{i}.csv", record_id) for i in range(20) for record_id in range(1, 9)
+        ]
+
+    @patch(
+        "source_s3.source_files_abstract.stream.FileStream.__abstractmethods__", set()
+    )  # patching abstractmethods to empty set so we can instantiate ABC to test
+    def test_get_master_schema_uses_schema_cache(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("AIRBYTE_SCHEMA_CACHE_DIR", str(tmp_path / "schema_cache"))
+        opened = []
+
+        def storagefile_class(filepath, provider):
+            storagefile = MagicMock()
+            storagefile.open.side_effect = lambda binary: opened.append(filepath) or smart_open(filepath, "rb")
+            return storagefile
+
+        def make_stream(filepaths):
+            fs = FileStream(dataset="dummy", provider={"bucket": "test"}, format={"filetype": "csv"}, path_pattern="**")
+            fs.get_time_ordered_filepaths = lambda: [(datetime(2021, 7, 25, i), filepath) for i, filepath in enumerate(filepaths)]
+            return fs
+
+        file_1 = os.path.join(SAMPLE_DIRECTORY, "csv/test_file_1.csv")
+        file_2 = str(tmp_path / "file_2.csv")
+        with open(file_2, "w") as f:
+            f.write("id,name\n9,Gandalf\n")
+        with patch.object(FileStream, "storagefile_class", new_callable=PropertyMock, return_value=storagefile_class):
+            first_schema = make_stream([file_1])._get_master_schema()
+            assert opened == [file_1]
+
+            # a new run only opens the new file
+            assert make_stream([file_1, file_2])._get_master_schema() == first_schema
+            assert opened == [file_1, file_2]
+            assert make_stream([file_1, file_2])._get_master_schema() == first_schema
+            assert opened == [file_1, file_2]
+        assert len(os.listdir(tmp_path / "schema_cache")) == 1
+
+        assert first_schema == {
+            "id": "integer",
+            "name": "string",
+            "valid": "boolean",
+            "code": "integer",
+            "degrees": "number",
+            "birthday": "string",
+            "last_seen": "string",
+        }
+
     @pytest.mark.parametrize(  #
         "patterns, filepaths, expected_filepaths",
         [
@@ -0,0 +1,84 @@
+#
+# Copyright (c) 2021 Airbyte, Inc., all rights reserved.
+#
+
+from datetime import datetime, timezone
+from typing import Any, List, Mapping
+from unittest.mock import MagicMock, PropertyMock, patch
+
+import pytest
+from source_s3.s3file import S3File
+from source_s3.stream import IncrementalFileStreamS3
+
+KEYS = {
+    "top.csv": 5,
+    "folder/": 7,
+    "2021-07-01/a.csv": 3,
+    "2021-07-01/b.csv": 1,
+    "2021-07-01/sub/c.csv": 4,
+    "2021-07-02/a.csv": 2,
+    "2021-07-02/notes.txt": 6,
+}
+
+
+def list_objects_v2(Bucket: str, Prefix: str, Delimiter: str = None, ContinuationToken: str = None) -> Mapping[str, Any]:
+    """ fake list_objects_v2 paginating 2 entries at a time """
+    contents, prefixes = [], []
+    for key, day in sorted(KEYS.items()):
+        if not key.startswith(Prefix):
+            continue
+        if Delimiter and Delimiter in key[len(Prefix) :]:
+            common_prefix = Prefix + key[len(Prefix) :].split(Delimiter)[0] + Delimiter
+            if common_prefix not in prefixes:
+                prefixes.append(common_prefix)
+        else:
+            contents.append({"Key": key, "LastModified": datetime(2021, 7, day, tzinfo=timezone.utc), "ETag": "etag", "Size": 10})
+    entries = [("Contents", c) for c in contents] + [("CommonPrefixes", {"Prefix": p}) for p in prefixes]
+    start = int(ContinuationToken or 0)
+    response = {}
+    for name, entry in entries[start : start + 2]:
+        response.setdefault(name, []).append(entry)
+    if start + 2 < len(entries):
+        response["NextContinuationToken"] = str(start + 2)
+    return response
+
+
+def make_stream(path_pattern: str, max_concurrent_listings: int) -> IncrementalFileStreamS3:
+    stream = IncrementalFileStreamS3(dataset="dummy", provider={"bucket": "test", "path_prefix": ""}, format={}, path_pattern=path_pattern)
+    stream.max_concurrent_listings = max_concurrent_listings
+    return stream
+
+
+@pytest.fixture
+def client():
+    client = MagicMock()
+    client.list_objects_v2.side_effect = list_objects_v2
+    with patch.object(IncrementalFileStreamS3, "_make_client", return_value=client):
+        yield client
+
+
+@pytest.mark.parametrize("max_concurrent_listings", [1, 16])
+def test_filepath_iterator_lists_all_prefixes(client, max_concurrent_listings: int):
+    filepaths = list(make_stream("**", max_concurrent_listings).filepath_iterator())
+
+    assert sorted(filepaths) == sorted(key for key in KEYS if not key.endswith("/"))
+
+
+@pytest.mark.parametrize(
+    "path_pattern, expected_filepaths",
+    [
+        ("**", ["2021-07-01/b.csv", "2021-07-02/a.csv", "2021-07-01/a.csv", "2021-07-01/sub/c.csv", "top.csv", "2021-07-02/notes.txt"]),
+        ("**/*.csv", ["2021-07-01/b.csv", "2021-07-02/a.csv", "2021-07-01/a.csv", "2021-07-01/sub/c.csv", "top.csv"]),
+        ("2021-07-01/*.csv", ["2021-07-01/b.csv", "2021-07-01/a.csv"]),
+    ],
+)
+def test_get_time_ordered_filepaths_uses_listing_metadata(client, path_pattern: str, expected_filepaths: List[str]):
+    with patch.object(S3File, "last_modified", new_callable=PropertyMock, side_effect=AssertionError("no request per file expected")):
+        ordered = make_stream(path_pattern, 16).get_time_ordered_filepaths()
+
+    assert [filepath for _, filepath in ordered] == expected_filepaths
+    assert [last_mod for last_mod, _ in ordered] == [
+        datetime(2021, 7, KEYS[filepath], tzinfo=timezone.utc) for filepath in expected_filepaths
+    ]
+    # one delimited listing of the root and one listing per first level prefix, i.e. no HEAD request
+    assert {call.kwargs["Prefix"] for call in client.list_objects_v2.call_args_list} == {"", "2021-07-01/", "2021-07-02/", "folder/"}
@@ -5,10 +5,11 @@
 
 from setuptools import find_packages, setup
 
-MAIN_REQUIREMENTS = ["airbyte-cdk", "vcrpy==4.1.1"]
+MAIN_REQUIREMENTS = ["airbyte-cdk~=0.1.43", "vcrpy==4.1.1"]
 
 TEST_REQUIREMENTS = [
     "pytest~=6.1",
+    "requests-mock~=1.9.3",
     "source-acceptance-test",
 ]
 
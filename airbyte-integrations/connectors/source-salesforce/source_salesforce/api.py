@@ -2,10 +2,18 @@
 # Copyright (c) 2021 Airbyte, Inc., all rights reserved.
 #
 
-from typing import Any, List, Mapping, Optional, Tuple
+import hashlib
+import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
 import requests
+from airbyte_cdk.logger import AirbyteLogger
 from airbyte_cdk.models import ConfiguredAirbyteCatalog
+from airbyte_cdk.sources.utils.schema_helpers import get_schema_cache_dir
+from requests.adapters import HTTPAdapter
 
 from .exceptions import TypeSalesforceException
 from .rate_limiting import default_backoff_handler
@@ -167,8 +175,14 @@ UNSUPPORTED_FILTERING_STREAMS = [
 ]
 
 
+logger = AirbyteLogger()
+
+
 class Salesforce:
     version = "v52.0"
+    # describe sub-requests sent in a single Composite API request, the maximum allowed by Salesforce
+    describe_batch_size = 25
+    max_concurrent_describes = 4
 
     def __init__(
         self,
@@ -187,9 +201,16 @@ class Salesforce:
         self.client_secret = client_secret
         self.access_token = None
         self.instance_url = None
+        # identity URL of the authenticated user, the fields returned by describes depend on their field-level security
+        self.user_id = None
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=self.max_concurrent_describes)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.is_sandbox = is_sandbox is True or (isinstance(is_sandbox, str) and is_sandbox.lower() == "true")
         self.start_date = start_date
+        # describes of the objects are kept there, and only requested again once the objects are modified
+        self.schema_cache_dir = os.path.join(get_schema_cache_dir(), "source_salesforce_schemas")
 
     def _get_standard_headers(self):
         return {"Authorization": "Bearer {}".format(self.access_token)}
@@ -248,6 +269,7 @@ class Salesforce:
         auth = resp.json()
         self.access_token = auth["access_token"]
         self.instance_url = auth["instance_url"]
+        self.user_id = auth.get("id")
 
     def describe(self, sobject: str = None) -> Mapping[str, Any]:
         """Describes all objects or a specific object"""
@@ -259,12 +281,93 @@ class Salesforce:
 
         return resp.json()
 
+    def _describe_batch(self, sobjects: List[str], cache: Mapping[str, Any]) -> Dict[str, Mapping[str, Any]]:
+        """
+        Describes objects in a single Composite API request, objects which weren't modified since they were cached aren't described again
+        :return: cache entries of the described objects, {"last_modified": <Last-Modified header>, "fields": [{"name": .., "type": ..}]}
+        """
+        headers = {**self._get_standard_headers(), "Content-Type": "application/json"}
+        url = f"{self.instance_url}/services/data/{self.version}/composite"
+        requests_body = []
+        for number, sobject in enumerate(sobjects):
+            request = {
+                "method": "GET",
+                "url": f"/services/data/{self.version}/sobjects/{sobject}/describe",
+                "referenceId": f"describe{number}",
+            }
+            last_modified = cache.get(sobject, {}).get("last_modified")
+            if last_modified:
+                request["httpHeaders"] = {"If-Modified-Since": last_modified}
+            requests_body.append(request)
+        resp = self._make_request("POST", url, headers=headers, body=json.dumps({"allOrNone": False, "compositeRequest": requests_body}))
+
+        entries = {}
+        for number, (sobject, response) in enumerate(zip(sobjects, resp.json()["compositeResponse"])):
+            status_code = response["httpStatusCode"]
+            if status_code == requests.codes.not_modified:
+                continue
+            if status_code == requests.codes.ok:
+                describe, last_modified = response["body"], response.get("httpHeaders", {}).get("Last-Modified")
+            else:
+                # let the regular request handle the error, e.g: retry once the API limit is reset
+                logger.info(f"Describing {sobject} within a Composite API request failed with {status_code}, describing it alone")
+                describe, last_modified = self.describe(sobject), None
+            entries[sobject] = {
+                "last_modified": last_modified,
+                "fields": [{"name": f["name"], "type": f["type"]} for f in describe["fields"]],
+            }
+        return entries
+
+    def _schema_cache_path(self) -> str:
+        # describes are specific to the user since fields they can't see are left out, e.g: a 304 for another user must not reuse them
+        cache_key = hashlib.sha256(f"{self.instance_url}/{self.version}/{self.user_id}".encode("utf-8")).hexdigest()
+        return os.path.join(self.schema_cache_dir, f"{cache_key}.json")
+
+    def _load_schema_cache(self) -> Dict[str, Any]:
+        try:
+            with open(self._schema_cache_path()) as cache_file:
+                return json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_schema_cache(self, cache: Mapping[str, Any]):
+        path = self._schema_cache_path()
+        try:
+            os.makedirs(self.schema_cache_dir, exist_ok=True)
+            # a file of its own so that concurrent runs can't write to the same temporary file
+            with tempfile.NamedTemporaryFile("w", dir=self.schema_cache_dir, suffix=".tmp", delete=False) as cache_file:
+                json.dump(cache, cache_file)
+            os.replace(cache_file.name, path)
+        except OSError as e:
+            logger.info(f"Cannot save the schema cache to {path}: {e}")
+
+    def generate_schemas(self, stream_names: List[str]) -> Mapping[str, Mapping[str, Any]]:
+        """
+        Describes the objects concurrently, in batches of `describe_batch_size` objects, reusing cached describes of unmodified objects
+        :return: JSON schema of every object
+        """
+        cache = self._load_schema_cache()
+        batches = [stream_names[i : i + self.describe_batch_size] for i in range(0, len(stream_names), self.describe_batch_size)]
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_describes) as executor:
+            for entries in executor.map(lambda batch: self._describe_batch(batch, cache), batches):
+                cache.update(entries)
+        self._save_schema_cache(cache)
+
+        schemas = {}
+        for stream_name in stream_names:
+            schema = {
+                "$schema": "http://json-schema.org/draft-07/schema#",
+                "type": "object",
+                "additionalProperties": True,
+                "properties": {},
+            }
+            for field in cache[stream_name]["fields"]:
+                schema["properties"][field["name"]] = self.field_to_property_schema(field)
+            schemas[stream_name] = schema
+        return schemas
+
     def generate_schema(self, stream_name: str) -> Mapping[str, Any]:
-        schema = {"$schema": "http://json-schema.org/draft-07/schema#", "type": "object", "additionalProperties": True, "properties": {}}
-        response = self.describe(stream_name)
-        for field in response["fields"]:
-            schema["properties"][field["name"]] = self.field_to_property_schema(field)
-        return schema
+        return self.generate_schemas([stream_name])[stream_name]
 
     @staticmethod
     def get_pk_and_replication_key(json_schema: Mapping[str, Any]) -> Tuple[Optional[str], Optional[str]]:
@@ -38,8 +38,9 @@ class SourceSalesforce(AbstractSource):
             full_refresh, incremental = BulkSalesforceStream, BulkIncrementalSalesforceStream
 
         streams = []
+        schemas = sf.generate_schemas(stream_names)
         for stream_name in stream_names:
-            json_schema = sf.generate_schema(stream_name)
+            json_schema = schemas[stream_name]
             pk, replication_key = sf.get_pk_and_replication_key(json_schema)
             streams_kwargs = dict(sf_api=sf, pk=pk, stream_name=stream_name, schema=json_schema, authenticator=authenticator)
             if replication_key and stream_name not in UNSUPPORTED_FILTERING_STREAMS:
@@ -3,10 +3,13 @@
 #
 
 import csv
+import io
 import json
-import time
+import tempfile
+import threading
 from abc import ABC
-from typing import Any, Iterable, List, Mapping, MutableMapping, Optional, Tuple, Union
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import IO, Any, Callable, Iterable, Iterator, List, Mapping, MutableMapping, NamedTuple, Optional, Tuple, Union
 
 import pendulum
 import requests
@@ -94,19 +97,33 @@ class SalesforceStream(HttpStream, ABC):
                 raise error
 
 
+class ResultsPage(NamedTuple):
+    """
+    Page of the results of a job, downloaded to a temporary file
+    """
+
+    file: IO[bytes]
+    # download of the next page, None for the last page
+    next_page: Optional[Future]
+
+
 class BulkSalesforceStream(SalesforceStream):
 
     page_size = 30000
     JOB_WAIT_TIMEOUT_MINS = 10
     CHECK_INTERVAL_SECONDS = 2
+    # maximum number of records of a page of job results
+    results_page_size = 10000
+    # pages of job results are downloaded to temporary files while the previous pages are read
+    max_concurrent_page_downloads = 4
 
     def path(self, **kwargs) -> str:
         return f"/services/data/{self.sf_api.version}/jobs/query"
 
     @default_backoff_handler(max_tries=5, factor=15)
-    def _send_http_request(self, method: str, url: str, json: dict = None):
+    def _send_http_request(self, method: str, url: str, json: dict = None, params: dict = None, stream: bool = False):
         headers = self.authenticator.get_auth_header()
-        response = self._session.request(method, url=url, headers=headers, json=json)
+        response = self._session.request(method, url=url, headers=headers, json=json, params=params, stream=stream)
         response.raise_for_status()
         return response
 
@@ -131,7 +148,11 @@ class BulkSalesforceStream(SalesforceStream):
             else:
                 raise error
 
-    def wait_for_job(self, url: str) -> str:
+    def wait_for_job(self, url: str, stopped: threading.Event = None) -> str:
+        """
+        :param stopped: stops waiting as soon as it is set, the state of the job at that point is returned
+        """
+        stopped = stopped or threading.Event()
         start_time = pendulum.now()
         while True:
             job_info = self._send_http_request("GET", url=url)
@@ -145,17 +166,89 @@ class BulkSalesforceStream(SalesforceStream):
                 return job_status
 
             self.logger.info(f"Sleeping {self.CHECK_INTERVAL_SECONDS} seconds while waiting for Job: {job_id} to complete")
-            time.sleep(self.CHECK_INTERVAL_SECONDS)
-
-    def download_data(self, url: str) -> Tuple[int, dict]:
-        job_data = self._send_http_request("GET", f"{url}/results")
-        decoded_content = job_data.content.decode("utf-8")
-        csv_data = csv.reader(decoded_content.splitlines(), delimiter=",")
-        for i, row in enumerate(csv_data):
-            if i == 0:
-                head = row
-            else:
-                yield i, dict(zip(head, row))
+            if stopped.wait(self.CHECK_INTERVAL_SECONDS):
+                return job_status
+
+    @staticmethod
+    def _read_csv(file: IO[bytes]) -> Iterator[dict]:
+        file.seek(0)
+        text = io.TextIOWrapper(file, encoding="utf-8", newline="")
+        try:
+            yield from csv.DictReader(text, delimiter=",")
+        finally:
+            # leave the file open, it is closed by its owner
+            text.detach()
+
+    def _download_results_page(
+        self,
+        executor: ThreadPoolExecutor,
+        url: str,
+        locator: Optional[str],
+        stopped: threading.Event,
+        records_before: Optional[int] = 0,
+        on_last_record: Callable[[int, dict], None] = None,
+    ) -> ResultsPage:
+        """
+        Downloads a page of the results of a job to a temporary file. The download of the next page is started as soon as the headers
+        of this one, which hold its locator and number of records, are received.
+        :param records_before: number of records of the previous pages, None if unknown
+        """
+        params = {"maxRecords": self.results_page_size}
+        if locator:
+            params["locator"] = locator
+        response = self._send_http_request("GET", f"{url}/results", params=params, stream=True)
+        next_locator = response.headers.get("Sforce-Locator")
+        number_of_records = response.headers.get("Sforce-NumberOfRecords")
+        is_last_page = not next_locator or next_locator == "null"
+        next_page = None
+        if not is_last_page and not stopped.is_set():
+            records = None
+            if records_before is not None and number_of_records is not None:
+                records = records_before + int(number_of_records)
+            next_page = executor.submit(self._download_results_page, executor, url, next_locator, stopped, records, on_last_record)
+
+        file = tempfile.TemporaryFile()
+        try:
+            for chunk in response.iter_content(chunk_size=1024 * 1024):
+                file.write(chunk)
+        except Exception:
+            file.close()
+            raise
+        finally:
+            response.close()
+
+        # without the number of records of the previous pages, the total number of records can't be known in advance
+        if is_last_page and on_last_record and records_before is not None:
+            count, last_record = records_before, None
+            for last_record in self._read_csv(file):
+                count += 1
+            if last_record is not None:
+                on_last_record(count, last_record)
+        return ResultsPage(file=file, next_page=next_page)
+
+    def download_data(self, url: str, on_last_record: Callable[[int, dict], None] = None) -> Iterable[Tuple[int, dict]]:
+        """
+        Reads the results of a job page by page, following the Sforce-Locator header of each page. Pages are downloaded to temporary files
+        in the background while the previous ones are read, so memory usage doesn't depend on the size of the results.
+        :param on_last_record: called with the number of records and the last record of the results as soon as the last page is
+        downloaded, before the records of the previous pages are all read
+        :return: iterator of the records of the results with their position, starting at 1
+        """
+        stopped = threading.Event()
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_page_downloads) as executor:
+            next_page = executor.submit(self._download_results_page, executor, url, None, stopped, 0, on_last_record)
+            try:
+                i = 0
+                while next_page:
+                    page = next_page.result()
+                    next_page = page.next_page
+                    with page.file:
+                        for record in self._read_csv(page.file):
+                            i += 1
+                            yield i, record
+            finally:
+                # don't start the downloads of the next pages if the records are not all read
+                stopped.set()
 
     def abort_job(self, url: str):
         data = {"state": "Aborted"}
@@ -221,39 +314,80 @@ class BulkSalesforceStream(SalesforceStream):
         stream_slice: Mapping[str, Any] = None,
         stream_state: Mapping[str, Any] = None,
     ) -> Iterable[Mapping[str, Any]]:
+        """
+        Reads the records page by page, one job per page. Jobs are pipelined: as soon as the last record of a job is downloaded, the job
+        of the next page is created and waited for in the background while the records of the current job are read.
+        """
         stream_state = stream_state or {}
-        pagination_complete = False
-        next_page_token = None
+        # set once the records are not read anymore, so that a job created in advance is discarded without waiting for it to complete
+        stopped = threading.Event()
 
-        while not pagination_complete:
+        def run_job(next_page_token: Optional[str]) -> Optional[Tuple[str, str]]:
+            if stopped.is_set():
+                return None
             params = self.request_params(stream_state=stream_state, stream_slice=stream_slice, next_page_token=next_page_token)
             path = self.path(stream_state=stream_state, stream_slice=stream_slice, next_page_token=next_page_token)
-            full_url = f"{self.url_base}/{path}"
             job_id = self.create_stream_job(query=params["q"], url=path)
             if not job_id:
-                return
-            job_full_url = f"{full_url}/{job_id}"
-            job_status = self.wait_for_job(url=job_full_url)
-            if job_status == "JobComplete":
-                count = 0
-                for count, record in self.download_data(url=job_full_url):
-                    yield self.transform(record)
-
-                if count == self.page_size:
-                    next_page_token = self.next_page_token(record)
-                    if not next_page_token:
-                        pagination_complete = True
-                else:
-                    pagination_complete = True
-
-            if job_status in ["UploadComplete", "InProgress"]:
-                self.abort_job(url=job_full_url)
-                job_status = "Aborted"
-
-            if job_status in ["JobComplete", "Aborted", "Failed"]:
+                return None
+            job_full_url = f"{self.url_base}/{path}/{job_id}"
+            return job_full_url, self.wait_for_job(url=job_full_url, stopped=stopped)
+
+        with ThreadPoolExecutor(max_workers=1) as job_executor:
+            job = run_job(next_page_token=None)
+            next_job: Optional[Future] = None
+            try:
+                while job:
+                    job_full_url, job_status = job
+                    next_job = None
+                    if job_status == "JobComplete":
+
+                        def start_next_job(count: int, last_record: dict):
+                            nonlocal next_job
+                            if count == self.page_size:
+                                next_page_token = self.next_page_token(last_record)
+                                if next_page_token:
+                                    next_job = job_executor.submit(run_job, next_page_token)
+
+                        count, record = 0, None
+                        for count, record in self.download_data(url=job_full_url, on_last_record=start_next_job):
+                            yield self.transform(record)
+                        if not next_job and count == self.page_size:
+                            # the last record wasn't known before all the records were read
+                            next_page_token = self.next_page_token(record)
+                            if next_page_token:
+                                next_job = job_executor.submit(run_job, next_page_token)
+
+                    if job_status in ["UploadComplete", "InProgress"]:
+                        self.abort_job(url=job_full_url)
+                        job_status = "Aborted"
+
+                    if job_status in ["JobComplete", "Aborted", "Failed"]:
+                        self.delete_job(url=job_full_url)
+                        if job_status in ["Aborted", "Failed"]:
+                            raise Exception(f"Job for {self.name} stream using BULK API was failed")
+
+                    job = next_job.result() if next_job else None
+                    next_job = None
+            finally:
+                stopped.set()
+                if next_job:
+                    self._discard_job(next_job)
+
+    def _discard_job(self, job: Future):
+        """
+        Aborts and deletes a job created in advance which turned out not to be needed. The job stops being waited for once the records
+        are not read anymore, so this only waits for the request to Salesforce in flight.
+        """
+        try:
+            result = job.result()
+            if result:
+                job_full_url, job_status = result
+                if job_status in ["UploadComplete", "InProgress"]:
+                    self.abort_job(url=job_full_url)
                 self.delete_job(url=job_full_url)
-                if job_status in ["Aborted", "Failed"]:
-                    raise Exception(f"Job for {self.name} stream using BULK API was failed")
+        except Exception as error:
+            self.logger.warn(f"Couldn't delete a job of {self.name} stream created in advance: {error}")
 
 
 class IncrementalSalesforceStream(SalesforceStream, ABC):
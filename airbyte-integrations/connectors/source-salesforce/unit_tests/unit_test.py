@@ -2,6 +2,193 @@
 # Copyright (c) 2021 Airbyte, Inc., all rights reserved.
 #
 
+import re
+import time
+from unittest.mock import Mock
 
-def test_example_method():
-    assert True
+import pytest
+from source_salesforce.api import Salesforce
+from source_salesforce.streams import BulkSalesforceStream
+
+INSTANCE_URL = "https://instance.salesforce.com"
+JOBS_URL = f"{INSTANCE_URL}//services/data/v52.0/jobs/query"
+COMPOSITE_URL = f"{INSTANCE_URL}/services/data/v52.0/composite"
+
+
+@pytest.fixture
+def bulk_stream():
+    sf_api = Mock(instance_url=INSTANCE_URL, version="v52.0", api_type="BULK")
+    schema = {"properties": {"Id": {"type": ["string", "null"]}, "Amount": {"type": ["number", "null"]}}}
+    stream = BulkSalesforceStream(sf_api=sf_api, pk="Id", stream_name="Account", schema=schema)
+    stream.page_size = 5
+    stream.results_page_size = 2
+    return stream
+
+
+def mock_job(requests_mock, job_id: str, records: list):
+    """ results of the job paged 2 records at a time with Sforce-Locator headers """
+    requests_mock.get(f"{JOBS_URL}/{job_id}", json={"id": job_id, "state": "JobComplete"})
+    requests_mock.delete(f"{JOBS_URL}/{job_id}")
+    pages = [records[i : i + 2] for i in range(0, len(records), 2)] or [[]]
+    for number, page in enumerate(pages):
+        body = "Id,Amount\n" + "".join(f'"{record_id}","{amount}"\n' for record_id, amount in page)
+        locator = str(number + 1) if number + 1 < len(pages) else "null"
+        query = "maxRecords=2" + (f"&locator={number}" if number else "")
+        requests_mock.get(
+            f"{JOBS_URL}/{job_id}/results?{query}",
+            complete_qs=True,
+            text=body,
+            headers={"Sforce-Locator": locator, "Sforce-NumberOfRecords": str(len(page))},
+        )
+
+
+def test_download_data_follows_locators(bulk_stream, requests_mock):
+    records = [(f"id{i}", i) for i in range(5)]
+    mock_job(requests_mock, "job", records)
+    last_records = []
+
+    downloaded = list(bulk_stream.download_data(f"{JOBS_URL}/job", on_last_record=lambda *args: last_records.append(args)))
+
+    assert downloaded == [(i + 1, {"Id": f"id{i}", "Amount": str(i)}) for i in range(5)]
+    assert last_records == [(5, {"Id": "id4", "Amount": "4"})]
+
+
+def test_download_data_parses_multiline_values(bulk_stream, requests_mock):
+    requests_mock.get(f"{JOBS_URL}/job/results", text='Id,Amount\n"a","multi\nline, ""quoted"""\n', headers={"Sforce-Locator": "null"})
+
+    assert list(bulk_stream.download_data(f"{JOBS_URL}/job")) == [(1, {"Id": "a", "Amount": 'multi\nline, "quoted"'})]
+
+
+def test_read_records_pipelines_jobs(bulk_stream, requests_mock):
+    first_job = [(f"id{i}", i) for i in range(5)]
+    second_job = [("id4", 4), ("id5", 5)]
+    mock_job(requests_mock, "job1", first_job)
+    mock_job(requests_mock, "job2", second_job)
+    requests_mock.post(JOBS_URL, [{"json": {"id": "job1"}}, {"json": {"id": "job2"}}])
+
+    def queries():
+        return [request.json()["query"] for request in requests_mock.request_history if request.method == "POST"]
+
+    records = bulk_stream.read_records(sync_mode=None)
+    first_records = [next(records) for _ in range(len(first_job))]
+    # the second job is created in the background once the last page of the first job is downloaded, while its records are read
+    for _ in range(100):
+        if len(queries()) == 2:
+            break
+        time.sleep(0.01)
+    assert queries() == [
+        "SELECT Id,Amount FROM Account ORDER BY Id ASC LIMIT 5",
+        "SELECT Id,Amount FROM Account WHERE Id >= 'id4' ORDER BY Id ASC LIMIT 5",
+    ]
+
+    assert first_records + list(records) == [{"Id": record_id, "Amount": float(amount)} for record_id, amount in first_job + second_job]
+    deleted = [request.url for request in requests_mock.request_history if request.method == "DELETE"]
+    assert sorted(re.sub(".*/", "", url) for url in deleted) == ["job1", "job2"]
+
+
+def test_read_records_discards_pipelined_job_without_waiting_for_it(bulk_stream, requests_mock):
+    bulk_stream.CHECK_INTERVAL_SECONDS = 60
+    mock_job(requests_mock, "job1", [(f"id{i}", i) for i in range(5)])
+    requests_mock.get(f"{JOBS_URL}/job2", json={"id": "job2", "state": "InProgress"})
+    requests_mock.patch(f"{JOBS_URL}/job2")
+    requests_mock.delete(f"{JOBS_URL}/job2")
+    requests_mock.post(JOBS_URL, [{"json": {"id": "job1"}}, {"json": {"id": "job2"}}])
+
+    def job2_requests():
+        return [request.method for request in requests_mock.request_history if request.url.endswith("/job2")]
+
+    records = bulk_stream.read_records(sync_mode=None)
+    for _ in range(5):
+        next(records)
+    for _ in range(100):
+        if job2_requests():
+            break
+        time.sleep(0.01)
+
+    start = time.monotonic()
+    records.close()
+    assert time.monotonic() - start < bulk_stream.CHECK_INTERVAL_SECONDS
+    assert job2_requests() == ["GET", "PATCH", "DELETE"]
+
+
+@pytest.fixture
+def sf_api(tmp_path, monkeypatch):
+    monkeypatch.setenv("AIRBYTE_SCHEMA_CACHE_DIR", str(tmp_path))
+    sf_api = Salesforce(client_id="client", client_secret="secret", refresh_token="token", api_type="BULK")
+    sf_api.instance_url = INSTANCE_URL
+    sf_api.access_token = "access_token"
+    return sf_api
+
+
+def composite_describes(modified: set, failing: set = frozenset()):
+    """ fake Composite API describing objects with an Id and a Name field, objects which aren't in `modified` are not modified """
+
+    def callback(request, context):
+        responses = []
+        for subrequest in request.json()["compositeRequest"]:
+            sobject = subrequest["url"].split("/")[-2]
+            if sobject in failing:
+                responses.append({"httpStatusCode": 403, "body": [{"errorCode": "REQUEST_LIMIT_EXCEEDED"}]})
+            elif "httpHeaders" in subrequest and sobject not in modified:
+                responses.append({"httpStatusCode": 304, "body": None})
+            else:
+                fields = [{"name": "Id", "type": "id"}, {"name": "Name", "type": "string"}]
+                responses.append({"httpStatusCode": 200, "body": {"fields": fields}, "httpHeaders": {"Last-Modified": "Mon, 18 Oct 2021"}})
+        return {"compositeResponse": responses}
+
+    return callback
+
+
+def test_generate_schemas_describes_objects_in_batches(sf_api, requests_mock):
+    sf_api.describe_batch_size = 2
+    requests_mock.post(COMPOSITE_URL, json=composite_describes(modified=set()))
+    sobjects = [f"Object{i}" for i in range(5)]
+
+    schemas = sf_api.generate_schemas(sobjects)
+
+    assert list(schemas) == sobjects
+    assert schemas["Object3"]["properties"] == {"Id": {"type": ["string", "null"]}, "Name": {"type": ["string", "null"]}}
+    batches = [[r["url"].split("/")[-2] for r in request.json()["compositeRequest"]] for request in requests_mock.request_history]
+    assert sorted(batches) == [["Object0", "Object1"], ["Object2", "Object3"], ["Object4"]]
+
+
+def test_generate_schemas_only_describes_modified_objects_again(sf_api, requests_mock):
+    requests_mock.post(COMPOSITE_URL, json=composite_describes(modified=set()))
+    sf_api.generate_schemas(["Account", "Contact"])
+
+    # the next run only gets the describe of the modified object
+    requests_mock.post(COMPOSITE_URL, json=composite_describes(modified={"Contact"}))
+    schemas = sf_api.generate_schemas(["Account", "Contact", "Lead"])
+
+    subrequests = requests_mock.request_history[-1].json()["compositeRequest"]
+    assert [subrequest.get("httpHeaders") for subrequest in subrequests] == [
+        {"If-Modified-Since": "Mon, 18 Oct 2021"},
+        {"If-Modified-Since": "Mon, 18 Oct 2021"},
+        None,
+    ]
+    assert list(schemas) == ["Account", "Contact", "Lead"]
+    assert schemas["Account"] == schemas["Lead"]
+
+
+def test_generate_schemas_describes_failed_objects_alone(sf_api, requests_mock):
+    requests_mock.post(COMPOSITE_URL, json=composite_describes(modified=set(), failing={"Lead"}))
+    requests_mock.get(f"{INSTANCE_URL}/services/data/v52.0/sobjects/Lead/describe", json={"fields": [{"name": "Id", "type": "id"}]})
+
+    schemas = sf_api.generate_schemas(["Account", "Lead"])
+
+    assert schemas["Lead"]["properties"] == {"Id": {"type": ["string", "null"]}}
+
+
+def test_generate_schemas_cache_is_specific_to_the_user(sf_api, requests_mock):
+    requests_mock.post(COMPOSITE_URL, json=composite_describes(modified=set()))
+    sf_api.user_id = "https://login.salesforce.com/id/org/user_a"
+    sf_api.generate_schemas(["Account"])
+
+    # another user of the same org can't see the same fields, the describes cached for the first user are not used
+    sf_api.user_id = "https://login.salesforce.com/id/org/user_b"
+    sf_api.generate_schemas(["Account"])
+    assert "httpHeaders" not in requests_mock.request_history[-1].json()["compositeRequest"][0]
+
+    sf_api.user_id = "https://login.salesforce.com/id/org/user_a"
+    sf_api.generate_schemas(["Account"])
+    assert requests_mock.request_history[-1].json()["compositeRequest"][0]["httpHeaders"] == {"If-Modified-Since": "Mon, 18 Oct 2021"}
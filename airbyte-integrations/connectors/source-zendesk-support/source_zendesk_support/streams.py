@@ -6,9 +6,8 @@
 import calendar
 import time
 from abc import ABC, abstractmethod
-from collections import defaultdict
 from datetime import datetime
-from typing import Any, Iterable, List, Mapping, MutableMapping, Optional, Union
+from typing import Any, Iterable, Mapping, MutableMapping, Optional, Union
 from urllib.parse import parse_qsl, urlparse
 
 import pytz
@@ -354,101 +353,38 @@ class IncrementalSortedPageStream(IncrementalUnsortedPageStream, ABC):
         return params
 
 
-class TicketComments(IncrementalSortedPageStream):
+class TicketComments(IncrementalExportStream):
     """TicketComments stream: https://developer.zendesk.com/api-reference/ticketing/tickets/ticket_comments/
     ZenDesk doesn't provide API for loading of all comments by one direct endpoints.
-    Thus at first we loads all updated tickets and after this tries to load all created/updated
-    comments per every ticket"""
-
-    # Tickets can be removed throughout synchronization. The ZendDesk API will return a response
-    # with 404 code if a ticket is not exists. But it shouldn't break loading of other comments.
-    raise_on_http_errors = False
-
-    response_list_name = "comments"
-    cursor_field = IncrementalSortedPageStream.created_at_field
+    Thus comments are loaded from the incremental ticket events export with side-loaded comment events:
+    https://developer.zendesk.com/api-reference/ticketing/ticket-management/incremental_exports/#incremental-ticket-event-export
+    """
 
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        # need to save a slice ticket state
-        # because the function get_updated_state doesn't have a stream_slice as argument
-        self._ticket_last_end_time = None
-
-    def path(self, stream_state: Mapping[str, Any] = None, stream_slice: Mapping[str, Any] = None, **kwargs) -> str:
-        ticket_id = stream_slice["id"]
-        return f"tickets/{ticket_id}/comments.json"
-
-    def stream_slices(
-        self, sync_mode, cursor_field: List[str] = None, stream_state: Mapping[str, Any] = None
-    ) -> Iterable[Optional[Mapping[str, Any]]]:
-        """Loads all updated tickets after last stream state"""
-        stream_state = stream_state or {}
-        # convert a comment state value to a ticket one
-        # tickets and comments have different cursor formats. For example:
-        # Ticket state {"generated_timestamp": 1627637409}
-        # Comment state: {"created_at": "2021-07-30T12:30:09Z"}
-        # At the first try to find a ticket cursor value
-        ticket_stream_value = stream_state.get(Tickets.cursor_field)
-        if not ticket_stream_value:
-            # for backward compatibility because not all relevant states can have some last ticket state
-            ticket_stream_value = self.str2unixtime(stream_state.get(self.cursor_field))
-
-        tickets_stream = Tickets(start_date=self._start_date, subdomain=self._subdomain, authenticator=self.authenticator)
-        ticket_pages = defaultdict(list)
-        last_end_time = stream_state.get(LAST_END_TIME_KEY, 0)
-        ticket_count = 0
-        for ticket in tickets_stream.read_records(
-            sync_mode=sync_mode,
-            cursor_field=cursor_field,
-            stream_state={Tickets.cursor_field: ticket_stream_value, LAST_END_TIME_KEY: last_end_time},
-        ):
-            if not ticket["comment_count"]:
-                # skip tickets without comments
-                continue
-            ticket_count += 1
-            ticket_pages[tickets_stream.last_end_time].append(
-                {
-                    "id": ticket["id"],
-                    Tickets.cursor_field: ticket[Tickets.cursor_field],
-                }
-            )
-
-        if ticket_pages:
-            last_times = sorted(ticket_pages.keys())
-            # tickets' loading is implemented per page but the stream 'tickets' has
-            # the addl stream state fields "_last_end_time" and its value is not compatible
-            # with comments' cursor fields. Thus we need to save it separately and add
-            # last_end_time info for every slice
-            last_page = {last_times[-1]: [ticket_pages[last_times[-1]].pop(-1)]}
-
-            new_last_times = [last_end_time] + last_times[:-1]
-            ticket_pages = {new_last_times[i]: ticket_pages[last_times[i]] for i in range(len(last_times))}
-            ticket_pages.update(last_page)
-
-        self.logger.info(f"Found {ticket_count} ticket(s) with comments")
-        for end_time, tickets in sorted(ticket_pages.items(), key=lambda t: t[0]):
-            self._ticket_last_end_time = end_time
-            yield from sorted(tickets, key=lambda ticket: ticket[Tickets.cursor_field])
+    response_list_name = "ticket_events"
+    cursor_field = IncrementalExportStream.created_at_field
 
-    def get_updated_state(self, current_stream_state: MutableMapping[str, Any], latest_record: Mapping[str, Any]) -> Mapping[str, Any]:
-        """Adds a last cursor ticket updated time for a comment state"""
-        new_state = super().get_updated_state(current_stream_state=current_stream_state, latest_record=latest_record)
-        if self._ticket_last_end_time:
+    def path(self, *args, **kwargs) -> str:
+        return "incremental/ticket_events.json"
 
-            new_state[LAST_END_TIME_KEY] = self._ticket_last_end_time
-        return new_state
+    def request_params(self, next_page_token: Mapping[str, Any] = None, **kwargs) -> MutableMapping[str, Any]:
+        """Adds the comment events of every ticket event"""
+        params = super().request_params(next_page_token=next_page_token, **kwargs)
+        params["include"] = "comment_events"
+        return params
 
     def parse_response(
         self, response: requests.Response, stream_state: Mapping[str, Any], stream_slice: Mapping[str, Any] = None, **kwargs
     ) -> Iterable[Mapping]:
-        """Handle response status"""
-        if response.status_code == 200:
-            yield from super().parse_response(response, stream_state=stream_state, stream_slice=stream_slice, **kwargs)
-        elif response.status_code == 404:
-            ticket_id = stream_slice["id"]
-            # skip 404 errors for not found tickets
-            self.logger.info(f"ticket {ticket_id} not found (404 error). It could have been deleted.")
-        else:
-            response.raise_for_status()
+        """Returns the comments added by ticket events, events without comments are skipped"""
+        for event in super().parse_response(response, stream_state=stream_state, stream_slice=stream_slice, **kwargs):
+            for child_event in event.get("child_events") or []:
+                if child_event.get("event_type") != "Comment":
+                    continue
+                comment = {key: value for key, value in child_event.items() if key != "event_type"}
+                comment["ticket_id"] = event["ticket_id"]
+                comment.setdefault(self.cursor_field, event[self.cursor_field])
+                comment.setdefault("via", event.get("via"))
+                yield comment
 
 
 # NOTE: all Zendesk endpoints can be splitted into several templates of data loading.
@@ -3,14 +3,12 @@
 #
 
 import json
-from unittest.mock import Mock
 
 import pytest
 import requests
 import requests_mock
-from requests.exceptions import HTTPError
 from source_zendesk_support import SourceZendeskSupport
-from source_zendesk_support.streams import Tags, TicketComments
+from source_zendesk_support.streams import LAST_END_TIME_KEY, Tags, TicketComments
 
 CONFIG_FILE = "secrets/config.json"
 
@@ -52,45 +50,44 @@ def test_backoff_cases(prepare_stream_args, header_name, header_value, expected)
             assert result is None
 
 
-@pytest.mark.parametrize(
-    "status_code,expected_comment_count,expected_expection",
-    [
-        # success
-        (200, 1, None),
-        # not found ticket
-        (404, 0, None),
-        # some another code error.
-        (403, 0, HTTPError),
-    ],
-)
-def test_comments_not_found_ticket(prepare_stream_args, status_code, expected_comment_count, expected_expection):
-    """Checks the case when some ticket is removed while sync of comments"""
-    fake_id = 12345
-    stream = TicketComments(**prepare_stream_args)
-    with requests_mock.Mocker() as comment_mock:
-        path = f"tickets/{fake_id}/comments.json"
-        stream.path = Mock(return_value=path)
-        url = stream.url_base + path
-        comment_mock.get(
-            url,
-            status_code=status_code,
-            json={
-                "comments": [
-                    {
-                        "id": fake_id,
-                        TicketComments.cursor_field: "2021-07-22T06:55:55Z",
-                    }
-                ]
-            },
-        )
-        comments = stream.read_records(
-            sync_mode=None,
-            stream_slice={
-                "id": fake_id,
-            },
-        )
-        if expected_expection:
-            with pytest.raises(expected_expection):
-                next(comments)
-        else:
-            assert len(list(comments)) == expected_comment_count
+def test_comments_from_ticket_events():
+    """Comments are side-loaded with the ticket events, in the order of the events"""
+    stream = TicketComments(subdomain="fake", start_date="2021-07-01T00:00:00Z")
+    events = [
+        {"ticket_id": 1, "created_at": "2021-07-22T06:55:55Z", "via": {"channel": "web"}, "child_events": [{"event_type": "Change"}]},
+        {
+            "ticket_id": 2,
+            "created_at": "2021-07-22T07:00:00Z",
+            "via": {"channel": "email"},
+            "child_events": [
+                {"id": 20, "event_type": "Comment", "type": "Comment", "body": "first", "public": True},
+                {"id": 21, "event_type": "Change", "field_name": "status"},
+            ],
+        },
+        {"ticket_id": 3, "created_at": "2021-07-22T07:05:00Z", "child_events": [{"id": 30, "event_type": "Comment", "body": "second"}]},
+    ]
+    with requests_mock.Mocker() as m:
+        url = stream.url_base + stream.path()
+        m.get(url, json={"ticket_events": events, "end_time": 1626937500, "end_of_stream": True})
+
+        comments = list(stream.read_records(sync_mode=None, stream_state={LAST_END_TIME_KEY: 1626936955}))
+
+        assert m.last_request.qs["include"] == ["comment_events"]
+        assert m.last_request.qs["start_time"] == ["1626936955"]
+
+    assert comments == [
+        {
+            "id": 20,
+            "type": "Comment",
+            "body": "first",
+            "public": True,
+            "ticket_id": 2,
+            "created_at": "2021-07-22T07:00:00Z",
+            "via": {"channel": "email"},
+        },
+        {"id": 30, "body": "second", "ticket_id": 3, "created_at": "2021-07-22T07:05:00Z", "via": None},
+    ]
+    assert stream.get_updated_state({LAST_END_TIME_KEY: 1626936955}, comments[-1]) == {
+        LAST_END_TIME_KEY: 1626937500,
+        "created_at": "2021-07-22T07:05:00Z",
+    }